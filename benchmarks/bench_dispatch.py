@@ -0,0 +1,52 @@
+"""
+benchmarks.bench_dispatch.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Wall time of crawling small site, where workers mostly wait for the work.
+
+Usage: python -m benchmarks.bench_dispatch [--levels 4] [--width 10] [--latency 0.02]
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from argparse import ArgumentParser
+from statistics import median
+from time import time
+
+from deadlinks import Crawler, Settings
+
+from .utils import site
+
+# -- Implementation ------------------------------------------------------------
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--levels', type=int, default=4)
+    parser.add_argument('--width', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 10])
+    args = parser.parse_args()
+
+    with site(args.levels, args.width, args.latency) as address:
+        print(f"pages: {1 + args.levels * args.width}, latency: {args.latency}s")
+
+        for threads in args.threads:
+            timings = []
+            for _ in range(args.repeat):
+                crawler = Crawler(Settings(address, threads=threads, check_robots_txt=False))
+
+                started = time()
+                crawler.start()
+                timings.append(time() - started)
+
+            print(f"threads: {threads:>3}  median: {median(timings):.3f}s  "
+                  f"min: {min(timings):.3f}s  max: {max(timings):.3f}s")
+
+
+if __name__ == '__main__':
+    main()
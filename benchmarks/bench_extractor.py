@@ -0,0 +1,89 @@
+"""
+benchmarks.bench_extractor.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Links extraction from large pages: decoded text (`response.text`, with
+encoding detection if charset isn't declared) vs not decoded body.
+
+Usage: python -m benchmarks.bench_extractor [--size 2] [--links 500] [--repeat 5]
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from argparse import ArgumentParser
+from io import BytesIO
+from statistics import median
+from time import time
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from deadlinks.extractor import __RE_LINKS__, href, links_of
+
+# -- Implementation ------------------------------------------------------------
+
+
+def page(size: int, links: int, encoding: str) -> bytes:
+    """ Page of `size` MB, with `links` links and non ascii text. """
+
+    paragraph = "<p>Привіт, світ! Hello, world!</p>\n"
+    link = "<a href='/docs/{0}.html#section'>Сторінка {0}</a>\n"
+
+    body = "".join(link.format(x) + paragraph for x in range(links))
+    body += paragraph * ((size * 1024 * 1024 - len(body.encode())) // len(paragraph.encode()))
+
+    return "<html><body>{}</body></html>".format(body).encode(encoding)
+
+
+def response(content: bytes, content_type: str) -> Response:
+    r = Response()
+    r.status_code = 200
+    r.raw = BytesIO(content)
+    r.headers = CaseInsensitiveDict()
+    if content_type:
+        r.headers['Content-Type'] = content_type
+
+    return r
+
+
+def text_path(r: Response) -> int:
+    """ Links extraction as it was done over decoded text. """
+
+    links = [href(attrs) for attrs in __RE_LINKS__.findall(r.text)]
+    return len(set(links))
+
+
+def bytes_path(r: Response) -> int:
+    return len(links_of(r))
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=2, help="page size (MB)")
+    parser.add_argument('--links', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"page: {args.size}MB, links: {args.links}")
+
+    for encoding in ['utf-8', 'cp1251']:
+        content = page(args.size, args.links, encoding)
+
+        for content_type in ["", "text/html", f"text/html; charset={encoding}"]:
+            for name, path in [('text', text_path), ('bytes', bytes_path)]:
+                timings = []
+                for _ in range(args.repeat):
+                    r = response(content, content_type)
+                    started = time()
+                    found = path(r)
+                    timings.append(time() - started)
+
+                print(f"{encoding:<7} content-type: {content_type or '-':<26} {name:<6} "
+                      f"median: {median(timings) * 1000:7.1f}ms  links: {found}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+benchmarks.bench_hosts.py
+~~~~~~~~~~~~~~~~~~~~~~~~~
+
+External links checks of the site, that links to a few small hosts, which
+answer `429 Too Many Requests` to more than 2 concurrent requests. Hosts
+requested without limits vs with per host limit.
+
+Usage: python -m benchmarks.bench_hosts [--hosts 5] [--links 100] [--threads 10]
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from argparse import ArgumentParser
+from contextlib import ExitStack
+from threading import Lock
+from time import time
+from typing import List
+
+from deadlinks import Crawler, Settings
+
+from .utils import SiteHandler, serve
+
+# -- Implementation ------------------------------------------------------------
+
+
+class SmallHostHandler(SiteHandler):
+    """ Host that rate limits concurrent requests. """
+
+    lock = Lock()
+    active = 0
+    limit = 2
+
+    def hrefs(self) -> List[str]:
+        return []
+
+    def respond(self, with_body: bool) -> None:
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            limited = cls.active > cls.limit
+
+        try:
+            if not limited:
+                super().respond(with_body)
+                return
+
+            self.send_response(429)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--hosts', type=int, default=5)
+    parser.add_argument('--links', type=int, default=100, help="links per host")
+    parser.add_argument('--threads', type=int, default=10)
+    args = parser.parse_args()
+
+    with ExitStack() as stack:
+        hosts = [
+            stack.enter_context(serve(type('Handler', (SmallHostHandler, ), {
+                'lock': Lock(),
+                'latency': 0.02,
+            }))) for _ in range(args.hosts)
+        ]
+
+        hrefs = [f"{host}{x}" for host in hosts for x in range(args.links)]
+        site = stack.enter_context(serve(type('Handler', (SiteHandler, ), {
+            'hrefs': lambda self: hrefs if self.path == "/" else [],
+        })))
+
+        for max_per_host in [None, 4, 2]:
+            settings = Settings(
+                site,
+                threads=args.threads,
+                check_external_urls=True,
+                check_robots_txt=False,
+                max_per_host=max_per_host,
+            )
+            crawler = Crawler(settings)
+
+            started = time()
+            crawler.start()
+            elapsed = time() - started
+
+            print(f"max per host: {str(max_per_host):<5} time: {elapsed:.2f}s  "
+                  f"found: {len(crawler.succeed)}  rate limited: {len(crawler.failed)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+benchmarks.bench_ignore.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Links classification (without network): is link external, and does it match
+one of ignored domains or pathes. Rules checked one by one (and hosts
+normalized on every call) vs compiled rules (and cached normalization).
+
+Usage: python -m benchmarks.bench_ignore [--links 200000] [--rules 500]
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from argparse import ArgumentParser
+from random import Random
+from time import time
+
+from deadlinks import Link, Settings
+from deadlinks.link import external
+
+# -- Implementation ------------------------------------------------------------
+
+
+def legacy(settings: Settings, links: list) -> int:
+    """ Classification as it was. """
+
+    normalize = external.__wrapped__ # type: ignore
+    base = settings.base
+
+    def matched(value: str, rules: list) -> bool:
+        for rule in rules:
+            if rule in value:
+                return True
+        return False
+
+    ignored = 0
+    for link in links:
+        if normalize(base.scheme, base.domain, link.scheme, link.domain) \
+                and matched(link.domain, settings.domains) or matched(link.path, settings.pathes):
+            ignored += 1
+
+    return ignored
+
+
+def compiled(settings: Settings, links: list) -> int:
+    """ Classification with compiled rules. """
+
+    base = settings.base
+
+    ignored = 0
+    for link in links:
+        if link.is_external(base) and settings.ignored_domains.match(link.domain) \
+                or settings.ignored_pathes.match(link.path):
+            ignored += 1
+
+    return ignored
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--links', type=int, default=200000)
+    parser.add_argument('--rules', type=int, default=500)
+    args = parser.parse_args()
+
+    random = Random(42)
+    domains = [f"www.host-{random.getrandbits(24):x}.com" for _ in range(args.rules)]
+    pathes = [f"/section-{random.getrandbits(24):x}/" for _ in range(args.rules)]
+    settings = Settings("https://example.com", ignore_domains=domains[::2], ignore_pathes=pathes[::2])
+
+    links = [
+        Link(f"https://{random.choice(domains + ['example.com'])}"
+             f"{random.choice(pathes)}page-{random.getrandbits(16):x}.html")
+        for _ in range(args.links)
+    ]
+
+    for name, classify in [('one by one', legacy), ('compiled', compiled)]:
+        started = time()
+        ignored = classify(settings, links)
+        elapsed = time() - started
+
+        print(f"{name:<10} links: {len(links)}  rules: {len(settings.domains) + len(settings.pathes)}  ignored: {ignored}  "
+              f"time: {elapsed:.2f}s  per link: {elapsed / len(links) * 1e6:.1f}us")
+
+
+if __name__ == '__main__':
+    main()
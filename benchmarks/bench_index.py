@@ -0,0 +1,133 @@
+"""
+benchmarks.bench_index.py
+~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Index used by many concurrent workers (without network): links claimed
+(put if not there) and their statuses updated. Index as it was (no locks),
+index with the one lock, and lock striped index.
+
+Usage: python -m benchmarks.bench_index [--links 20000] [--discoveries 200000] [--repeat 3]
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+import sys
+from argparse import ArgumentParser
+from random import Random
+from threading import Barrier, Lock, Thread
+from time import time
+
+from deadlinks import Index, Link, Status
+
+# -- Implementation ------------------------------------------------------------
+
+
+class LegacyIndex(Index):
+    """ Index as it was: check-then-insert and counters without locks. """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._index = {}
+        self._counters = dict.fromkeys(self.get_stats(), 0)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def claim(self, link, referrer=None):
+        url = link.url()
+        if url in self._index:
+            self._index[url].add_referrer(referrer)
+            return self._index[url], False
+        self._index[url] = link
+        link.add_referrer(referrer)
+        return link, True
+
+    def update(self, url, status, message):
+        url.status = status
+        url.message = message
+        self._counters[status] += 1
+
+    def get_stats(self):
+        return getattr(self, '_counters', None) or super().get_stats()
+
+
+class LockedIndex(LegacyIndex):
+    """ Index with the one lock. """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = Lock()
+
+    def claim(self, link, referrer=None):
+        with self._lock:
+            return super().claim(link, referrer)
+
+    def update(self, url, status, message):
+        with self._lock:
+            super().update(url, status, message)
+
+
+def run(index: Index, workers: int, discoveries: list) -> tuple:
+    """ Workers claim discovered links, and update status of claimed ones. """
+
+    barrier = Barrier(workers + 1)
+    claims = [0] * workers
+    chunk = len(discoveries) // workers
+
+    def worker(number: int) -> None:
+        barrier.wait()
+        for link in discoveries[number * chunk:(number + 1) * chunk]:
+            indexed, claimed = index.claim(link, "http://example.com/")
+            if claimed:
+                claims[number] += 1
+                index.update(indexed, Status.FOUND, "")
+
+    threads = [Thread(target=worker, args=(x, )) for x in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    started = time()
+    barrier.wait()
+    for thread in threads:
+        thread.join()
+
+    return time() - started, sum(claims)
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--links', type=int, default=20000)
+    parser.add_argument('--discoveries', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    # frequent threads switching makes races visible.
+    sys.setswitchinterval(1e-5)
+
+    random = Random(42)
+    urls = [f"http://example.com/page-{x}" for x in range(args.links)]
+
+    for workers in [64, 128]:
+        for name, index_class in [('no locks', LegacyIndex), ('one lock', LockedIndex),
+                                  ('striped', Index)]:
+            timings = []
+            for _ in range(args.repeat):
+                discoveries = [Link(random.choice(urls)) for _ in range(args.discoveries)]
+
+                index = index_class()
+                elapsed, claims = run(index, workers, discoveries)
+                timings.append(elapsed)
+
+            elapsed = min(timings)
+            found = index.get_stats()[Status.FOUND]
+
+            print(f"workers: {workers:<4} {name:<9} time: {elapsed:.2f}s  links: {len(index)}  "
+                  f"claims: {claims} (extra {claims - len(index)})  "
+                  f"found counter: {found} (off by {found - len(index)})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+benchmarks.bench_internal.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Checking generated documentation (`deadlinks internal`): files read
+directly vs served by local web server.
+
+Usage: python -m benchmarks.bench_internal [--pages 5000] [--threads 10]
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import time
+
+from deadlinks import Crawler, Settings
+
+# -- Implementation ------------------------------------------------------------
+
+
+def generate(root: Path, pages: int, width: int = 10) -> None:
+    """ Documentation like site: index, and sections of pages linked to
+        next pages and index. """
+
+    def page(number: int) -> str:
+        links = ["<a href='/'>Index</a>"]
+        for x in range(number * width + 1, min(number * width + width + 1, pages)):
+            links.append(f"<a href='/section-{x % 100}/page-{x}.html'>Page {x}</a>")
+        return "<html><body>{}</body></html>".format("\n".join(links))
+
+    (root / "index.html").write_text(page(0))
+    for x in range(1, pages):
+        section = root / f"section-{x % 100}"
+        section.mkdir(exist_ok=True)
+        (section / f"page-{x}.html").write_text(page(x))
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=5000)
+    parser.add_argument('--threads', type=int, default=10)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as root:
+        generate(Path(root), args.pages)
+
+        for name, http_server in [('web server', True), ('direct', False)]:
+            settings = Settings(
+                "http://internal",
+                root=root,
+                threads=args.threads,
+                http_server=http_server,
+            )
+
+            crawler = Crawler(settings)
+
+            started = time()
+            crawler.start()
+            elapsed = time() - started
+
+            print(f"{name:<10}  pages: {len(crawler.succeed)}  time: {elapsed:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
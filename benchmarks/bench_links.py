@@ -0,0 +1,93 @@
+"""
+benchmarks.bench_links.py
+~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Memory used by the discovered links (without network): links (with few
+referrers each, found and with message) created as crawler does it. Links
+as they were (`__dict__`, parsed url, per link lists) vs compact ones.
+
+Usage: python -m benchmarks.bench_links [--links 200000] [--pages 2000] [--referrers 3]
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+import gc
+import tracemalloc
+from argparse import ArgumentParser
+from random import Random
+from urllib.parse import urlparse
+
+from deadlinks import Link, Status
+
+# -- Implementation ------------------------------------------------------------
+
+
+class LegacyLink:
+    """ Link as it was: parsed url, lists and message in the `__dict__`. """
+
+    def __init__(self, location):
+        self._url = urlparse(location)
+        self._status = Status.UNDEFINED
+        self._referrers = []
+        self._links = []
+        self._validators = None
+        self._message = ""
+
+    def url(self):
+        return self._url.geturl()
+
+    def add_referrer(self, url):
+        if url in self._referrers:
+            return
+        self._referrers.append(url)
+
+
+def measure(link_class, urls: list, referrers: list, per_link: int) -> int:
+    """ Return bytes allocated by the links (referrers pages excluded). """
+
+    pages = [link_class(url) for url in referrers]
+
+    gc.collect()
+    tracemalloc.start()
+
+    links = []
+    for number, url in enumerate(urls):
+        link = link_class(url)
+        for referrer in range(per_link):
+            link.add_referrer(pages[(number + referrer * 7) % len(pages)].url())
+        link._status = Status.FOUND # pylint: disable-msg=W0212
+        links.append(link)
+
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return allocated
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--links', type=int, default=200000)
+    parser.add_argument('--pages', type=int, default=2000)
+    parser.add_argument('--referrers', type=int, default=3, help="referrers per link")
+    args = parser.parse_args()
+
+    random = Random(42)
+    domains = [f"www.example-{x}.com" for x in range(500)]
+
+    urls = [
+        f"https://{random.choice(domains)}/docs/page-{random.getrandbits(32):x}.html"
+        for _ in range(args.links)
+    ]
+    pages = [f"https://docs.example.com/section/page-{x}.html" for x in range(args.pages)]
+
+    for name, link_class in [('legacy', LegacyLink), ('compact', Link)]:
+        allocated = measure(link_class, urls, pages, args.referrers)
+        print(f"{name:<8} links: {len(urls)}  memory: {allocated / 2**20:.1f}MB  "
+              f"per link: {allocated / len(urls):.0f} bytes")
+
+
+if __name__ == '__main__':
+    main()
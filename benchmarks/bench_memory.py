@@ -0,0 +1,54 @@
+"""
+benchmarks.bench_memory.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Peak RSS of crawling big synthetic site.
+
+Usage: python -m benchmarks.bench_memory [--pages 50000] [--padding 8192] [--threads 10]
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from argparse import ArgumentParser
+from resource import RUSAGE_SELF, getrusage
+from time import time
+
+from deadlinks import Crawler, Settings
+
+from .utils import tree
+
+# -- Implementation ------------------------------------------------------------
+
+
+def rss() -> float:
+    """ Peak RSS of the process (including site server) in MB. """
+    return getrusage(RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=50000)
+    parser.add_argument('--width', type=int, default=10)
+    parser.add_argument('--padding', type=int, default=8192, help="page body size")
+    parser.add_argument('--threads', type=int, default=10)
+    args = parser.parse_args()
+
+    with tree(args.pages, args.width, padding=args.padding) as address:
+        before = rss()
+
+        crawler = Crawler(Settings(address, threads=args.threads, check_robots_txt=False))
+
+        started = time()
+        crawler.start()
+        elapsed = time() - started
+
+        print(f"pages: {len(crawler.succeed)} ({args.padding} bytes padding), "
+              f"threads: {args.threads}")
+        print(f"time: {elapsed:.1f}s  peak rss: {rss():.1f}MB (before crawl: {before:.1f}MB)")
+
+
+if __name__ == '__main__':
+    main()
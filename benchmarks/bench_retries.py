@@ -0,0 +1,99 @@
+"""
+benchmarks.bench_retries.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Site, where some pages answer `503 Service Unavailable` a few times before
+they are found, checked with retries: urllib3 retries (worker sleeps during
+backoff) vs crawler's scheduled retries (worker checks other links).
+
+Usage: python -m benchmarks.bench_retries [--pages 1000] [--flaky 0.05] [--threads 10] [--retry 3]
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from argparse import ArgumentParser
+from collections import Counter
+from random import Random
+from threading import Lock
+from time import time
+
+from deadlinks import Crawler, Link, Settings
+from deadlinks.request import Transport
+
+from .utils import TreeHandler, serve
+
+# -- Implementation ------------------------------------------------------------
+
+
+class FlakyHandler(TreeHandler):
+    """ Site, where `failures` first requests of the flaky pages get 503. """
+
+    lock = Lock()
+    requests = Counter() # type: Counter
+    flaky = set() # type: set
+    failures = 2
+
+    def respond(self, with_body: bool) -> None:
+        cls = type(self)
+        with cls.lock:
+            cls.requests[self.path] += 1
+            failed = self.path in cls.flaky and cls.requests[self.path] <= cls.failures
+
+        if not failed:
+            super().respond(with_body)
+            return
+
+        self.send_response(503)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+
+class LegacyCrawler(Crawler):
+    """ Crawler, that retries requests in the worker (urllib3 Retry). """
+
+    def __init__(self, settings: Settings) -> None:
+        super().__init__(settings)
+        self.transport = Transport(pool_size=settings.threads, retries=settings.retry)
+
+    def retried(self, url: Link) -> bool:
+        return False
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=1000)
+    parser.add_argument('--flaky', type=float, default=0.05, help="share of flaky pages")
+    parser.add_argument('--threads', type=int, default=10)
+    parser.add_argument('--retry', type=int, default=3)
+    args = parser.parse_args()
+
+    random = Random(42)
+    flaky = {f"/{x}" for x in range(1, args.pages) if random.random() < args.flaky}
+
+    for name, crawler_class in [('in worker', LegacyCrawler), ('scheduled', Crawler)]:
+        handler = type('Handler', (FlakyHandler, ), {
+            'lock': Lock(),
+            'requests': Counter(),
+            'flaky': flaky,
+            'pages': args.pages,
+            'latency': 0.01,
+        })
+
+        with serve(handler) as address:
+            settings = Settings(address, threads=args.threads, retry=args.retry,
+                                check_robots_txt=False)
+            crawler = crawler_class(settings)
+
+            started = time()
+            crawler.start()
+            elapsed = time() - started
+
+        print(f"{name:<10} time: {elapsed:.2f}s  found: {len(crawler.succeed)}  "
+              f"failed: {len(crawler.failed)}  flaky pages: {len(flaky)}")
+
+
+if __name__ == '__main__':
+    main()
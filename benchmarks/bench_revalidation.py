@@ -0,0 +1,67 @@
+"""
+benchmarks.bench_revalidation.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Repeated checks of generated documentation (`deadlinks internal --cache`):
+first run (pages downloaded) vs next run (conditional requests, pages not
+modified).
+
+Usage: python -m benchmarks.bench_revalidation [--pages 5000] [--size 20] [--threads 10]
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import time
+
+from deadlinks import Crawler, Settings
+
+from .bench_internal import generate
+
+# -- Implementation ------------------------------------------------------------
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=5000)
+    parser.add_argument('--size', type=int, default=20, help="page size (KB)")
+    parser.add_argument('--threads', type=int, default=10)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as root:
+        generate(Path(root), args.pages)
+
+        # text of the documentation pages.
+        for page in Path(root).glob("**/*.html"):
+            with page.open("a") as file:
+                file.write("<p>Lorem ipsum dolor sit amet.</p>\n" * (args.size * 30))
+
+        for name, http_server in [('web server', True), ('direct', False)]:
+            cache = Path(root) / f"cache-{http_server}.db"
+
+            for run in ['first', 'next']:
+                settings = Settings(
+                    "http://internal",
+                    root=root,
+                    threads=args.threads,
+                    http_server=http_server,
+                    cache=str(cache),
+                )
+
+                crawler = Crawler(settings)
+
+                started = time()
+                crawler.start()
+                elapsed = time() - started
+
+                print(f"{name:<10}  {run:<5} run  pages: {len(crawler.succeed)}  "
+                      f"time: {elapsed:.1f}s  ({crawler.statistics()['Revalidated']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+benchmarks.bench_robots.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Urls checked against large robots.txt (like ones of big code hosting sites)
+without network: every rule scanned (and matched ones sorted) for each url
+vs rules looked up by the path prefixes.
+
+Usage: python -m benchmarks.bench_robots [--rules 2000] [--urls 20000]
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from argparse import ArgumentParser
+from random import Random
+from time import time
+from urllib.robotparser import RobotFileParser
+
+from deadlinks import URL
+from deadlinks.robots_txt import Rules
+
+# -- Implementation ------------------------------------------------------------
+
+
+def legacy(entry, url: URL) -> bool:
+    """ Rule matching as it was. """
+
+    path = url.path or "/"
+
+    result = []
+    for line in entry.rulelines:
+        if not line.applies_to(path):
+            continue
+
+        if len(line.path) > len(path):
+            continue
+
+        result.append((line.allowance, line.path))
+
+    result = sorted(result, key=lambda x: x[1])
+    return result[-1][0] if result else True
+
+
+def robots_txt(random: Random, rules: int) -> list:
+    """ Return lines of the large robots.txt. """
+
+    words = ["tree", "blob", "commits", "raw", "issues", "pull", "search", "archive", "wiki"]
+
+    lines = ["User-agent: *"]
+    for _ in range(rules):
+        directive = random.choice(["Allow", "Disallow", "Disallow"])
+        path = "/".join(random.choice(words) for _ in range(random.randint(1, 4)))
+        lines.append(f"{directive}: /{random.getrandbits(8):x}/{path}")
+
+    return lines
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--rules', type=int, default=2000)
+    parser.add_argument('--urls', type=int, default=20000)
+    args = parser.parse_args()
+
+    random = Random(42)
+
+    state = RobotFileParser()
+    state.parse(robots_txt(random, args.rules))
+    entry = state.default_entry
+
+    urls = [
+        URL(f"https://example.com{random.choice(entry.rulelines).path}/{random.getrandbits(16):x}")
+        for _ in range(args.urls)
+    ]
+
+    started = time()
+    rules = Rules(entry)
+    compiled = time() - started
+
+    for name, allowed in [('scan', lambda url: legacy(entry, url)),
+                          ('prefixes', lambda url: rules.allowed(url.path))]:
+        started = time()
+        disallowed = sum(not allowed(url) for url in urls)
+        elapsed = time() - started
+
+        print(f"{name:<8} rules: {len(entry.rulelines)}  urls: {len(urls)}  "
+              f"disallowed: {disallowed}  time: {elapsed:.2f}s  "
+              f"per url: {elapsed / len(urls) * 1e6:.1f}us")
+
+    print(f"rules compiled in {compiled * 1000:.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+benchmarks.bench_router.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Document Root router lookups: lookup table vs file system checks on every
+request (router as it was before lookup table).
+
+Usage: python -m benchmarks.bench_router [--pages 20000] [--requests 100000]
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from argparse import ArgumentParser
+from collections import OrderedDict
+from pathlib import Path
+from random import Random
+from tempfile import TemporaryDirectory
+from time import time
+from typing import Optional, Tuple
+
+from deadlinks.serving.router import Router, root_web_files
+
+from .bench_internal import generate
+
+# -- Implementation ------------------------------------------------------------
+
+
+class LegacyRouter(Router):
+    """ Router, that checks file system on each request. """
+
+    def refresh(self) -> None:
+        self._redirects = OrderedDict()
+        self.load_redirects()
+
+    def __call__(self, request_url: str) -> Tuple[int, Optional[str]]:
+
+        end_path = request_url.split("/")[-1]
+        if end_path and "." not in end_path and end_path[-1] != "/":
+            return (301, request_url + "/")
+
+        if request_url in self._redirects:
+            return (301, self._redirects[request_url])
+
+        if request_url in root_web_files:
+            request_file = self._siteroot / request_url.lstrip("/")
+            if request_file.is_file():
+                return (200, str(request_file.resolve()))
+
+            return (404, None)
+
+        request_file = self._siteroot / request_url.lstrip("/")
+
+        try_files = []
+
+        if request_file.is_dir():
+            try_files.append(request_file / "index.html")
+            try_files.append(request_file / "index.htm")
+        else:
+            _path = str(request_file)
+            try_files.append(Path(_path + ".html"))
+            try_files.append(Path(_path + ".htm"))
+            try_files.append(request_file)
+
+        for file in try_files:
+            if file.is_file():
+                return (200, str(file))
+
+        return (404, None)
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=20000)
+    parser.add_argument('--requests', type=int, default=100000)
+    args = parser.parse_args()
+
+    random = Random(42)
+
+    with TemporaryDirectory() as root:
+        generate(Path(root), args.pages)
+
+        # existing pages, directories, missing pages and root files.
+        requests = []
+        for _ in range(args.requests):
+            x = random.randrange(1, args.pages * 2)
+            requests.append(random.choice([
+                f"/section-{x % 100}/page-{x}.html",
+                f"/section-{x % 100}/",
+                f"/section-{x % 100}/page-{x}",
+                "/robots.txt",
+                "/",
+            ]))
+
+        results = {}
+        for name, router_class in [('file system', LegacyRouter), ('lookup table', Router)]:
+            started = time()
+            router = router_class(root)
+            loaded = time() - started
+
+            started = time()
+            results[name] = [router(request) for request in requests]
+            elapsed = time() - started
+
+            print(f"{name:<12}  startup: {loaded * 1000:7.1f}ms  "
+                  f"{len(requests)} requests: {elapsed * 1000:7.1f}ms "
+                  f"({len(requests) / elapsed:,.0f} req/s)")
+
+        assert results['file system'] == results['lookup table']
+
+
+if __name__ == '__main__':
+    main()
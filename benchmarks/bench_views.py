@@ -0,0 +1,74 @@
+"""
+benchmarks.bench_views.py
+~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Reports of the big index (without network): filtered views of the index
+(succeed, failed, ignored, redirected and undefined links) requested as
+report does it (failed ones twice, for `--fiff`). Views filtered and sorted
+on every call vs per status buckets with cached views.
+
+Usage: python -m benchmarks.bench_views [--links 500000] [--repeat 3]
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from argparse import ArgumentParser
+from random import Random
+from time import time
+
+from deadlinks import Index, Link, Status
+
+# -- Implementation ------------------------------------------------------------
+
+
+class LegacyIndex(Index):
+    """ Index as it was: views filtered and sorted (by links comparison)
+        on every call. """
+
+    def _view(self, status):
+        return list(sorted(filter(lambda x: x.status == status, self)))
+
+
+def report(index: Index) -> float:
+    """ Views requested by the report, return time spend. """
+
+    started = time()
+    for view in [index.succeed, index.failed, index.ignored, index.redirected, index.failed]:
+        view()
+
+    return time() - started
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--links', type=int, default=500000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    random = Random(42)
+    statuses = [Status.FOUND] * 90 + [Status.NOT_FOUND] * 4 + [Status.IGNORED] * 3 \
+             + [Status.REDIRECTION] * 3
+
+    domains = [f"example-{x}.com" for x in range(50)]
+    links = [
+        Link(f"https://{random.choice(domains)}/page/{random.getrandbits(32):x}")
+        for _ in range(args.links)
+    ]
+
+    for name, index_class in [('sorted on call', LegacyIndex), ('buckets', Index)]:
+        index = index_class()
+        for link in links:
+            index.put(link)
+            index.update(link, random.choice(statuses), "")
+
+        timings = [report(index) for _ in range(args.repeat)]
+
+        print(f"{name:<15} links: {len(index)}  first report: {timings[0]:.2f}s  "
+              f"next report: {min(timings[1:] or timings):.2f}s")
+
+
+if __name__ == '__main__':
+    main()
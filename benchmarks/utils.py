@@ -0,0 +1,119 @@
+"""
+benchmarks.utils.py
+~~~~~~~~~~~~~~~~~~~
+
+Synthetic site served for benchmarks.
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler
+from threading import Thread
+from time import sleep
+from typing import Iterator, List
+
+from tests.utils.server import HTTPServer
+
+# -- Implementation ------------------------------------------------------------
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    """ Site of `levels` levels, every page of the level links to all `width`
+        pages of the next level (`/{level}-{number}`). """
+
+    protocol_version = "HTTP/1.1"
+
+    # response written with single send (no delayed ACK stalls).
+    wbufsize = -1
+
+    levels = 4
+    width = 10
+    latency = 0.0
+    padding = 0
+
+    def log_message(self, *args):
+        """ Ignoring logging. """
+
+    def do_HEAD(self):
+        self.respond(with_body=False)
+
+    def do_GET(self):
+        self.respond(with_body=True)
+
+    def hrefs(self) -> List[str]:
+        """ Links of the requested page. """
+
+        level = 0 if self.path == "/" else int(self.path.strip("/").split("-")[0])
+        if level >= self.levels:
+            return []
+
+        return [f"/{level + 1}-{x}" for x in range(self.width)]
+
+    def respond(self, with_body: bool) -> None:
+        sleep(self.latency)
+
+        body = "<html><body>{}<p>{}</p></body></html>".format(
+            "".join(f"<a href='{href}'>{href}</a>" for href in self.hrefs()),
+            "x" * self.padding,
+        ).encode()
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        if with_body:
+            self.wfile.write(body)
+
+
+class TreeHandler(SiteHandler):
+    """ Site of `pages` pages (`/{number}`), every page links to `width`
+        next pages, so all pages are reachable from index page. """
+
+    pages = 1000
+
+    def hrefs(self) -> List[str]:
+        """ Links of the requested page. """
+
+        page = 0 if self.path == "/" else int(self.path.strip("/"))
+        first = page * self.width + 1
+
+        return [f"/{x}" for x in range(first, min(first + self.width, self.pages))]
+
+
+@contextmanager
+def serve(handler: type) -> Iterator[str]:
+    """ Serve site with handler, yields its address. """
+
+    server = HTTPServer(('127.0.0.1', 0), handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        yield "http://{0}:{1}/".format(*server.server_address)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextmanager
+def tree(pages: int = 1000, width: int = 10, latency: float = 0.0,
+         padding: int = 0) -> Iterator[str]:
+    """ Serve synthetic site of `pages` pages, yields its address. """
+
+    attrs = {'pages': pages, 'width': width, 'latency': latency, 'padding': padding}
+    with serve(type('Handler', (TreeHandler,), attrs)) as address:
+        yield address
+
+
+@contextmanager
+def site(levels: int = 4, width: int = 10, latency: float = 0.0,
+         padding: int = 0) -> Iterator[str]:
+    """ Serve synthetic site, yields its address. """
+
+    attrs = {'levels': levels, 'width': width, 'latency': latency, 'padding': padding}
+    with serve(type('Handler', (SiteHandler,), attrs)) as address:
+        yield address
@@ -25,11 +25,16 @@ deadlinks module __init__ file
 # -- Imports -------------------------------------------------------------------
 
 from .__version__ import __version__ as version
+from .async_crawler import AsyncCrawler
 from .baseurl import BaseURL
 from .crawler import Crawler
-from .exceptions import (DeadlinksIgnoredURL, DeadlinksSettingsBase, DeadlinksSettingsChange,
-                         DeadlinksSettingsDomains, DeadlinksSettingsPath, DeadlinksSettingsPathes,
-                         DeadlinksSettingsRetry, DeadlinksSettingsRoot, DeadlinksSettingsThreads)
+from .exceptions import (DeadlinksEngine, DeadlinksIgnoredURL, DeadlinksSettingsBase,
+                         DeadlinksSettingsCache, DeadlinksSettingsChange,
+                         DeadlinksSettingsCheckpoint, DeadlinksSettingsDomains,
+                         DeadlinksSettingsHostFailures, DeadlinksSettingsPath,
+                         DeadlinksSettingsPathes, DeadlinksSettingsPerHost,
+                         DeadlinksSettingsReferrers, DeadlinksSettingsRetry, DeadlinksSettingsRoot,
+                         DeadlinksSettingsThreads)
 from .index import Index
 from .link import Link
 from .request import request, user_agent
@@ -49,12 +54,14 @@ __all__ = [
     'BaseURL',
     'Index',
     'Crawler',
+    'AsyncCrawler',
     'request',
     'user_agent',
     'Status',
     'Settings',
 
     # Exceptions
+    'DeadlinksEngine',
     'DeadlinksIgnoredURL',
     'DeadlinksSettingsThreads',
     'DeadlinksSettingsBase',
@@ -64,4 +71,9 @@ __all__ = [
     'DeadlinksSettingsDomains',
     'DeadlinksSettingsPathes',
     'DeadlinksSettingsPath',
+    'DeadlinksSettingsCache',
+    'DeadlinksSettingsCheckpoint',
+    'DeadlinksSettingsReferrers',
+    'DeadlinksSettingsPerHost',
+    'DeadlinksSettingsHostFailures',
 ]
@@ -30,6 +30,7 @@ import click
 from .__version__ import __app_package__ as name
 from .__version__ import __app_version__ as version
 # CLI implementation related
+from .async_crawler import AsyncCrawler
 from .clicker import Clicker, Options, register_exports, register_options, validate_url
 from .crawler import Crawler
 from .exceptions import DeadlinksException
@@ -39,6 +40,7 @@ from .exporters import exporters
 from .options import default_options as general_options
 from .serving.options import default_options as serving_options
 from .settings import Settings
+from .status import Status
 
 # -- Implementation ------------------------------------------------------------
 
@@ -55,7 +57,9 @@ def main(ctx: click.Context, url: str, **opts: Options) -> None:
 
     try:
         settings = Settings(url, **opts)
-        crawler = Crawler(settings)
+
+        engine = AsyncCrawler if str(opts.get('engine')) == 'asyncio' else Crawler
+        crawler = engine(settings)
 
         driver = exporters[str(opts['export'])]
 
@@ -71,7 +75,7 @@ def main(ctx: click.Context, url: str, **opts: Options) -> None:
         # to where user desire have results.
         exporter.report()
 
-        if opts['fail_if_fails_found'] and len(crawler.failed) > 0:
+        if opts['fail_if_fails_found'] and crawler.stats[Status.NOT_FOUND] > 0:
             ctx.exit(1)
 
     except DeadlinksException as e:
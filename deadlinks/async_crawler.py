@@ -0,0 +1,420 @@
+# Copyright 2019 Oleg Butuzov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+deadlinks.async_crawler
+~~~~~~~~~~~~~~~~~~~~~~~
+
+Crawl the links on from the provided start point (asyncio engine).
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+import asyncio
+from itertools import count
+from signal import SIGINT, signal
+from time import monotonic, time
+from types import FrameType
+from typing import Any, Callable, Dict, List, Optional  # pylint: disable-msg=W0611
+
+from requests import RequestException
+
+from .async_request import AsyncTransport, proxies
+from .autoscale import INTERVAL
+from .breaker import unreachable
+from .crawler import Crawler
+from .exceptions import DeadlinksEngine, DeadlinksRateLimitedURL, DeadlinksRedirectionURL
+from .link import Link
+from .serving.direct import INTERNAL
+from .settings import Settings
+
+# -- Constants -----------------------------------------------------------------
+
+# queue priorities of scheduled (retried, deferred) and new urls.
+SCHEDULED, NEW = 0, 1
+
+# -- Implementation ------------------------------------------------------------
+
+
+class AsyncCrawler(Crawler):
+    """ Crawler that keeps all requests in flight from the one thread.
+
+    Reuses Crawler's index, ignore rules and links processing, only requests
+    (and scheduling) are done with asyncio.
+    """
+
+    def __init__(self, settings: Settings, concurrency: Optional[int] = None) -> None:
+
+        # transport connects to the hosts directly, unlike requests it knows
+        # nothing about proxies.
+        if proxies():
+            raise DeadlinksEngine(
+                "asyncio engine doesn't support proxies (HTTP_PROXY, HTTPS_PROXY...), "
+                "use threads engine instead")
+
+        # asyncio queue exists only while event loop is running.
+        # (priority, sequence, link), scheduled urls go ahead of new ones.
+        self._pending = None # type: Optional[asyncio.PriorityQueue]
+        self._sequence = count()
+        self._loop = None # type: Optional[asyncio.AbstractEventLoop]
+        self._done = None # type: Optional[asyncio.Future]
+        self._robots_fetches = {} # type: Dict[str, asyncio.Future]
+        self._tasks = [] # type: List[asyncio.Future]
+
+        # concurrent requests to the host, and time host can be requested
+        # next time (Crawl-delay).
+        self._host_busy = {} # type: Dict[str, int]
+        self._host_freed = None # type: Optional[asyncio.Condition]
+        self._not_before = {} # type: Dict[str, float]
+
+        # rate limited (and retried) urls waiting to be queued again.
+        self._scheduled = {} # type: Dict[asyncio.Future, Link]
+
+        super().__init__(settings)
+
+        self.concurrency = concurrency or settings.threads
+        self.limiter.workers = self.concurrency
+        if self.autoscaler is not None:
+            self.autoscaler.maximum = self.concurrency
+        self.aio = AsyncTransport(pool_size=self.concurrency, unresolved=self.transport.unresolved)
+        if self.direct is not None:
+            self.aio.mount(INTERNAL, self.direct)
+
+    def stop(self, sig: int, frame: Optional[FrameType]) -> None:
+        """ Captures SIGINT signal and and change terminition state """
+        super().stop(sig, frame)
+
+        if self._loop is not None and self._done is not None:
+            self._loop.call_soon_threadsafe(self._done.cancel)
+
+    def start(self) -> None:
+        """ Starts the crawling process. """
+
+        if self.crawling or self.crawled or self.terminated:
+            return
+
+        self.crawling = True
+
+        # catching kill signal.
+        signal(SIGINT, self.stop)
+
+        self.start_checkpoints()
+
+        asyncio.run(self.crawl())
+
+        self.stop_checkpoints()
+
+        if self.cache is not None:
+            self.cache.close()
+
+        self.crawling = False
+        self.crawled = True
+
+    async def crawl(self) -> None:
+        """ Runs workers until queue is processed or crawler terminated. """
+
+        self._loop = asyncio.get_running_loop()
+        self._pending = asyncio.PriorityQueue()
+        self._host_freed = asyncio.Condition()
+
+        # links added before event loop started.
+        for link in self.frontier.drain():
+            self._pending.put_nowait((NEW, next(self._sequence), link))
+
+        if self.autoscaler is not None:
+            self._tasks.append(asyncio.ensure_future(self.autoscaling_async()))
+            self.scale(self.autoscaler.target)
+        else:
+            self.scale(self.concurrency)
+
+        self._done = asyncio.ensure_future(self.drained())
+
+        try:
+            await self._done
+        except asyncio.CancelledError:
+            pass
+        finally:
+            tasks = self._tasks + list(self._scheduled)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.aio.close()
+
+            self._tasks = []
+            self._workers.clear()
+
+            self._pending = None
+            self._host_freed = None
+            self._loop = None
+            self._done = None
+
+    async def drained(self) -> None:
+        """ Wait till queue is processed, and there are no scheduled urls. """
+
+        while True:
+            await self._pending.join() # type: ignore
+            if not self._scheduled:
+                return
+
+            await asyncio.wait(list(self._scheduled))
+
+    def spawn(self, idx: int) -> None:
+        """ Starts worker. """
+
+        self._tasks.append(asyncio.ensure_future(self.worker(idx)))
+
+    async def autoscaling_async(self) -> None:
+        """ Adjusts number of workers while crawling. """
+
+        while True:
+            await asyncio.sleep(INTERVAL)
+            queued = self._pending.qsize() # type: ignore
+            self.scale(self.autoscaler.adjust(queued, len(self._workers))) # type: ignore
+
+    async def worker(self, idx: int = 0) -> None:
+        """ Indexation process. """
+
+        while not self.retired(idx):
+            _, _, url = await self._pending.get() # type: ignore
+            try:
+                if not self.terminated:
+                    await self.update_async(url)
+            finally:
+                self._pending.task_done() # type: ignore
+
+    def enqueue(self, link: Link) -> None:
+        """ Put link to the crawling queue. """
+
+        if self._pending is None:
+            super().enqueue(link)
+            return
+
+        item = (NEW, next(self._sequence), link)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # links found by url checked in executor (see `blocking`).
+            self._loop.call_soon_threadsafe(self._pending.put_nowait, item) # type: ignore
+            return
+
+        self._pending.put_nowait(item)
+
+    def defer(self, url: Link, until: float) -> None:
+        """ Put url back to the crawling queue, till `until` (monotonic).
+
+        Host's pause is known to limiter, and checked in `host_turn`.
+        """
+        self.schedule(url, until)
+
+    def schedule(self, url: Link, moment: float) -> None:
+        """ Put url back to the crawling queue at `moment` (monotonic). """
+
+        if self._pending is None:
+            super().schedule(url, moment)
+            return
+
+        task = asyncio.ensure_future(self.requeue(url, moment))
+        self._scheduled[task] = url
+        task.add_done_callback(lambda x: self._scheduled.pop(x, None))
+
+    async def requeue(self, url: Link, moment: float) -> None:
+        """ Queue scheduled url once its time comes. """
+
+        await asyncio.sleep(max(0.0, moment - monotonic()))
+        self._pending.put_nowait((SCHEDULED, next(self._sequence), url)) # type: ignore
+
+    async def blocking(self, function: Callable, *args: Any) -> Any:
+        """ Call function, that reads (or writes) sqlite cache or Document
+            Root files, without blocking event loop. """
+
+        if self.cache is None and self.direct is None:
+            return function(*args)
+
+        return await self._loop.run_in_executor(None, function, *args) # type: ignore
+
+    async def update_async(self, url: Link) -> None:
+        """ Update state or the url by checking it's data. """
+
+        await self.robots_txt(url)
+
+        prepared = self.prepare(url)
+        if prepared is None:
+            return
+        url = prepared
+
+        is_external = url.is_external(self.settings.base)
+        if is_external and await self.blocking(self.from_cache, url):
+            return
+
+        page = await self.blocking(self.page_of, url, is_external)
+        if await self.blocking(self.unchanged, url, page):
+            return
+
+        headers = page.headers() if page is not None else None
+
+        if self.skipped(url):
+            return
+
+        host = url.domain
+        if not await self.host_turn(host):
+            # host tripped while url waited for its turn, or host is paused
+            # (rate limited) and url requested once it's resumed.
+            if not self.skipped(url):
+                self.defer(url, self.limiter.paused(host))
+            return
+
+        url.message = ""
+        url.unreachable = False
+        started = time()
+        try:
+            response = await self.aio.request(
+                url.url(), is_external, headers=headers, extract=True)
+            exists = url.consume(response, page, response.links) # type: ignore
+        except RequestException as exception:
+            url.message = str(exception)
+            url.unreachable = unreachable(exception)
+            exists = False
+        except DeadlinksRedirectionURL as _href:
+            self.redirected_to(url, str(_href))
+            if is_external:
+                await self.blocking(self.to_cache, url, time() - started, str(_href))
+            return
+        except DeadlinksRateLimitedURL as _retry_after:
+            # (not cached) failure, if url deferred too many times.
+            if not self.throttled(url, str(_retry_after)):
+                self.checked(url, False)
+            return
+        else:
+            self.limiter.succeeded(host, self.host_maximum(host))
+        finally:
+            # urls waiting for host's turn, find out it's tripped (if it is).
+            self.connected(url)
+            await self.host_done(host)
+            self.observe(url, time() - started)
+
+        if not exists and self.retried(url):
+            return
+
+        await self.blocking(self.revalidated, url, page, exists)
+        self.checked(url, exists)
+        if is_external:
+            await self.blocking(self.to_cache, url, time() - started)
+
+    async def host_turn(self, host: str) -> bool:
+        """ Wait till host can be requested (same limits as Frontier has).
+
+        Return False (without waiting for the turn) if host is paused or
+        tripped, True if it's requested (and `host_done` should be called
+        after request).
+        """
+
+        def ready() -> bool:
+            return self.host_free(host) or self.breaker.tripped(host)
+
+        async with self._host_freed: # type: ignore
+            await self._host_freed.wait_for(ready) # type: ignore
+
+            if self.breaker.tripped(host) or self.limiter.paused(host) > monotonic():
+                return False
+
+            self._host_busy[host] = self._host_busy.get(host, 0) + 1
+
+        delay = self.host_delay(host)
+        if delay:
+            now = monotonic()
+            moment = max(now, self._not_before.get(host, 0.0))
+            self._not_before[host] = moment + delay
+            await asyncio.sleep(moment - now)
+
+            if self.breaker.tripped(host):
+                await self.host_done(host)
+                return False
+
+        return True
+
+    def host_free(self, host: str) -> bool:
+        """ Has host less requests in flight, than it's limited to? """
+
+        limit = self.host_limit(host)
+        return limit is None or self._host_busy.get(host, 0) < limit
+
+    async def host_done(self, host: str) -> None:
+        """ Request to the host is done, next one can be sent. """
+
+        async with self._host_freed: # type: ignore
+            self._host_busy[host] -= 1
+            if not self._host_busy[host]:
+                del self._host_busy[host]
+            self._host_freed.notify_all() # type: ignore
+
+    def tripped(self, host: str) -> None:
+        """ Fail scheduled urls of the host, that just tripped circuit
+            breaker, without waiting for their time. """
+
+        super().tripped(host)
+
+        for task, url in list(self._scheduled.items()):
+            if url.domain == host:
+                task.cancel()
+                del self._scheduled[task]
+                self.update(url)
+
+    async def robots_txt(self, url: Link) -> None:
+        """ Fetch robots.txt for url's domain (once) without blocking loop. """
+
+        if not self.settings.check_robots_txt or not url.is_valid():
+            return
+
+        if url.is_external(self.settings.base) and not self.settings.external:
+            return
+
+        if self.robots[url.domain].state is not None:
+            return
+
+        if url.domain not in self._robots_fetches:
+            self._robots_fetches[url.domain] = asyncio.ensure_future(self.fetch_robots_txt(url))
+
+        await self._robots_fetches[url.domain]
+
+    async def fetch_robots_txt(self, url: Link) -> None:
+        """ Request and parse robots.txt. """
+
+        robots_url = url.link("/robots.txt")
+        if await self.blocking(self.robots[url.domain].cached, robots_url):
+            return
+
+        try:
+            response = await self.aio.request(robots_url, allow_redirects=True)
+        except RequestException:
+            self.robots[url.domain].state = False
+            return
+
+        await self.blocking(self.robots[url.domain].consume, robots_url, response)
+
+    def statistics(self) -> Dict[str, str]:
+        """ Return crawling process statistics (for reports). """
+
+        statistics = super().statistics()
+
+        # robots.txt of base url is requested via (sync) transport.
+        sync, aio = self.transport.stats(), self.aio.stats()
+        statistics['Connections'] = "{} opened, {} reused".format(
+            sync['opened'] + aio['opened'],
+            sync['reused'] + aio['reused'],
+        )
+
+        return statistics
@@ -0,0 +1,442 @@
+# Copyright 2019 Oleg Butuzov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+deadlinks.async_request
+~~~~~~~~~~~~~~~~~~~~~~~
+
+asyncio HTTP/1.1 client (with keep-alive connections) for AsyncCrawler.
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+import asyncio
+import socket
+import ssl
+from base64 import b64encode
+from collections import defaultdict
+from contextlib import closing
+from typing import Any, AsyncIterator, Awaitable, DefaultDict, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+from urllib.request import getproxies
+
+from requests.certs import where
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import (ConnectTimeout, RequestException, RetryError, Timeout,
+                                 TooManyRedirects)
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_auth_from_url, get_encoding_from_headers, requote_uri
+
+from .extractor import CHUNK_SIZE, BodyExtractor
+from .limiter import rate_limited
+from .request import DEFAULT_POOL_SIZE, RETRY_STATUSES, Counters, Unresolved, backoff, user_agent
+
+# -- Constants -----------------------------------------------------------------
+
+MAX_REDIRECTS = 10
+
+# seconds to wait for connection, and for each read of the response.
+DEFAULT_TIMEOUT = 30
+
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+Address = Tuple[str, str, int]
+
+# -- Implementation ------------------------------------------------------------
+
+
+def proxies() -> Dict[str, str]:
+    """ Proxies (HTTP_PROXY, HTTPS_PROXY...) set in environment. """
+    return {scheme: proxy for scheme, proxy in getproxies().items() if scheme != 'no'}
+
+
+def authorization(url: str) -> Optional[str]:
+    """ Basic authorization for url's `user:pass@`, same as requests does. """
+
+    username, password = get_auth_from_url(url)
+    if not (username or password):
+        return None
+
+    credentials = f"{username}:{password}".encode('latin-1')
+    return f"Basic {b64encode(credentials).decode('ascii')}"
+
+
+class AsyncResponse:
+    """ Minimal subset of requests.Response used by URL.
+
+    Body of the response is either kept as `content`, or only `links` found
+    in it (while it was read) are.
+    """
+
+    def __init__(
+            self, url: str, status_code: int, headers: CaseInsensitiveDict,
+            content: bytes, links: Optional[List[str]] = None) -> None:
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.links = links
+
+    @property
+    def encoding(self) -> Optional[str]:
+        """ Encoding declared in headers. """
+        return get_encoding_from_headers(self.headers)
+
+    @property
+    def text(self) -> str:
+        """ Content of the response, in unicode. """
+
+        try:
+            return self.content.decode(self.encoding or 'utf-8', errors='replace')
+        except LookupError:
+            return self.content.decode('utf-8', errors='replace')
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        """ Iterates over the response data. """
+
+        for pos in range(0, len(self.content), chunk_size):
+            yield self.content[pos:pos + chunk_size]
+
+
+def direct(
+        adapter: Any, method: str, url: str, target: str, headers: Dict[str, str],
+        extract: bool) -> AsyncResponse:
+    """ Response of the adapter (serving.direct.DirectAdapter), same as
+        AsyncTransport's one. """
+
+    code, response_headers, body = adapter.respond(method, target, CaseInsensitiveDict(headers))
+    response_headers = CaseInsensitiveDict(response_headers)
+
+    with closing(body):
+        if not extract or code // 100 != 2:
+            return AsyncResponse(url, code, response_headers, body.read())
+
+        extractor = BodyExtractor(response_headers)
+        for chunk in iter(lambda: body.read(CHUNK_SIZE), b""):
+            extractor.feed(chunk)
+
+    return AsyncResponse(url, code, response_headers, b"", extractor.close())
+
+
+class AsyncTransport:
+    """ Keep-alive connections to the crawled hosts (asyncio version). """
+
+    def __init__(
+            self, pool_size: int = DEFAULT_POOL_SIZE, retries: int = 0,
+            timeout: float = DEFAULT_TIMEOUT, unresolved: Optional[Unresolved] = None) -> None:
+
+        self._pool_size = max(1, pool_size)
+        self._retries = retries
+        self._timeout = timeout
+        self._idle = defaultdict(list) # type: DefaultDict[Address, List[Connection]]
+        self._counters = Counters()
+        self.unresolved = unresolved or Unresolved()
+        self._ssl = None # type: Optional[ssl.SSLContext]
+        self._mounts = {} # type: Dict[str, Any]
+
+    def mount(self, origin: str, adapter: Any) -> None:
+        """ Use adapter (serving.direct.DirectAdapter) for requests to origin. """
+        self._mounts[origin] = adapter
+
+    async def request(
+            self, url: str, is_external: bool = False, allow_redirects: bool = False,
+            headers: Optional[Dict[str, str]] = None, extract: bool = False) -> AsyncResponse:
+        """Request a web resource and return Response
+
+        Perform GET  - for the local resource
+                HEAD - for the remote resource
+
+        With `extract`, links are found in 2XX response body while it's read,
+        instead of keeping the body.
+        """
+
+        method = "HEAD" if is_external else "GET"
+
+        for _ in range(MAX_REDIRECTS + 1):
+            response = await self._retrying(method, url, headers or {}, extract)
+
+            if not allow_redirects or response.status_code // 100 != 3 \
+                or 'location' not in response.headers:
+                return response
+
+            url = urljoin(url, response.headers['location'])
+
+        raise TooManyRedirects(f"Exceeded {MAX_REDIRECTS} redirects.")
+
+    async def _retrying(
+            self, method: str, url: str, headers: Dict[str, str], extract: bool) -> AsyncResponse:
+        """ Retries requests on the connection errors or 502, 503, 504. """
+
+        attempt = 0
+        while True:
+            try:
+                response = await self._send(method, url, headers, extract)
+            except RequestException as exception:
+                error = exception # type: Exception
+            except asyncio.TimeoutError:
+                error = Timeout(f"Read timed out. (url: {url})")
+            except (OSError, ValueError, asyncio.IncompleteReadError) as exception:
+                error = RequestsConnectionError(f"Failed to establish a connection: {exception}")
+            else:
+                # without retries, responses returned as they are, and rate
+                # limited responses are crawler's business.
+                if response.status_code not in RETRY_STATUSES or not self._retries \
+                        or rate_limited(response.status_code, response.headers):
+                    return response
+
+                error = RetryError(
+                    f"Max retries exceeded with url: {url} "
+                    f"(Caused by too many {response.status_code} error responses)")
+
+            if attempt >= self._retries:
+                raise error
+
+            attempt += 1
+            await asyncio.sleep(backoff(attempt))
+
+    async def _send(
+            self, method: str, url: str, headers: Dict[str, str], extract: bool) -> AsyncResponse:
+        """ Send request over (pooled if possible) connection. """
+
+        parts = urlsplit(requote_uri(url))
+        if parts.scheme not in {'http', 'https'} or not parts.hostname:
+            raise ValueError(f"Invalid URL {url}")
+
+        host = parts.hostname.encode('idna').decode('ascii')
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        address = (parts.scheme, host, port)
+
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+
+        adapter = self._mounts.get(f"{parts.scheme}://{parts.netloc}/")
+        if adapter is not None:
+            # files are read without blocking event loop.
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, direct, adapter, method, url, target, headers, extract)
+
+        netloc = parts.netloc.rpartition('@')[2]
+        credentials = authorization(url)
+        if credentials and 'authorization' not in {name.lower() for name in headers}:
+            headers = {**headers, 'Authorization': credentials}
+
+        request = "".join([
+            f"{method} {target} HTTP/1.1\r\n",
+            f"Host: {netloc.encode('idna').decode('ascii')}\r\n",
+            f"User-Agent: {user_agent}\r\n",
+            "Accept: */*\r\n",
+            "Accept-Encoding: identity\r\n",
+            "Connection: keep-alive\r\n",
+            *(f"{name}: {value}\r\n" for name, value in headers.items()),
+            "\r\n",
+        ]).encode('latin-1')
+
+        # pooled connection can be closed by server at any moment, so we
+        # retrying request on a new connection if it fails.
+        while True:
+            connection = self._checkout(address)
+            is_pooled = connection is not None
+            if connection is None:
+                connection = await self._connect(address)
+
+            try:
+                response, keep_alive = await self._exchange(
+                    connection, method, url, request, extract)
+            except asyncio.TimeoutError:
+                connection[1].close()
+                raise
+            except (OSError, asyncio.IncompleteReadError):
+                connection[1].close()
+                if is_pooled:
+                    continue
+                raise
+
+            if keep_alive:
+                self._checkin(address, connection)
+            else:
+                connection[1].close()
+
+            return response
+
+    def _checkout(self, address: Address) -> Optional[Connection]:
+        """ Return idle connection to the host (if any). """
+
+        while self._idle[address]:
+            connection = self._idle[address].pop()
+            if not connection[0].at_eof() and not connection[1].is_closing():
+                self._counters.checkout()
+                return connection
+            connection[1].close()
+
+        return None
+
+    def _checkin(self, address: Address, connection: Connection) -> None:
+        """ Return connection to the pool. """
+
+        if len(self._idle[address]) >= self._pool_size:
+            connection[1].close()
+            return
+
+        self._idle[address].append(connection)
+
+    async def _connect(self, address: Address) -> Connection:
+        """ Open new connection to the host. """
+
+        scheme, host, port = address
+
+        context = None
+        if scheme == 'https':
+            if self._ssl is None:
+                self._ssl = ssl.create_default_context(cafile=where())
+            context = self._ssl
+
+        try:
+            error = self.unresolved.get(host)
+            if error is not None:
+                raise socket.gaierror(error)
+
+            connection = await self._timed(
+                asyncio.open_connection(host, port, ssl=context)) # type: Connection
+        except asyncio.TimeoutError:
+            raise ConnectTimeout(f"Connection to {host} timed out.") from None
+        except ssl.SSLError:
+            raise
+        except OSError as exception:
+            if isinstance(exception, socket.gaierror):
+                self.unresolved.put(host, str(exception))
+            # host is unreachable (see breaker.unreachable).
+            raise RequestsConnectionError(
+                f"Failed to establish a connection: {exception}") from exception
+
+        self._counters.opened()
+        self._counters.checkout()
+        return connection
+
+    async def _timed(self, awaitable: Awaitable) -> Any:
+        """ Wait for connection (or read) no longer than timeout. """
+        return await asyncio.wait_for(awaitable, self._timeout)
+
+    async def _exchange(
+            self, connection: Connection, method: str, url: str, request: bytes,
+            extract: bool) -> Tuple[AsyncResponse, bool]:
+        """ Write request and read response. """
+
+        reader, writer = connection
+
+        writer.write(request)
+        await self._timed(writer.drain())
+
+        while True:
+            status_line = await self._timed(reader.readline())
+            if not status_line:
+                raise ConnectionResetError("Remote end closed connection without response")
+
+            version, status, _ = (status_line.decode('latin-1').rstrip("\r\n") + "  ").split(" ", 2)
+            if not version.startswith("HTTP/") or not status.isdigit():
+                raise ValueError(f"Bad status line {status_line!r}")
+
+            status_code = int(status)
+            headers = await self._headers(reader)
+
+            # informational responses followed by the actual one.
+            if not 100 <= status_code < 200:
+                break
+
+        connection_header = headers.get('connection', '').lower()
+        if version == "HTTP/1.1":
+            keep_alive = connection_header != 'close'
+        else:
+            keep_alive = connection_header == 'keep-alive'
+
+        if method == "HEAD" or status_code in {204, 304}:
+            return AsyncResponse(url, status_code, headers, b""), keep_alive
+
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            chunks = self._chunked(reader)
+        elif 'content-length' in headers:
+            chunks = self._sized(reader, int(headers['content-length']))
+        else:
+            chunks = self._till_closed(reader)
+            keep_alive = False
+
+        if not extract or status_code // 100 != 2:
+            content = b"".join([chunk async for chunk in chunks])
+            return AsyncResponse(url, status_code, headers, content), keep_alive
+
+        # body isn't kept, only links found in it.
+        extractor = BodyExtractor(headers)
+        async for chunk in chunks:
+            extractor.feed(chunk)
+
+        return AsyncResponse(url, status_code, headers, b"", extractor.close()), keep_alive
+
+    async def _headers(self, reader: asyncio.StreamReader) -> CaseInsensitiveDict:
+        """ Read headers of the response. """
+
+        headers = CaseInsensitiveDict() # type: CaseInsensitiveDict
+        while True:
+            line = await self._timed(reader.readline())
+            if line in {b"\r\n", b"\n", b""}:
+                return headers
+
+            name, _, value = line.decode('latin-1').partition(":")
+            name, value = name.strip(), value.strip()
+            headers[name] = f"{headers[name]}, {value}" if name in headers else value
+
+    async def _sized(self, reader: asyncio.StreamReader, length: int) -> AsyncIterator[bytes]:
+        """ Read body of the response (of `length` bytes) by chunks. """
+
+        while length > 0:
+            chunk = await self._timed(reader.readexactly(min(length, CHUNK_SIZE)))
+            length -= len(chunk)
+            yield chunk
+
+    async def _till_closed(self, reader: asyncio.StreamReader) -> AsyncIterator[bytes]:
+        """ Read body of the response by chunks, till connection is closed. """
+
+        while True:
+            chunk = await self._timed(reader.read(CHUNK_SIZE))
+            if not chunk:
+                return
+            yield chunk
+
+    async def _chunked(self, reader: asyncio.StreamReader) -> AsyncIterator[bytes]:
+        """ Read chunked body of the response. """
+
+        while True:
+            size = int((await self._timed(reader.readline())).split(b";")[0].strip(), 16)
+            if size == 0:
+                break
+            yield await self._timed(reader.readexactly(size))
+            await self._timed(reader.readexactly(2))
+
+        # trailers
+        while (await self._timed(reader.readline())) not in {b"\r\n", b"\n", b""}:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        """ Return opened/reused connections stats. """
+        return self._counters.stats()
+
+    async def close(self) -> None:
+        """ Close all pooled connections. """
+
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
@@ -0,0 +1,128 @@
+# Copyright 2019 Oleg Butuzov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+deadlinks.autoscale
+~~~~~~~~~~~~~~~~~~~
+
+Decides how many workers crawler runs (`--threads auto`).
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from threading import Lock
+from typing import Optional, Tuple
+
+# -- Constants -----------------------------------------------------------------
+
+# seconds between two adjustments.
+INTERVAL = 0.5
+
+# number of workers we start with.
+INITIAL_WORKERS = 4
+
+# share of failed (connection errors, 429 and 5xx) requests, that makes us
+# halve the number of workers.
+MAX_ERRORS_RATE = 0.2
+
+# latency increase (compared to best latency seen) that makes us remove
+# one worker.
+MAX_LATENCY_GROWTH = 2.0
+
+# -- Implementation ------------------------------------------------------------
+
+
+class Autoscaler:
+    """ Workers number controller.
+
+    Workers reporting every request latency and result, crawler calling
+    `adjust` each INTERVAL seconds to get new workers target:
+      - too many errors   - halve workers;
+      - latency growing   - remove one worker;
+      - work is queued    - add half of current workers.
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1, initial: int = INITIAL_WORKERS) -> None:
+
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.target = min(self.maximum, max(self.minimum, initial))
+
+        self._lock = Lock()
+
+        # observations since last adjustment
+        self._requests = 0 # type: int
+        self._errors = 0 # type: int
+        self._elapsed = 0.0 # type: float
+        self._baseline = None # type: Optional[float]
+
+        # concurrency statistics
+        self._peak = 0 # type: int
+        self._samples = 0 # type: int
+        self._total = 0 # type: int
+
+    def observe(self, elapsed: float, is_error: bool) -> None:
+        """ Record finished request. """
+
+        with self._lock:
+            self._requests += 1
+            self._elapsed += elapsed
+            self._errors += int(is_error)
+
+    def adjust(self, queued: int, workers: int) -> int:
+        """ Return new workers target, based on requests since last call. """
+
+        with self._lock:
+            requests, errors, elapsed = self._requests, self._errors, self._elapsed
+            self._requests, self._errors, self._elapsed = 0, 0, 0.0
+
+            self._peak = max(self._peak, workers)
+            self._samples += 1
+            self._total += workers
+
+        if not requests:
+            # nothing finished yet, but there is a work to do.
+            if queued:
+                self._grow()
+            return self.target
+
+        latency = elapsed / requests
+        baseline = latency if self._baseline is None else self._baseline
+
+        # best latency we seen, slowly forgotten so new normal can be accepted.
+        self._baseline = min(latency, baseline * 1.05)
+
+        if errors / requests > MAX_ERRORS_RATE:
+            self.target = max(self.minimum, self.target // 2)
+        elif latency > MAX_LATENCY_GROWTH * baseline:
+            self.target = max(self.minimum, self.target - 1)
+        elif queued:
+            self._grow()
+
+        return self.target
+
+    def _grow(self) -> None:
+        self.target = min(self.maximum, self.target + max(1, self.target // 2))
+
+    def concurrency(self) -> Tuple[int, float]:
+        """ Return peak and average number of workers. """
+
+        with self._lock:
+            if not self._samples:
+                return (self.target, float(self.target))
+
+            return (self._peak, self._total / self._samples)
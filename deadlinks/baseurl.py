@@ -33,9 +33,11 @@ class BaseURL(Link):
         to crawler or Link.
     """
 
+    __slots__ = ('_base_path', )
+
     def __init__(self, url: str) -> None:
         super().__init__(url)
-        self._path = self.get_base_path()
+        self._base_path = self.get_base_path()
 
     def get_base_path(self) -> str:
         file = self.path.split("/")[-1]
@@ -50,7 +52,7 @@ class BaseURL(Link):
         if link.is_external(self):
             return False
 
-        return link.path.startswith(self._path.rstrip("/"))
+        return link.path.startswith(self._base_path.rstrip("/"))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,125 @@
+# Copyright 2019 Oleg Butuzov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+deadlinks.breaker
+~~~~~~~~~~~~~~~~~
+
+Per host circuit breaker: links of the host, that failed to connect too many
+times in a row, reported as failed without requests.
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import ConnectTimeout, SSLError
+from urllib3.exceptions import NewConnectionError
+
+# -- Constants -----------------------------------------------------------------
+
+# connection errors in a row, that trip host's circuit breaker.
+DEFAULT_FAILURES = 5
+
+# -- Implementation ------------------------------------------------------------
+
+
+def unreachable(error: Exception) -> bool:
+    """ Is error a failure to connect to the host (DNS or connection error,
+        connect timeout), and not an error of the request (read timeout, SSL
+        error, too many redirects)? """
+
+    if isinstance(error, ConnectTimeout):
+        return True
+
+    if not isinstance(error, RequestsConnectionError) or isinstance(error, SSLError):
+        return False
+
+    # requests wraps urllib3's NewConnectionError (into MaxRetryError), while
+    # asyncio engine raises it from the OSError of the connect.
+    reason = error.__cause__ or (error.args[0] if error.args else None)
+    return isinstance(getattr(reason, 'reason', reason), (NewConnectionError, OSError))
+
+
+class Breaker:
+    """ Hosts circuit breaker.
+
+    Host "trips" after `threshold` connection errors (not responses) in a
+    row, and stays tripped till the end of crawling. None - host never trips.
+    """
+
+    def __init__(self, threshold: Optional[int] = DEFAULT_FAILURES) -> None:
+
+        self.threshold = threshold
+
+        self._lock = Lock()
+
+        # connection errors in a row, and reasons tripped hosts are skipped.
+        self._failures = {} # type: Dict[str, int]
+        self._tripped = {} # type: Dict[str, str]
+        self._skipped = 0 # type: int
+
+    def failed(self, host: str, error: str) -> bool:
+        """ Request to the host failed with connection error, return True if
+            host tripped with it. """
+
+        if self.threshold is None:
+            return False
+
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+
+            if failures < self.threshold or host in self._tripped:
+                return False
+
+            self._tripped[host] = "Skipped, {} connection errors in a row: {}".format(
+                failures, error)
+            return True
+
+    def succeeded(self, host: str) -> None:
+        """ Host responded. """
+
+        with self._lock:
+            self._failures.pop(host, None)
+
+    def tripped(self, host: str) -> bool:
+        """ Is host's circuit breaker tripped? """
+
+        with self._lock:
+            return host in self._tripped
+
+    def skipped(self, host: str) -> Optional[str]:
+        """ Return reason to skip request to the host (if it's tripped). """
+
+        with self._lock:
+            reason = self._tripped.get(host)
+            if reason is not None:
+                self._skipped += 1
+
+            return reason
+
+    def stats(self) -> Dict[str, Any]:
+        """ Return tripped hosts and number of skipped requests. """
+
+        with self._lock:
+            return {
+                'tripped': sorted(self._tripped),
+                'skipped': self._skipped,
+            }
@@ -0,0 +1,283 @@
+# Copyright 2019 Oleg Butuzov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+deadlinks.cache
+~~~~~~~~~~~~~~~
+
+Results of external urls checks and validators (with links) of the crawled
+pages, kept between runs (sqlite database).
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+import json
+import sqlite3
+from threading import Lock
+from time import time
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import urlparse, urlunparse
+
+from .status import Status
+
+# -- Constants -----------------------------------------------------------------
+
+# default time (in seconds) results of the checks are valid.
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_NEGATIVE_TTL = 60 * 60
+
+# seconds to wait for the other process (sharing cache file) to finish write.
+TIMEOUT = 30
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS results (
+        url      TEXT PRIMARY KEY,
+        status   INTEGER NOT NULL,
+        message  TEXT NOT NULL,
+        location TEXT NOT NULL,
+        checked  REAL NOT NULL,
+        elapsed  REAL NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS pages (
+        url      TEXT PRIMARY KEY,
+        etag     TEXT NOT NULL,
+        modified TEXT NOT NULL,
+        links    TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS robots (
+        url      TEXT PRIMARY KEY,
+        status   INTEGER NOT NULL,
+        lines    TEXT NOT NULL,
+        checked  REAL NOT NULL
+    );
+"""
+
+# -- Implementation ------------------------------------------------------------
+
+
+class Result(NamedTuple):
+    """ Cached result of the url check. """
+
+    status: Status
+    message: str  # status code or error
+    location: str # redirection target
+    checked: float
+    elapsed: float
+
+
+class Page(NamedTuple):
+    """ Validators and links of the previously crawled page. """
+
+    etag: str
+    modified: str
+    links: List[str]
+
+    def headers(self) -> Dict[str, str]:
+        """ Return headers of the conditional request. """
+
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.modified:
+            headers['If-Modified-Since'] = self.modified
+        return headers
+
+
+def canonical(url: str) -> str:
+    """ Cache key: url without fragment, default port and letter case
+        differences in scheme and host. """
+
+    parsed = urlparse(url)
+
+    # port that isn't a number (or out of range), url is a key as it is.
+    try:
+        port = parsed.port
+    except ValueError:
+        return url
+
+    scheme = parsed.scheme.lower()
+    netloc = (parsed.hostname or "").lower()
+    if port and port != DEFAULT_PORTS.get(scheme):
+        netloc += ":{}".format(port)
+
+    return urlunparse((scheme, netloc, parsed.path or "/", parsed.params, parsed.query, ""))
+
+
+class Cache:
+    """ Checks results storage.
+
+    Results of the successful checks (and redirections) are valid for `ttl`
+    seconds, failed ones - for `negative_ttl` seconds. Pages are kept till
+    server says they are modified, robots.txt files - for `ttl` seconds.
+    Same file can be shared by a few crawlers (processes) running at the same
+    time.
+    """
+
+    def __init__(
+            self, path: str, ttl: int = DEFAULT_TTL,
+            negative_ttl: int = DEFAULT_NEGATIVE_TTL) -> None:
+
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        # connection shared by crawler's threads.
+        self._lock = Lock()
+        connection = sqlite3.connect(
+            path,
+            timeout=TIMEOUT,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+
+        # readers do not block writer (and vice versa) in WAL mode.
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+
+        self._db = connection # type: Optional[sqlite3.Connection]
+
+        self._hits = 0 # type: int
+        self._misses = 0 # type: int
+        self._saved = 0.0 # type: float
+        self._revalidated = 0 # type: int
+        self._not_modified = 0 # type: int
+
+    def get(self, url: str) -> Optional[Result]:
+        """ Return result of the url check (if it isn't expired yet). """
+
+        with self._lock:
+            if self._db is None:
+                return None
+
+            row = self._db.execute(
+                "SELECT status, message, location, checked, elapsed "
+                "FROM results WHERE url = ?", (canonical(url), )).fetchone()
+
+            result = None # type: Optional[Result]
+            if row is not None:
+                result = Result(Status(row[0]), *row[1:])
+
+            if result is None or result.checked + self.expires(result.status) < time():
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            self._saved += result.elapsed
+            return result
+
+    def put(
+            self, url: str, status: Status, message: str = "", location: str = "",
+            elapsed: float = 0.0) -> None:
+        """ Store result of the url check. """
+
+        with self._lock:
+            if self._db is None:
+                return
+
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (canonical(url), status.value, message, location, time(), elapsed))
+
+    def page(self, url: str) -> Optional[Page]:
+        """ Return validators and links of the page (if it was crawled). """
+
+        with self._lock:
+            if self._db is None:
+                return None
+
+            row = self._db.execute(
+                "SELECT etag, modified, links FROM pages WHERE url = ?",
+                (canonical(url), )).fetchone()
+
+        if row is None:
+            return None
+
+        return Page(row[0], row[1], json.loads(row[2]))
+
+    def put_page(self, url: str, etag: str, modified: str, links: List[str]) -> None:
+        """ Store validators and links of the page. """
+
+        with self._lock:
+            if self._db is None:
+                return
+
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)",
+                (canonical(url), etag, modified, json.dumps(links)))
+
+    def robots(self, url: str) -> Optional[Tuple[int, List[str]]]:
+        """ Return status code and lines of robots.txt (if it isn't expired). """
+
+        with self._lock:
+            if self._db is None:
+                return None
+
+            row = self._db.execute(
+                "SELECT status, lines, checked FROM robots WHERE url = ?",
+                (canonical(url), )).fetchone()
+
+        if row is None or row[2] + self.ttl < time():
+            return None
+
+        return row[0], json.loads(row[1])
+
+    def put_robots(self, url: str, status: int, lines: List[str]) -> None:
+        """ Store status code and lines of robots.txt. """
+
+        with self._lock:
+            if self._db is None:
+                return
+
+            self._db.execute(
+                "INSERT OR REPLACE INTO robots VALUES (?, ?, ?, ?)",
+                (canonical(url), status, json.dumps(lines), time()))
+
+    def revalidated(self, not_modified: bool) -> None:
+        """ Count conditional request (and its result). """
+
+        with self._lock:
+            self._revalidated += 1
+            self._not_modified += int(not_modified)
+
+    def expires(self, status: Status) -> int:
+        """ Return time result with `status` is valid for. """
+
+        return self.negative_ttl if status == Status.NOT_FOUND else self.ttl
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """ Return number of cache hits, misses, time (requests) saved and
+            revalidated pages. """
+
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'saved': self._saved,
+            'revalidated': self._revalidated,
+            'not_modified': self._not_modified,
+        }
+
+    def close(self) -> None:
+        """ Close database, results aren't looked up or stored after it. """
+
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,78 @@
+# Copyright 2019 Oleg Butuzov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+deadlinks.checkpoint
+~~~~~~~~~~~~~~~~~~~~
+
+Crawling state (index, queue and robots.txt rules) saved to the file, so
+crawling can be resumed later.
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+import gzip
+import json
+from os import replace
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .exceptions import DeadlinksSettingsCheckpoint
+
+# -- Constants -----------------------------------------------------------------
+
+# checkpoint file format version.
+VERSION = 2
+
+# default time (in seconds) between checkpoints.
+DEFAULT_INTERVAL = 60
+
+# -- Implementation ------------------------------------------------------------
+
+
+def write_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    """ Write crawling state to the (gzipped json) file.
+
+    State written to the temporary file first, so killed process never
+    leaves broken checkpoint.
+    """
+
+    temporary = path + ".tmp"
+    with gzip.open(temporary, "wt", encoding="utf-8", compresslevel=6) as file:
+        json.dump({'version': VERSION, **state}, file, separators=(",", ":"))
+
+    replace(temporary, path)
+
+
+def read_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    """ Return crawling state saved to the file (if there is one). """
+
+    if not Path(path).is_file():
+        return None
+
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            state = json.load(file)
+    except (OSError, EOFError, ValueError):
+        error = 'Checkpoint "{}" can\'t be read.'
+        raise DeadlinksSettingsCheckpoint(error.format(path))
+
+    if not isinstance(state, dict) or state.get('version') != VERSION:
+        error = 'Checkpoint "{}" has unsupported format.'
+        raise DeadlinksSettingsCheckpoint(error.format(path))
+
+    return state
@@ -26,11 +26,11 @@ Functions related to click package and cli implementation.
 
 from collections import OrderedDict
 from textwrap import dedent
-from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 from click import Argument, Command, Context
 from click import HelpFormatter as Formatter
-from click import Option
+from click import IntRange, Option, Parameter
 
 from .__version__ import __app_package__ as app
 from .link import Link
@@ -133,6 +133,9 @@ class Clicker(Command):
 
             // Checking local html files
             deadlinks internal -n 10 --root=/var/html
+
+            // Checking external links, number of threads adjusted while crawling.
+            deadlinks gobyexample.com -n auto -e
         """)
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
@@ -226,6 +229,18 @@ class Clicker(Command):
 #   So we can have nice looking options groups.
 
 
+class ThreadsRange(IntRange):
+    """ IntRange that also accepts "auto" value. """
+
+    name = "threads"
+
+    def convert(self, value: Any, param: Optional[Parameter], ctx: Optional[Context]) -> Any:
+        if isinstance(value, str) and value.lower() == "auto":
+            return "auto"
+
+        return super().convert(value, param, ctx)
+
+
 def validate_url(ctx: Context, param: Argument, value: str) -> str:
     """ if received url with no scheme will try to fix it """
 
@@ -24,24 +24,47 @@ Crawl the links on from the provided start point.
 
 # -- Imports -------------------------------------------------------------------
 
-from collections import defaultdict
-from queue import Queue
+from collections import OrderedDict
+from contextlib import nullcontext
 from signal import SIGINT, signal
-from threading import Thread
-from time import sleep
+from threading import Event, Lock, Thread
+from time import monotonic, sleep, time
 from types import FrameType
-from typing import Dict, List, Optional, Tuple
-
-from .exceptions import DeadlinksIgnoredURL, DeadlinksRedirectionURL
+from typing import Any, ContextManager, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from .autoscale import INTERVAL, Autoscaler
+from .breaker import Breaker
+from .cache import Cache, Page
+from .checkpoint import read_checkpoint, write_checkpoint
+from .exceptions import (DeadlinksIgnoredURL, DeadlinksRateLimitedURL, DeadlinksRedirectionURL,
+                         DeadlinksSettingsCheckpoint)
+from .frontier import Frontier
 from .index import Index
+from .limiter import Limiter, retry_after
 from .link import Link
-from .robots_txt import RobotsTxt
+from .request import RETRY_STATUSES, Transport, backoff
+from .robots_txt import Robots, RobotsTxt
+from .serving.direct import INTERNAL, DirectAdapter
 from .settings import Settings
 from .status import Status
 
 # -- Implementation ------------------------------------------------------------
 
 
+def rehosted(url: str, host: str, replacement: str) -> str:
+    """ Return url (or host itself) with `host` replaced, if it's url's host. """
+
+    if url == host:
+        return replacement
+
+    parts = urlsplit(url)
+    if parts.netloc != host:
+        return url
+
+    return urlunsplit(parts._replace(netloc=replacement))
+
+
 class Crawler:
     """ Crawler/Spider Application. """
 
@@ -50,14 +73,58 @@ class Crawler:
 
         self.settings = settings
         self.retry = settings.retry
-        self.index = Index()
-        self.robots = defaultdict(RobotsTxt) # type: Dict[str, RobotsTxt]
+        self.index = Index(settings.max_referrers)
+
+        # keep-alive connections shared by workers and robots.txt checks.
+        # Failed requests retried by crawler (`retried`), not in the worker.
+        self.transport = Transport(pool_size=settings.threads)
+
+        # <internal> Document Root files are read without web server.
+        self.direct = None # type: Optional[DirectAdapter]
+        if settings.router is not None:
+            self.direct = DirectAdapter(settings.router)
+            self.transport.mount(INTERNAL, self.direct)
+
+        # results of external urls checks done by previous runs.
+        self.cache = None # type: Optional[Cache]
+        if settings.cache is not None:
+            self.cache = Cache(settings.cache, settings.cache_ttl, settings.cache_negative_ttl)
+
+        # robots.txt rules (of Document Root aren't cached).
+        local = settings.base.domain if settings.masked else None
+        self.robots = Robots(self.transport, self.cache, local) # type: Dict[str, RobotsTxt]
 
         # Application state
         self.terminated = False # type: bool
         self.crawling = False # type: bool
         self.crawled = False # type: bool
-        self.queue = Queue() # type: Queue
+        self.frontier = Frontier(self.host_limit, self.host_delay) # type: Frontier
+
+        # hosts concurrency (and backoff) adapted to rate limited responses.
+        self.limiter = Limiter(settings.threads) # type: Limiter
+
+        # hosts, that failed to connect too many times in a row.
+        self.breaker = Breaker(settings.max_host_failures or None) # type: Breaker
+
+        # retries done (per url).
+        self._attempts = {} # type: Dict[str, int]
+        self._attempts_lock = Lock()
+
+        # Running workers (and their number controller in "auto" mode)
+        self.autoscaler = None # type: Optional[Autoscaler]
+        if settings.autoscale:
+            self.autoscaler = Autoscaler(maximum=settings.threads)
+        self._workers = set() # type: Set[int]
+        self._workers_lock = Lock()
+
+        # Crawling state saved to checkpoint should be consistent: url status
+        # updated with all links found on it added to the index.
+        self._consistent = nullcontext() # type: ContextManager
+        if settings.checkpoint is not None:
+            self._consistent = Lock()
+        self._checkpoints = None # type: Optional[Thread]
+        self._finished = Event()
+        self.resumed = 0 # type: int
 
         # Initialization of the Queue and Index
         self._base = settings.base
@@ -70,28 +137,19 @@ class Crawler:
             error = "Issue with Base URL <{}>: {}"
             raise DeadlinksIgnoredURL(error.format(self._base.url(), message))
 
-        self.add(self._base)
+        state = None # type: Optional[Dict[str, Any]]
+        if settings.resume:
+            state = read_checkpoint(str(settings.checkpoint))
 
-    def stop(self, sig: int, frame: FrameType) -> None:
+        if state is not None:
+            self.restore(state)
+        else:
+            self.add(self._base)
+
+    def stop(self, sig: int, frame: Optional[FrameType]) -> None:
         """ Captures SIGINT signal and and change terminition state """
         self.terminated = True
-
-    def terminition_watcher(self) -> None:
-        """ Clears queue on teminated execution
-
-        TODO: Test long term waiting page and terminition
-        """
-
-        while not self.terminated:
-            sleep(0.01)
-
-        while True:
-            try:
-                while not self.queue.empty():
-                    self.queue.task_done()
-                sleep(0.01)
-            except ValueError:
-                break
+        self.frontier.close()
 
     def start(self) -> None:
         """ Starts the crawling process. """
@@ -104,53 +162,243 @@ class Crawler:
         # catching kill signal.
         signal(SIGINT, self.stop)
 
-        if self.settings.threads > 1:
+        self.start_checkpoints()
 
-            thread = Thread(target=self.terminition_watcher, daemon=True)
-            thread.start()
+        if self.settings.threads > 1:
 
-            for idx in range(1, 1 + self.settings.threads):
-                thread = Thread(target=self.indexer, args=[idx], daemon=True)
+            if self.autoscaler is not None:
+                thread = Thread(target=self.autoscaling, daemon=True)
                 thread.start()
+                self.scale(self.autoscaler.target)
+            else:
+                self.scale(self.settings.threads)
 
-            self.queue.join()
+            self.frontier.join()
         else:
             self.indexer()
 
+        self.stop_checkpoints()
+
+        if self.cache is not None:
+            self.cache.close()
+
         self.crawling = False
         self.crawled = True
 
+    def start_checkpoints(self) -> None:
+        """ Starts periodical saves of the crawling state (if required). """
+
+        if self.settings.checkpoint is None:
+            return
+
+        self._checkpoints = Thread(target=self.checkpointing, daemon=True)
+        self._checkpoints.start()
+
+    def stop_checkpoints(self) -> None:
+        """ Stops periodical saves, and saves final state. """
+
+        if self._checkpoints is None:
+            return
+
+        self._finished.set()
+        self._checkpoints.join()
+        self.save()
+
+    def checkpointing(self) -> None:
+        """ Saves crawling state every `checkpoint_interval` seconds. """
+
+        while not self._finished.wait(self.settings.checkpoint_interval):
+            self.save()
+
+    def save(self) -> None:
+        """ Saves crawling state to checkpoint. """
+
+        write_checkpoint(str(self.settings.checkpoint), self.state())
+
+    def state(self) -> Dict[str, Any]:
+        """ Return crawling state: index (with referrers), robots.txt rules.
+
+        Urls (queued or in flight) with undefined status are crawling queue.
+        """
+
+        with self._consistent:
+            index = [[
+                self.masked(link.url()),
+                link.status.value,
+                link.message,
+                [self.masked(referrer) for referrer in link.get_referrers()],
+                link.referred,
+            ] for link in list(self.index)]
+
+        robots = {} # type: Dict[str, Any]
+        for domain, robots_txt in list(self.robots.items()):
+            dumped = robots_txt.dump()
+            if isinstance(dumped, list):
+                dumped = [self.masked(dumped[0]), *dumped[1:]]
+            robots[self.masked(domain)] = dumped
+
+        return {
+            'base': self.masked(self._base.url()),
+            'index': index,
+            'robots': robots,
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """ Restore crawling state, saved to checkpoint. """
+
+        if state['base'] != self.masked(self._base.url()):
+            error = "Checkpoint is saved for <{}>"
+            raise DeadlinksSettingsCheckpoint(error.format(state['base']))
+
+        for domain, dumped in state['robots'].items():
+            if isinstance(dumped, list):
+                dumped = [self.unmasked(dumped[0]), *dumped[1:]]
+            self.robots[self.unmasked(domain)].restore(dumped)
+
+        for url, status, message, referrers, referred in state['index']:
+            url = self.unmasked(url)
+            link = self._base if url == self._base.url() else Link(url)
+
+            self.index.put(link)
+            for referrer in referrers:
+                link.add_referrer(self.unmasked(referrer), self.settings.max_referrers)
+            link.referred = max(link.referred, referred)
+
+            if status == Status.UNDEFINED.value:
+                self.enqueue(link)
+                continue
+
+            self.index.update(link, Status(status), message)
+            self.resumed += 1
+
+    def scale(self, number: int) -> None:
+        """ Starts workers, so number of running workers is `number`. """
+
+        with self._workers_lock:
+            for idx in range(1, 1 + number):
+                if idx in self._workers:
+                    continue
+
+                self._workers.add(idx)
+                self.spawn(idx)
+
+    def spawn(self, idx: int) -> None:
+        """ Starts worker. """
+
+        thread = Thread(target=self.indexer, args=[idx], daemon=True)
+        thread.start()
+
+    def retired(self, idx: int) -> bool:
+        """ Should worker stop (as autoscaler reduced workers number)? """
+
+        if self.autoscaler is None or idx <= self.autoscaler.target:
+            return False
+
+        with self._workers_lock:
+            self._workers.discard(idx)
+
+        return True
+
+    def autoscaling(self) -> None:
+        """ Adjusts number of workers while crawling. """
+
+        while self.crawling and not self.frontier.complete:
+            sleep(INTERVAL)
+            queued = self.frontier.qsize()
+            self.scale(self.autoscaler.adjust(queued, len(self._workers))) # type: ignore
+
+    def observe(self, url: Link, elapsed: float) -> None:
+        """ Report request latency and result to autoscaler. """
+
+        if self.autoscaler is None:
+            return
+
+        # connection errors and 429, 5XX responses.
+        message = url.message
+        is_error = bool(message) and (not message.isdigit() or message == "429" \
+            or int(message) >= 500)
+
+        self.autoscaler.observe(elapsed, is_error)
+
+    def connected(self, url: Link) -> None:
+        """ Report request result (connection error or response) to breaker. """
+
+        # site itself never trips, its pages are what crawler checks.
+        if url.domain == self.settings.base.domain:
+            return
+
+        # only failures to connect count, host that responds (even with
+        # read timeout or SSL error) is up.
+        if not url.unreachable:
+            self.breaker.succeeded(url.domain)
+        elif self.breaker.failed(url.domain, url.message):
+            self.tripped(url.domain)
+
+    def tripped(self, host: str) -> None:
+        """ Fail queued (and scheduled) urls of the host, that just tripped
+            circuit breaker, without waiting for their turn. """
+
+        for link in self.frontier.drop(host):
+            self.update(link)
+
+    def skipped(self, url: Link) -> bool:
+        """ Fail url without request, if its host's circuit breaker tripped. """
+
+        reason = self.breaker.skipped(url.domain)
+        if reason is None:
+            return False
+
+        url.message = reason
+        self.checked(url, False)
+        return True
+
     def indexer(self, thread_number: int = 0) -> None:
         """ Indexation process. """
 
-        while True:
-            while not self.terminated and not self.queue.empty():
+        while not self.retired(thread_number):
+
+            # blocks while other workers can bring new links.
+            url = self.frontier.get()
+            if url is None:
+                return
 
-                url = self.queue.get()
+            try:
                 self.update(url)
-                self.queue.task_done()
+            finally:
+                self.frontier.task_done(url)
 
-            else:
+    def add(self, link: Link, referrer: Optional[str] = None) -> Link:
+        """ Queue URL (unless it's already indexed), return indexed link. """
 
-                # catching terminated
-                if self.terminated:
-                    return
+        indexed, claimed = self.index.claim(link, referrer)
+        if claimed:
+            self.enqueue(link)
 
-                # in case is its only 1 thread we NOT waiting for
-                # new url to come.
-                if thread_number == 0:
-                    break
+        return indexed
 
-                # and we wait for fraction of second, if there are many threads.
-                sleep((thread_number+1) / 10)
+    def enqueue(self, link: Link) -> None:
+        """ Put link to the crawling queue. """
+        self.frontier.put(link)
 
-    def add(self, link: Link) -> None:
-        """ Queue URL. """
-        if link in self.index:
-            return
+    def host_limit(self, host: str) -> Optional[int]:
+        """ Return number of concurrent requests allowed to the host. """
+        return self.limiter.limit(host, self.host_maximum(host))
+
+    def host_maximum(self, host: str) -> Optional[int]:
+        """ Return (configured) number of concurrent requests to the host. """
+
+        if host == self._base.domain:
+            return None
+
+        return self.settings.max_per_host
+
+    def host_delay(self, host: str) -> float:
+        """ Return time (seconds) between requests to the host (Crawl-delay). """
 
-        self.index.put(link)
-        self.queue.put(link)
+        if not self.settings.check_robots_txt or host not in self.robots:
+            return 0.0
+
+        return self.robots[host].delay()
 
     def is_ignored(self, url: Link) -> Tuple[bool, Optional[str]]:
         """ Check if url can be ignored """
@@ -174,11 +422,11 @@ class Crawler:
             return (True, "URL rejected by robots.txt")
 
         # This is a URL that fits to one of the ignored domains
-        if url.match_domains(self.settings.domains):
+        if self.settings.ignored_domains.match(url.domain):
             return (True, "Matching ignored domain")
 
         # This is a URL that fits to one of the ignored pathes
-        if url.match_pathes(self.settings.pathes):
+        if self.settings.ignored_pathes.match(url.path):
             return (True, "Matching ignored path")
 
         # FORBIDDEN: This is a local URL that located outside indexed path.
@@ -191,6 +439,60 @@ class Crawler:
     def update(self, url: Link) -> None:
         """ Update state or the url by checking it's data. """
 
+        prepared = self.prepare(url)
+        if prepared is None:
+            return
+        url = prepared
+
+        # TODO - rething short calls implementation.
+        is_external = url.is_external(self.settings.base)
+        if is_external and self.from_cache(url):
+            return
+
+        page = self.page_of(url, is_external)
+        if self.unchanged(url, page):
+            return
+
+        if self.skipped(url):
+            return
+
+        url.message = ""
+        url.unreachable = False
+        started = time()
+        try:
+            exists = url.exists(is_external, transport=self.transport, page=page)
+        except DeadlinksRedirectionURL as _href:
+            self.redirected_to(url, str(_href))
+            if is_external:
+                self.to_cache(url, time() - started, str(_href))
+            return
+        except DeadlinksRateLimitedURL as _retry_after:
+            # (not cached) failure, if url deferred too many times.
+            if not self.throttled(url, str(_retry_after)):
+                self.checked(url, False)
+            return
+        except DeadlinksIgnoredURL:
+            # we catching this exception jic, but "it should never happen"
+            return
+        else:
+            # host responded (not with connection error).
+            if exists or url.message.isdigit():
+                self.limiter.succeeded(url.domain, self.host_maximum(url.domain))
+        finally:
+            self.connected(url)
+            self.observe(url, time() - started)
+
+        if not exists and self.retried(url):
+            return
+
+        self.revalidated(url, page, exists)
+        self.checked(url, exists)
+        if is_external:
+            self.to_cache(url, time() - started)
+
+    def prepare(self, url: Link) -> Optional[Link]:
+        """ Return indexed url if it still needs to be checked. """
+
         if isinstance(url, str):
             url = Link(url)
 
@@ -203,49 +505,172 @@ class Crawler:
             url = self.index[url]
 
         if url.status != Status.UNDEFINED:
-            return
+            return None
 
         # Adding URL to index so we can track its state.
         is_ignored, message = self.is_ignored(url)
 
         if is_ignored:
             self.index.update(url, Status.IGNORED, str(message))
+            return None
+
+        return url
+
+    def from_cache(self, url: Link) -> bool:
+        """ Update url state with result of the previous runs (if any). """
+
+        if self.cache is None:
+            return False
+
+        result = self.cache.get(url.url())
+        if result is None:
+            return False
+
+        if result.status == Status.REDIRECTION:
+            self.redirected_to(url, result.location)
+        else:
+            url.message = result.message
+            self.checked(url, result.status == Status.FOUND)
+
+        return True
+
+    def to_cache(self, url: Link, elapsed: float, location: str = "") -> None:
+        """ Keep result of the url check for the next runs. """
+
+        if self.cache is None or url.status == Status.UNDEFINED:
             return
 
-        try:
-            # TODO - rething short calls implementation.
-            is_external = url.is_external(self.settings.base)
-            if not url.exists(is_external, retries=self.retry):
+        self.cache.put(url.url(), url.status, url.message, location, elapsed)
+
+    def page_of(self, url: Link, is_external: bool) -> Optional[Page]:
+        """ Return previously crawled version of the (local) page. """
+
+        if self.cache is None or is_external:
+            return None
+
+        return self.cache.page(self.masked(url.url()))
+
+    def unchanged(self, url: Link, page: Optional[Page]) -> bool:
+        """ Update state of the <internal> page, if its Document Root file is
+            not modified since it was crawled (without request). """
+
+        if self.direct is None or page is None:
+            return False
+
+        if not self.direct.unchanged(url.url(), page.headers()):
+            return False
+
+        url.not_modified(page)
+        self.revalidated(url, page, True)
+        self.checked(url, True)
+        return True
+
+    def masked(self, url: str) -> str:
+        """ Urls of <internal> Document Root are cached (and saved) masked, as
+            web server (if any) runs on a new port each time. """
+
+        if not self.settings.masked:
+            return url
+
+        return rehosted(url, self.settings.base.domain, "internal")
+
+    def unmasked(self, url: str) -> str:
+        """ Reverse of the `masked`. """
+
+        if not self.settings.masked:
+            return url
+
+        return rehosted(url, "internal", self.settings.base.domain)
+
+    def revalidated(self, url: Link, page: Optional[Page], exists: bool) -> None:
+        """ Keep validators of the (modified) page, and count revalidations. """
+
+        if self.cache is None:
+            return
+
+        if page is not None:
+            self.cache.revalidated(exists and url.validators is None)
+
+        if exists and url.validators is not None:
+            validators = url.validators
+            self.cache.put_page(
+                self.masked(url.url()), validators['etag'], validators['modified'], url.links)
+
+    def checked(self, url: Link, exists: bool) -> None:
+        """ Update url state after the check. """
+
+        with self._consistent:
+            if not exists:
                 self.index.update(url, Status.NOT_FOUND, url.message)
                 return
-        except DeadlinksRedirectionURL as _href:
-            # ok, so next time we looking for this
-            # we will need to make lookup to redirected URL.
-            self.index.update(url, Status.REDIRECTION, "")
-            self.add_and_go(url, str(_href))
-            return
-        except DeadlinksIgnoredURL:
-            # we catching this exception jic, but "it should never happen"
-            return
 
-        # we defining status of this url as FOUND
-        self.index.update(url, Status.FOUND, "")
+            # we defining status of this url as FOUND
+            self.index.update(url, Status.FOUND, "")
+
+            for href in url.links:
+                self.add_and_go(url, href)
 
-        for href in url.links:
+        # links are in index now, no need to keep them for a rest of crawl.
+        url.release()
+
+    def throttled(self, url: Link, value: str) -> bool:
+        """ Defer rate limited url (and pause its host), unless it was
+            deferred too many times already. """
+
+        host = url.domain
+        until = self.limiter.throttled(
+            url.url(), host, self.host_maximum(host), retry_after(value))
+        if until is None:
+            return False
+
+        self.defer(url, until)
+        return True
+
+    def defer(self, url: Link, until: float) -> None:
+        """ Put url back to the crawling queue, pausing its host till `until`
+            (monotonic). """
+        self.frontier.defer(url, until)
+
+    def retried(self, url: Link) -> bool:
+        """ Schedule url, failed with connection error or 502-504 response, to
+            be checked again (after backoff), unless it's out of retries. """
+
+        message = url.message
+        if message.isdigit() and int(message) not in RETRY_STATUSES:
+            return False
+
+        if self.breaker.tripped(url.domain):
+            return False
+
+        with self._attempts_lock:
+            attempt = self._attempts.get(url.url(), 0) + 1
+            if attempt > self.retry:
+                return False
+            self._attempts[url.url()] = attempt
+
+        self.schedule(url, monotonic() + backoff(attempt))
+        return True
+
+    def schedule(self, url: Link, moment: float) -> None:
+        """ Put url back to the crawling queue at `moment` (monotonic). """
+        self.frontier.schedule(url, moment)
+
+    def redirected_to(self, url: Link, href: str) -> None:
+        """ Update state of redirected url. """
+
+        # ok, so next time we looking for this
+        # we will need to make lookup to redirected URL.
+        with self._consistent:
+            self.index.update(url, Status.REDIRECTION, "")
             self.add_and_go(url, href)
 
     def add_and_go(self, url: Link, href: str) -> None:
         """ Reducing code duplication. """
 
         # Create link variable of type Link that represent a new
-        #    relative to URL link that has href
-        link = Link(url.link(href)) # type: Link
-
-        # adding it to queue
-        self.add(link)
-
-        # Update link by adding url as link referrer
-        link.add_referrer(url.url())
+        #    relative to URL link that has href, and adding it to queue
+        #    (or just adding url as referrer of already queued one).
+        self.add(Link(url.link(href)), url.url())
 
     def internal(self, links: List[Link]) -> List[Link]:
         """ Masks URL for local files, so it looks like internal domain real. """
@@ -253,11 +678,20 @@ class Crawler:
         if not self.settings.masked:
             return links
 
-        domain = self.settings.base.domain
-        def mapper(x):
-            return x.url().replace(domain, "internal")
+        return [Link(self.masked(x.url())) for x in links]
 
-        return list(map(Link, map(mapper, links)))
+    def referrers(self, link: Link) -> Tuple[List[str], int]:
+        """ Return (kept) referrers of the link, and number of all referrers.
+
+        Link can be one of the (masked) links reports get from crawler.
+        """
+
+        url = Link(self.unmasked(link.url()))
+        if url not in self.index:
+            return [], 0
+
+        indexed = self.index[url]
+        return [self.masked(x) for x in indexed.get_referrers()], indexed.referred
 
     @property
     def ignored(self) -> List[Link]:
@@ -288,3 +722,58 @@ class Crawler:
     def stats(self) -> Dict[Status, int]:
         """ return crawler stats """
         return self.index.get_stats()
+
+    def statistics(self) -> Dict[str, str]:
+        """ Return crawling process statistics (for reports). """
+
+        statistics = OrderedDict() # type: Dict[str, str]
+
+        connections = self.transport.stats()
+        statistics['Connections'] = "{} opened, {} reused".format(
+            connections['opened'],
+            connections['reused'],
+        )
+
+        if self.cache is not None:
+            cache = self.cache.stats()
+            statistics['Cache'] = "{} hits, {} misses, {:.1f}s saved".format(
+                cache['hits'],
+                cache['misses'],
+                cache['saved'],
+            )
+            statistics['Revalidated'] = "{} pages, {} not modified".format(
+                cache['revalidated'],
+                cache['not_modified'],
+            )
+
+        statistics['Duplicates'] = "{} requests avoided".format(self.index.duplicates())
+
+        if self.resumed:
+            statistics['Resumed'] = "{} links checked before".format(self.resumed)
+
+        with self._attempts_lock:
+            if self._attempts:
+                statistics['Retried'] = "{} urls, {} retries".format(
+                    len(self._attempts),
+                    sum(self._attempts.values()),
+                )
+
+        breaker = self.breaker.stats()
+        if breaker['tripped']:
+            statistics['Tripped'] = "{} ({} requests skipped)".format(
+                ", ".join(breaker['tripped']),
+                breaker['skipped'],
+            )
+
+        limiter = self.limiter.stats()
+        if limiter['deferred']:
+            statistics['Deferred'] = "{} urls, {:.1f}s backoff".format(
+                limiter['deferred'],
+                limiter['backoff'],
+            )
+
+        if self.autoscaler is not None:
+            peak, average = self.autoscaler.concurrency()
+            statistics['Concurrency'] = "peak {}, average {:.1f}".format(peak, average)
+
+        return statistics
@@ -33,6 +33,14 @@ class DeadlinksRedirectionURL(DeadlinksException):
     """ Redicrection URL. """
 
 
+class DeadlinksRateLimitedURL(DeadlinksException):
+    """ Rate limited URL (429 or 503 with Retry-After). """
+
+
+class DeadlinksEngine(DeadlinksException):
+    """ Crawling engine can't be used (asyncio engine and proxies). """
+
+
 class DeadlinksIgnoredURL(DeadlinksException):
     """ Error when we trying to index ignored URL. """
 
@@ -71,3 +79,23 @@ class DeadlinksSettingsPathes(DeadlinksSettings):
 
 class DeadlinksSettingsPath(DeadlinksSettings):
     """ Error on Settings object related to `StayWithinPath` property """
+
+
+class DeadlinksSettingsCache(DeadlinksSettings):
+    """ Error on Settings object related to results `cache` properties """
+
+
+class DeadlinksSettingsCheckpoint(DeadlinksSettings):
+    """ Error on Settings object related to `checkpoint` properties """
+
+
+class DeadlinksSettingsReferrers(DeadlinksSettings):
+    """ Error on Settings object related to `max_referrers` property """
+
+
+class DeadlinksSettingsPerHost(DeadlinksSettings):
+    """ Error on Settings object related to `max_per_host` property """
+
+
+class DeadlinksSettingsHostFailures(DeadlinksSettings):
+    """ Error on Settings object related to `max_host_failures` property """
@@ -40,6 +40,9 @@ from .export import Export
 BEFORE_BAR = '\r' if os_name == 'nt' else '\r\033[?25l'
 AFTER_BAR = '\n' if os_name == 'nt' else '\033[?25h\n'
 
+# statistics reported (if there are any) even without `--stats`.
+REPORTED = ('Cache', 'Tripped')
+
 
 class Default(Export):
 
@@ -74,7 +77,7 @@ class Default(Export):
         message = "URL=<{}>; External Checks={}; Threads={}; Retry={}".format(
             baseurl,
             "On" if self._crawler.settings.external else "Off",
-            self._crawler.settings.threads,
+            "auto" if self._crawler.settings.autoscale else self._crawler.settings.threads,
             self._crawler.settings.retry,
         )
 
@@ -115,6 +118,24 @@ class Default(Export):
             },
         ))
 
+        options.append((
+            ('--show-referrers', ),
+            {
+                'default': False,
+                'is_flag': True,
+                'help': 'Show pages links found at (referrers)',
+            },
+        ))
+
+        options.append((
+            ('--stats', ),
+            {
+                'default': False,
+                'is_flag': True,
+                'help': 'Show crawling statistics (connections, etc)',
+            },
+        ))
+
         return ("Exporter (default)", options)
 
     def _progress_handler(self) -> None:
@@ -179,7 +200,19 @@ class Default(Export):
 
         param_color = click.style(param, fg=self.params_colors[param])
 
-        return '\n'.join(map(lambda x: f"[ {param_color} ] {x}", links))
+        if not self._opts.get('show_referrers', False):
+            return '\n'.join(map(lambda x: f"[ {param_color} ] {x}", links))
+
+        lines = [] # type: List[str]
+        for link in links:
+            lines.append(f"[ {param_color} ] {link}")
+
+            referrers, referred = self._crawler.referrers(link)
+            lines.extend(f"    <- {referrer}" for referrer in referrers)
+            if referred > len(referrers):
+                lines.append(f"    <- ... and {referred - len(referrers)} more")
+
+        return '\n'.join(lines)
 
     def report(self) -> None:
 
@@ -215,6 +248,17 @@ class Default(Export):
         click.echo(stat, color=self.is_colored())
         click.echo(("-"*split_line_len) + "\033[?25h")
 
+        # crawling statistics, connections and transport counters are shown
+        # only on request.
+        statistics = self._crawler.statistics()
+        if not self._opts.get('stats', False):
+            statistics = {name: value for name, value in statistics.items() if name in REPORTED}
+
+        if statistics:
+            for name, value in statistics.items():
+                click.echo(f"{name}: {value}")
+            click.echo("-" * split_line_len)
+
         # show some url report(s)
         show: Sequence[str] = list(self._opts.get('show', []))
 
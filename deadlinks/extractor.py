@@ -0,0 +1,293 @@
+# Copyright 2019 Oleg Butuzov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+deadlinks.extractor
+~~~~~~~~~~~~~~~~~~~
+
+Incremental links extraction from the page body, that comes in chunks.
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from codecs import BOM_UTF8, BOM_UTF16_BE, BOM_UTF16_LE, getincrementaldecoder, lookup
+from html import unescape
+from re import IGNORECASE
+from re import compile as _compile
+from typing import Any, AnyStr, Dict, Iterable, Iterator, List, Optional, Pattern
+
+# -- Constants -----------------------------------------------------------------
+
+# size of the chunks body read from the socket.
+CHUNK_SIZE = 64 * 1024
+
+# encoding of the pages without declared one.
+DEFAULT_ENCODING = 'utf-8'
+
+# bytes where <meta charset> expected to be found (same as html5 prescan).
+PRESCAN_SIZE = 1024
+
+__RE_LINKS__ = _compile(r'<a\s{1}([^>]+)>') # pylint: disable=W1401
+
+# unfinished (so far) __RE_LINKS__ match at the end of the text.
+__RE_PARTIAL__ = _compile(r'<(?:a(?:\s[^>]*)?)?$') # pylint: disable=W1401
+
+# same expressions for not decoded body.
+__RE_LINKS_BYTES__ = _compile(rb'<a\s{1}([^>]+)>') # pylint: disable=W1401
+__RE_PARTIAL_BYTES__ = _compile(rb'<(?:a(?:\s[^>]*)?)?$') # pylint: disable=W1401
+
+__RE_HEADER_CHARSET__ = _compile(r'charset\s*=\s*["\']?([^"\';\s]+)', IGNORECASE)
+__RE_META_CHARSET__ = _compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', IGNORECASE)
+
+BOMS = [(BOM_UTF8, 'utf-8'), (BOM_UTF16_LE, 'utf-16'), (BOM_UTF16_BE, 'utf-16')]
+
+# filters
+def CLEANER(x:str) -> str:
+    """removes quotes, spaces and new lines"""
+    return x.strip("\"'\n ")
+def ANCHORS(x:str) -> str:
+    """removes anschor"""
+    return x.split("#")[0]
+def UNESCPE(x:str) -> str:
+    return unescape(x)
+
+# -- Implementation ------------------------------------------------------------
+
+
+def href(attrs: str) -> Optional[str]:
+    """ Return link from <a> tag attributes. """
+
+    pos = attrs.find("href=")
+    if pos == -1:
+        "href not found"
+        return None
+
+    value = attrs[pos + 5:].strip()
+    if not value:
+        return None
+
+    link: str = ""
+    quoted = value[0] in {'"', "'"}
+    if quoted:
+        end_pos = value[1:].find(value[0])
+        if end_pos == -1:
+            "unquoted link"
+            return None
+        link = value[1:end_pos + 1]
+    else:
+        end_pos = value[0:].find(" ")
+        link = value if end_pos == -1 else value[:end_pos + 1]
+
+    if not link:
+        "empty link"
+        return None
+
+    return UNESCPE(ANCHORS(CLEANER(link.replace("\n", ""))))
+
+
+class LinksExtractor:
+    """ Finds links in text fed by chunks.
+
+    Only unprocessed tail of the text (possible beginning of the <a> tag) is
+    kept between chunks, so results are same as __RE_LINKS__ applied to the
+    whole text.
+
+    Chunks can be bytes (of ascii compatible `encoding`), only <a> tags
+    attributes are decoded then.
+    """
+
+    def __init__(self, encoding: str = DEFAULT_ENCODING) -> None:
+        self._encoding = encoding
+        self._tail = None # type: Any
+        self._links = {} # type: Dict[str, None]
+
+    def feed(self, text: AnyStr) -> None:
+        """ Process next chunk of the text. """
+
+        if isinstance(text, bytes):
+            self._feed(text, __RE_LINKS_BYTES__, __RE_PARTIAL_BYTES__, b">")
+        else:
+            self._feed(text, __RE_LINKS__, __RE_PARTIAL__, ">")
+
+    def _feed(
+            self, text: AnyStr, links: Pattern[AnyStr], partials: Pattern[AnyStr],
+            gt: AnyStr) -> None:
+
+        if self._tail:
+            text = self._tail + text
+
+        end = 0
+        for match in links.finditer(text):
+            attrs = match.group(1)
+            if isinstance(attrs, bytes):
+                link = href(attrs.decode(self._encoding, errors='replace'))
+            else:
+                link = href(attrs)
+
+            if link is not None:
+                self._links[link] = None
+            end = match.end()
+
+        # beginning of the <a> tag can't be followed by ">" (except "<a >"
+        # case), so we looking for it only after last ">" seen.
+        partial = partials.search(text, max(end, text.rfind(gt) - 2))
+        self._tail = text[partial.start():] if partial else None
+
+    @property
+    def links(self) -> List[str]:
+        """ Return unique links found so far, in order of appearance. """
+        return list(self._links)
+
+
+def iter_text(chunks: Iterable[bytes], encoding: str) -> Iterator[str]:
+    """ Decode body, while it's read by chunks. """
+
+    decoder = getincrementaldecoder(encoding)(errors='replace')
+
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+def extract(chunks: Iterable[AnyStr], encoding: str = DEFAULT_ENCODING) -> List[str]:
+    """ Return unique links found in the text chunks. """
+
+    extractor = LinksExtractor(encoding)
+    for chunk in chunks:
+        extractor.feed(chunk)
+
+    return extractor.links
+
+
+def known(encoding: Optional[str]) -> Optional[str]:
+    """ Return encoding name if python knows it. """
+
+    if not encoding:
+        return None
+
+    try:
+        return lookup(encoding).name
+    except LookupError:
+        return None
+
+
+def is_ascii_compatible(encoding: str) -> bool:
+    """ Can markup be matched without decoding? """
+
+    markup = b"<a href='/'>"
+    try:
+        return markup.decode(encoding) == markup.decode('ascii')
+    except UnicodeDecodeError:
+        return False
+
+
+def encoding_of(headers: Any, head: bytes) -> str:
+    """ Encoding of the page: BOM, charset of `Content-Type` header or
+        <meta> tag (at the beginning of the page), or default one. """
+
+    for bom, name in BOMS:
+        if head.startswith(bom):
+            return name
+
+    header = __RE_HEADER_CHARSET__.search(headers.get('content-type', ''))
+    encoding = known(header.group(1)) if header else None
+    if encoding is not None:
+        return encoding
+
+    meta = __RE_META_CHARSET__.search(head[:PRESCAN_SIZE])
+    encoding = known(meta.group(1).decode('ascii')) if meta else None
+    if encoding is not None:
+        return encoding
+
+    return DEFAULT_ENCODING
+
+
+class BodyExtractor:
+    """ Finds links in the response body fed by chunks (while it's read).
+
+    Encoding is detected once first PRESCAN_SIZE bytes of the body are fed.
+    Body isn't decoded if encoding is ascii compatible, only <a> tags.
+    """
+
+    def __init__(self, headers: Any) -> None:
+        self._headers = headers
+        self._head = b"" # type: bytes
+        self._started = False # type: bool
+        self._extractor = LinksExtractor()
+        self._decoder = None # type: Any
+
+    def feed(self, chunk: bytes) -> None:
+        """ Process next chunk of the body. """
+
+        if not self._started:
+            self._head += chunk
+            if len(self._head) < PRESCAN_SIZE:
+                return
+            chunk = self._start()
+
+        self._feed(chunk)
+
+    def _start(self) -> bytes:
+        """ Detect encoding, return head of the body (without BOM). """
+
+        encoding = encoding_of(self._headers, self._head)
+        self._started = True
+        self._extractor = LinksExtractor(encoding)
+        if not is_ascii_compatible(encoding):
+            self._decoder = getincrementaldecoder(encoding)(errors='replace')
+
+        if self._head.startswith(BOM_UTF8):
+            return self._head[len(BOM_UTF8):]
+
+        return self._head
+
+    def _feed(self, chunk: bytes, final: bool = False) -> None:
+
+        if self._decoder is None:
+            self._extractor.feed(chunk)
+            return
+
+        text = self._decoder.decode(chunk, final)
+        if text:
+            self._extractor.feed(text)
+
+    def close(self) -> List[str]:
+        """ Body is read, return unique links found in it. """
+
+        if not self._started:
+            self._feed(self._start())
+
+        if self._decoder is not None:
+            self._feed(b"", final=True)
+            self._decoder = None
+
+        return self._extractor.links
+
+
+def links_of(response: Any) -> List[str]:
+    """ Return unique links found in the response body (read by chunks). """
+
+    extractor = BodyExtractor(response.headers)
+    for chunk in response.iter_content(CHUNK_SIZE):
+        extractor.feed(chunk)
+
+    return extractor.close()
@@ -0,0 +1,286 @@
+# Copyright 2019 Oleg Butuzov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+deadlinks.frontier
+~~~~~~~~~~~~~~~~~~
+
+Links waiting to be checked, shared by crawler workers.
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+
+# -- Imports -------------------------------------------------------------------
+
+from collections import deque
+from heapq import heapify, heappop, heappush
+from itertools import count
+from threading import Condition, RLock
+from time import monotonic
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from .link import Link
+
+# -- Constants -----------------------------------------------------------------
+
+# default number of concurrent requests to the one (external) host.
+DEFAULT_PER_HOST = 4
+
+# -- Implementation ------------------------------------------------------------
+
+
+def unlimited(host: str) -> Optional[int]:
+    """ No limit of concurrent requests to the host. """
+    return None
+
+
+def no_delay(host: str) -> float:
+    """ No delay between requests to the host. """
+    return 0.0
+
+
+class Frontier:
+    """ Queue of the links, that knows when crawling is complete.
+
+    Crawling is complete when there are no queued links and no links in
+    flight (taken with `get`, but not reported back with `task_done`), as
+    only links in flight can bring new links to the queue.
+
+    Links are queued per host, and hosts take turns (round-robin), so one
+    host with many links doesn't keep others waiting. Host is skipped while
+    it has `limit(host)` links in flight, `delay(host)` seconds haven't
+    passed since its last link was taken, or it's paused (`defer`).
+
+    Links to check again later (retries) are kept ordered by time they are
+    due (`schedule`), and queued (ahead of other links of the host) once it
+    comes.
+    """
+
+    def __init__(
+            self, limit: Callable[[str], Optional[int]] = unlimited,
+            delay: Callable[[str], float] = no_delay) -> None:
+
+        self._limit = limit
+        self._delay = delay
+
+        self._hosts = {} # type: Dict[str, Deque[Link]]
+        self._rotation = deque() # type: Deque[str]
+        self._queued = 0 # type: int
+        self._scheduled = [] # type: List[Tuple[float, int, Link]]
+        self._sequence = count()
+
+        self._in_flight = 0 # type: int
+        self._in_flight_hosts = {} # type: Dict[str, int]
+        self._not_before = {} # type: Dict[str, float]
+        self._closed = False # type: bool
+
+        # reentrant, as `close` called from SIGINT handler. Workers wait for
+        # links, and crawler waits for the crawling completion separately, so
+        # waking up one worker never wakes up crawler instead.
+        lock = RLock()
+        self._condition = Condition(lock)
+        self._completed = Condition(lock)
+
+    def put(self, link: Link) -> None:
+        """ Queue link and wake up one of the waiting workers. """
+
+        with self._condition:
+            self._append(link)
+            self._condition.notify()
+
+    def _append(self, link: Link) -> None:
+        host = link.domain
+        if host not in self._hosts:
+            self._hosts[host] = deque()
+            self._rotation.append(host)
+
+        self._hosts[host].append(link)
+        self._queued += 1
+
+    def schedule(self, link: Link, moment: float) -> None:
+        """ Queue link (taken with `get`) back at `moment` (monotonic).
+
+        Link is still in flight, till it's reported with `task_done`.
+        """
+
+        with self._condition:
+            heappush(self._scheduled, (moment, next(self._sequence), link))
+
+    def defer(self, link: Link, until: float) -> None:
+        """ Queue link (taken with `get`) back, and pause its host till
+        `until` (monotonic) moment.
+
+        Link is still in flight, till it's reported with `task_done`.
+        """
+
+        with self._condition:
+            # deferred link goes first of its host's links.
+            self._append(link)
+            self._hosts[link.domain].rotate(1)
+            self._not_before[link.domain] = max(self._not_before.get(link.domain, 0.0), until)
+
+    def get(self) -> Optional[Link]:
+        """ Block until link available, return None if crawling is complete. """
+
+        with self._condition:
+            while not self._closed:
+                now = monotonic()
+
+                self._release(now)
+
+                link = self._take(now)
+                if link is not None:
+                    return link
+
+                if self.complete:
+                    return None
+
+                self._condition.wait(self._wait(now))
+
+            return None
+
+    def _release(self, now: float) -> None:
+        """ Queue scheduled links (first of their host's links) once they due. """
+
+        while self._scheduled and self._scheduled[0][0] <= now:
+            link = heappop(self._scheduled)[2]
+            self._append(link)
+            self._hosts[link.domain].rotate(1)
+
+    def _take(self, now: float) -> Optional[Link]:
+        """ Take link of the next host (in turn) ready to be requested. """
+
+        for _ in range(len(self._rotation)):
+            host = self._rotation[0]
+            self._rotation.rotate(-1)
+
+            if not self._ready(host, now):
+                continue
+
+            links = self._hosts[host]
+            link = links.popleft()
+            if not links:
+                del self._hosts[host]
+                self._rotation.pop()
+
+            self._queued -= 1
+            self._in_flight += 1
+            self._in_flight_hosts[host] = self._in_flight_hosts.get(host, 0) + 1
+
+            delay = self._delay(host)
+            if delay:
+                self._not_before[host] = now + delay
+
+            return link
+
+        return None
+
+    def _ready(self, host: str, now: float) -> bool:
+        """ Can next link of the host be requested now? """
+
+        limit = self._limit(host)
+        if limit is not None and self._in_flight_hosts.get(host, 0) >= limit:
+            return False
+
+        return self._not_before.get(host, 0.0) <= now
+
+    def _wait(self, now: float) -> Optional[float]:
+        """ Return time till the first delayed host (or scheduled link) is
+            ready (if any). """
+
+        delayed = [self._not_before.get(host, 0.0) for host in self._rotation]
+        if self._scheduled:
+            delayed.append(self._scheduled[0][0])
+        delayed = [moment - now for moment in delayed if moment > now]
+
+        return min(delayed) if delayed else None
+
+    def task_done(self, link: Optional[Link] = None) -> None:
+        """ Link (taken with `get`) processed.
+
+        Link should be passed, if per host limits are used.
+        """
+
+        with self._condition:
+            self._in_flight -= 1
+
+            if link is not None and link.domain in self._in_flight_hosts:
+                self._in_flight_hosts[link.domain] -= 1
+                if not self._in_flight_hosts[link.domain]:
+                    del self._in_flight_hosts[link.domain]
+
+            if self.complete:
+                self._condition.notify_all()
+                self._completed.notify_all()
+            else:
+                self._condition.notify()
+
+    def join(self) -> None:
+        """ Block until crawling is complete (or frontier closed). """
+
+        with self._condition:
+            while not self.complete:
+                self._completed.wait()
+
+    def close(self) -> None:
+        """ Stop giving links to workers, wakes up everyone waiting. """
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            self._completed.notify_all()
+
+    def drain(self) -> List[Link]:
+        """ Remove and return all queued links. """
+
+        with self._condition:
+            links = [link for host in self._rotation for link in self._hosts[host]]
+            links += [link for _, _, link in sorted(self._scheduled)]
+            self._hosts.clear()
+            self._rotation.clear()
+            self._scheduled.clear()
+            self._queued = 0
+            return links
+
+    def drop(self, host: str) -> List[Link]:
+        """ Remove and return queued (and scheduled) links of the host. """
+
+        with self._condition:
+            links = list(self._hosts.pop(host, ()))
+            if links:
+                self._rotation.remove(host)
+                self._queued -= len(links)
+
+            scheduled = [x for x in self._scheduled if x[2].domain == host]
+            if scheduled:
+                self._scheduled = [x for x in self._scheduled if x[2].domain != host]
+                heapify(self._scheduled)
+                links += [link for _, _, link in sorted(scheduled)]
+
+            return links
+
+    @property
+    def complete(self) -> bool:
+        """ Is there nothing to do? """
+        return self._closed or not (self._queued or self._scheduled or self._in_flight)
+
+    def empty(self) -> bool:
+        """ Is there no queued (or scheduled) links? """
+        return not (self._queued or self._scheduled)
+
+    def qsize(self) -> int:
+        """ Number of queued links. """
+        return self._queued
@@ -24,92 +24,183 @@ Provides a collection interface
 
 # -- Imports -------------------------------------------------------------------
 
-from typing import Callable, Dict, Iterator, List  # pylint: disable-msg=W0611
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Tuple  # pylint: disable-msg=W0611
 
 from .link import Link
 from .status import Status
 
+# -- Constants -----------------------------------------------------------------
+
+# number of independently locked parts of the index (power of 2).
+STRIPES = 16
+
 # -- Implementation ------------------------------------------------------------
 
 
 class Index:
-    """ Links collection """
-
-    def __init__(self) -> None:
-        self._index = dict() # type: Dict[str, Link]
-        self._stats = dict({
-            Status.FOUND: 0,
-            Status.NOT_FOUND: 0,
-            Status.IGNORED: 0,
-            Status.REDIRECTION: 0,
-        })
+    """ Links collection
+
+    Safe to use from the concurrent workers: links are spread between
+    `STRIPES` parts (by url hash), each with its own lock and counters, so
+    workers adding links (or updating their statuses) rarely wait for each
+    other, and counters are exact.
+
+    Links are kept in per status buckets (moved between them as statuses
+    change), so filtered (and sorted) views do not scan whole index, and
+    each view is sorted only once, till next change of its bucket.
+
+    Only first `max_referrers` referrers of a link are kept (if set).
+    """
+
+    def __init__(self, max_referrers: Optional[int] = None) -> None:
+        self._max_referrers = max_referrers
+        self._links = [dict() for _ in range(STRIPES)] # type: List[Dict[str, Link]]
+        self._locks = [Lock() for _ in range(STRIPES)]
+        self._duplicates = [0] * STRIPES # type: List[int]
+        self._buckets = [{status: dict() for status in Status}
+                         for _ in range(STRIPES)] # type: List[Dict[Status, Dict[str, Link]]]
+        self._versions = [dict.fromkeys(Status, 0)
+                          for _ in range(STRIPES)] # type: List[Dict[Status, int]]
+        self._views = {} # type: Dict[Status, Tuple[Tuple[int, ...], List[Link]]]
+
+    @staticmethod
+    def _stripe(url: str) -> int:
+        """ Return number of the index part url belongs to. """
+        return hash(url) & (STRIPES - 1)
 
     def __len__(self) -> int:
         """ Find out how many links in this index."""
-        return len(self._index)
+        return sum(map(len, self._links))
 
     def __iter__(self) -> Iterator[Link]:
-        """ Iterating over a index. """
-        return self._index.values().__iter__()
+        """ Iterating over a index (snapshot of it). """
+        return iter([link for links in self._links for link in list(links.values())])
 
     def __contains__(self, link: Link) -> bool:
         """ Checks links existence in the index. """
-        return link.url() in self._index
+        url = link.url()
+        return url in self._links[self._stripe(url)]
 
     def __getitem__(self, link: Link) -> Link:
         """ """
-        return self._index[link.url()]
+        url = link.url()
+        return self._links[self._stripe(url)][url]
 
     def put(self, link: Link) -> None:
         """ Puts a link to the index. """
-        if link.url() in self._index:
-            return
-        self._index[link.url()] = link
+        self.claim(link)
+
+    def claim(self, link: Link, referrer: Optional[str] = None) -> Tuple[Link, bool]:
+        """ Puts a link to the index, unless link with same url is there.
+
+        Return indexed link and True if it was put by this call, so only one
+        of the (concurrent) callers checks url, while others only add referrer.
+        """
+
+        url = link.url()
+        stripe = self._stripe(url)
+        links = self._links[stripe]
+
+        with self._locks[stripe]:
+            indexed = links.get(url)
+            claimed = indexed is None
+            if claimed:
+                indexed = links[url] = link
+                self._buckets[stripe][link.status][url] = link
+                self._versions[stripe][link.status] += 1
+            else:
+                self._duplicates[stripe] += 1
+
+            if referrer is not None:
+                indexed.add_referrer(referrer, self._max_referrers) # type: ignore
+
+        return indexed, claimed # type: ignore
+
+    def duplicates(self) -> int:
+        """ Return number of links, that were already in the index. """
+        return sum(self._duplicates)
 
     def all(self) -> List[Link]:
         """ Return links in the index (but not UNDEFINED). """
 
-        return self._filter(lambda x: x.status != Status.UNDEFINED)
+        links = [] # type: List[Link]
+        for status in Status:
+            if status != Status.UNDEFINED:
+                links.extend(self._view(status))
+
+        return sorted(links, key=Link.sort_key)
 
     def succeed(self) -> List[Link]:
         """ Filters succeed urls from index. """
 
-        return self._filter(lambda x: x.status == Status.FOUND)
+        return self._view(Status.FOUND)
 
     def redirected(self) -> List[Link]:
         """ Filters succeed urls from index. """
 
-        return self._filter(lambda x: x.status == Status.REDIRECTION)
+        return self._view(Status.REDIRECTION)
 
     def failed(self) -> List[Link]:
         """ Filters failed urls from index. """
 
-        return self._filter(lambda x: x.status == Status.NOT_FOUND)
+        return self._view(Status.NOT_FOUND)
 
     def ignored(self) -> List[Link]:
         """ Filters failed urls from index. """
 
-        return self._filter(lambda x: x.status == Status.IGNORED)
+        return self._view(Status.IGNORED)
 
     def undefined(self) -> List[Link]:
         """ Filters undefined urls from index. """
 
-        return self._filter(lambda x: x.status == Status.UNDEFINED)
+        return self._view(Status.UNDEFINED)
 
     def update(self, url: Link, status: Status, message: str) -> None:
         """ wraps access to updating url status and gathering stats """
 
-        if url not in self:
-            return
+        key = url.url()
+        stripe = self._stripe(key)
 
-        url.status = status
-        url.message = message
+        with self._locks[stripe]:
+            indexed = self._links[stripe].get(key)
+            if indexed is None:
+                return
 
-        self._stats[status] += 1
+            previous = indexed.status
+            url.status = indexed.status = status
+            url.message = indexed.message = message
+
+            # link moved to the bucket of its new status (so counters are
+            # exact number of links with status, not number of updates)
+            if previous != status:
+                buckets, versions = self._buckets[stripe], self._versions[stripe]
+                del buckets[previous][key]
+                buckets[status][key] = indexed
+                versions[previous] += 1
+                versions[status] += 1
 
     def get_stats(self) -> Dict[Status, int]:
-        return self._stats
+        """ Return number of links with each (but undefined) status. """
+
+        return {
+            status: sum(len(buckets[status]) for buckets in self._buckets)
+            for status in Status
+            if status != Status.UNDEFINED
+        }
+
+    def _view(self, status: Status) -> List[Link]:
+        """ Return (sorted) links with status.
+
+        Sorted list is cached, and reused till bucket of the status changes.
+        """
+
+        versions = tuple(stripe[status] for stripe in self._versions)
+
+        cached = self._views.get(status)
+        if cached is None or cached[0] != versions:
+            links = [link for buckets in self._buckets for link in list(buckets[status].values())]
+            cached = self._views[status] = (versions, sorted(links, key=Link.sort_key))
 
-    def _filter(self, lambda_func: Callable[[Link], bool]) -> List[Link]:
-        """ Filters  values according lambda. """
-        return list(sorted(filter(lambda_func, self._index.values())))
+        # copy, so caller can't spoil cached view.
+        return list(cached[1])
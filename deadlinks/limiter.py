@@ -0,0 +1,170 @@
+# Copyright 2019 Oleg Butuzov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+deadlinks.limiter
+~~~~~~~~~~~~~~~~~
+
+Adaptive (per host) rate limiting, for hosts answering with `429 Too Many
+Requests` or `503 Service Unavailable` with `Retry-After` header.
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from time import monotonic, time
+from typing import Any, Dict, Optional
+
+# -- Constants -----------------------------------------------------------------
+
+# backoff (seconds) of the host, that didn't say how long to wait. Doubles
+# with every next rate limited response in a row.
+DEFAULT_BACKOFF = 1.0
+
+# longest backoff (seconds) we agree to wait.
+MAX_BACKOFF = 60.0
+
+# times url deferred, before it reported as failed one.
+MAX_DEFERRALS = 5
+
+# -- Implementation ------------------------------------------------------------
+
+
+def rate_limited(status_code: int, headers: Any) -> bool:
+    """ Is response a request to slow down? """
+
+    return status_code == 429 or (status_code == 503 and 'retry-after' in headers)
+
+
+def retry_after(value: Optional[str]) -> Optional[float]:
+    """ Return seconds to wait from `Retry-After` header (seconds or date). """
+
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        moment = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+    return max(0.0, moment - time())
+
+
+class Limiter:
+    """ Hosts concurrency and backoff controller (AIMD).
+
+    Rate limited response pauses host (for `Retry-After` seconds) and halves
+    its concurrency limit (once per pause); every other response adds 1/limit
+    to the limit, so it grows by one per "round" of requests, back to the
+    limit host had before.
+    """
+
+    def __init__(self, workers: int, deferrals: int = MAX_DEFERRALS) -> None:
+
+        # concurrency of the hosts without limit.
+        self.workers = workers
+        self.deferrals = deferrals
+
+        self._lock = Lock()
+
+        self._limits = {} # type: Dict[str, float]
+        self._paused = {} # type: Dict[str, float]
+        self._strikes = {} # type: Dict[str, int]
+
+        # deferrals of the urls and total backoff of the hosts.
+        self._deferred = {} # type: Dict[str, int]
+        self._backoff = 0.0 # type: float
+
+    def limit(self, host: str, maximum: Optional[int]) -> Optional[int]:
+        """ Return current concurrency limit of the host. """
+
+        with self._lock:
+            if host not in self._limits:
+                return maximum
+
+            return int(self._limits[host])
+
+    def paused(self, host: str) -> float:
+        """ Return moment (monotonic) host can be requested again. """
+
+        with self._lock:
+            return self._paused.get(host, 0.0)
+
+    def throttled(self, url: str, host: str, maximum: Optional[int],
+                  delay: Optional[float]) -> Optional[float]:
+        """ Host answered with rate limited response to the url.
+
+        Return moment (monotonic) url can be requested again, or None if url
+        deferred too many times already.
+        """
+
+        with self._lock:
+            deferred = self._deferred.get(url, 0)
+            if deferred >= self.deferrals:
+                return None
+            self._deferred[url] = deferred + 1
+
+            # responses to requests sent at the same time (host is paused
+            # already) extend host's pause, not add to it.
+            now = monotonic()
+            paused = max(now, self._paused.get(host, 0.0))
+
+            if paused == now:
+                # multiplicative decrease.
+                limit = self._limits.get(host, float(maximum or self.workers))
+                self._limits[host] = max(1.0, limit / 2)
+                self._strikes[host] = self._strikes.get(host, 0) + 1
+
+            if delay is None:
+                delay = DEFAULT_BACKOFF * 2**(self._strikes.get(host, 1) - 1)
+
+            until = max(paused, now + min(delay, MAX_BACKOFF))
+            self._backoff += until - paused
+            self._paused[host] = until
+
+            return until
+
+    def succeeded(self, host: str, maximum: Optional[int]) -> None:
+        """ Host answered with a (not rate limited) response. """
+
+        with self._lock:
+            if host not in self._limits:
+                return
+
+            self._strikes.pop(host, None)
+
+            # additive increase.
+            limit = self._limits[host]
+            limit += 1 / limit
+            if limit >= (maximum or self.workers):
+                del self._limits[host]
+            else:
+                self._limits[host] = limit
+
+    def stats(self) -> Dict[str, Any]:
+        """ Return number of deferred urls and total backoff time. """
+
+        with self._lock:
+            return {
+                'deferred': len(self._deferred),
+                'backoff': self._backoff,
+            }
@@ -24,12 +24,37 @@ Link representation based on URL object.
 
 # -- Imports -------------------------------------------------------------------
 
-from functools import total_ordering
-from typing import Union
+from functools import lru_cache, total_ordering
+from typing import Tuple, Union
 
 from .url import URL
 
 
+@lru_cache(maxsize=4096)
+def external(base_scheme: str, base: str, this_scheme: str, this: str) -> bool:
+    """ Are hosts different (once normalized)?
+
+    Crawled links are on the few hosts, so normalization results are cached.
+    """
+
+    # we assuming that www.domain.com and domain.com are same
+    pattern = "www."
+    base = base[len(pattern):] if base.startswith(pattern) else base
+    this = this[len(pattern):] if this.startswith(pattern) else this
+
+    # we assume that http://domain.com and http://domain.com:80/ are same
+    if this_scheme == "http" and base_scheme == "http":
+        pattern = ":80"
+        base = base[:-(len(pattern))] if base.endswith(pattern) else base
+        this = this[:-(len(pattern))] if this.endswith(pattern) else this
+    elif this_scheme == "https" and base_scheme == "https":
+        pattern = ":443"
+        base = base[:-(len(pattern))] if base.endswith(pattern) else base
+        this = this[:-(len(pattern))] if this.endswith(pattern) else this
+
+    return base != this
+
+
 @total_ordering
 class Link(URL):
     """
@@ -45,6 +70,8 @@ class Link(URL):
     lets use Link.
      """
 
+    __slots__ = ()
+
     def is_external(self, url: Union[URL, str]) -> bool:
         """ Check if url is external to Link object. """
 
@@ -53,25 +80,11 @@ class Link(URL):
         elif not isinstance(url, URL):
             raise TypeError(f"url of type {type(url)}")
 
-        base_scheme, this_scheme = url.scheme, self.scheme
-        base, this = url.domain, self.domain
-
-        # we assuming that www.domain.com and domain.com are same
-        pattern = "www."
-        base = base[len(pattern):] if base.startswith(pattern) else base
-        this = this[len(pattern):] if this.startswith(pattern) else this
-
-        # we assume that http://domain.com and http://domain.com:80/ are same
-        if this_scheme == "http" and base_scheme == "http":
-            pattern = ":80"
-            base = base[:-(len(pattern))] if base.endswith(pattern) else base
-            this = this[:-(len(pattern))] if this.endswith(pattern) else this
-        elif this_scheme == "https" and base_scheme == "https":
-            pattern = ":443"
-            base = base[:-(len(pattern))] if base.endswith(pattern) else base
-            this = this[:-(len(pattern))] if this.endswith(pattern) else this
-
-        return base != this
+        return external(url.scheme, url.domain, self.scheme, self.domain)
+
+    def sort_key(self) -> Tuple[str, str]:
+        """ Key to sort links (same order as comparison gives). """
+        return self.domain, self.path
 
     def __gt__(self, other: object) -> bool:
 
@@ -0,0 +1,77 @@
+# Copyright 2019 Oleg Butuzov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+deadlinks.matcher
+~~~~~~~~~~~~~~~~~
+
+Ignore rules (of domains or pathes) compiled to the one matcher.
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+import re
+from fnmatch import translate
+from typing import Callable, List
+
+# -- Constants -----------------------------------------------------------------
+
+# rules with these prefixes are regular expressions and glob masks (others
+# are substrings).
+REGEX = "re:"
+GLOB = "glob:"
+
+# -- Implementation ------------------------------------------------------------
+
+
+def pattern(rule: str) -> str:
+    """ Return regular expression matching same as the (substring or glob)
+        rule.
+
+    `glob:` rules are matched to the whole value, and plain rules are
+    substrings of the value.
+    """
+
+    if rule.startswith(GLOB):
+        return r"\A" + translate(rule[len(GLOB):])
+
+    return re.escape(rule)
+
+
+class Matcher:
+    """ Ignore rules compiled to regular expressions.
+
+    Substring and glob rules are merged into the one regular expression, so
+    value is checked against all of them in a single pass. `re:` rules are
+    searched one by one, as backreferences and inline flags would break in
+    the merged expression.
+    """
+
+    def __init__(self, rules: List[str]) -> None:
+        # raises re.error for invalid regular expression rule.
+        expressions = [re.compile(x[len(REGEX):]) for x in rules if x.startswith(REGEX)]
+
+        patterns = [pattern(x) for x in rules if not x.startswith(REGEX)]
+        if patterns:
+            expressions.insert(0, re.compile("|".join(patterns)))
+
+        self._searches = [x.search for x in expressions] # type: List[Callable]
+
+    def match(self, value: str) -> bool:
+        """ Does value match any of the rules? """
+        return any(search(value) is not None for search in self._searches)
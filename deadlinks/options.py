@@ -26,9 +26,14 @@ Default options to be consumed by click
 
 from typing import List
 
-from click import Choice, IntRange
+from click import Choice, IntRange, Path
 
-from .clicker import OptionRaw
+from .breaker import DEFAULT_FAILURES
+from .cache import DEFAULT_NEGATIVE_TTL, DEFAULT_TTL
+from .checkpoint import DEFAULT_INTERVAL
+from .clicker import OptionRaw, ThreadsRange
+from .frontier import DEFAULT_PER_HOST
+from .settings import THREADS_LIMIT
 
 # -- Options -------------------------------------------------------------------
 
@@ -63,11 +68,122 @@ default_options.append((
     ('-n', '--threads'),
     {
         'default': 1,
-        'type': IntRange(1, 10),
+        'type': ThreadsRange(1, THREADS_LIMIT),
         'is_flag': False,
         'show_default': True,
         'metavar': '',
-        'help': 'Concurrent crawlers [1...10]',
+        'help': f'Concurrent crawlers [1...{THREADS_LIMIT} or auto]',
+    },
+))
+
+# Concurrent Requests per Host ---------------------------------------------
+default_options.append((
+    ('max_per_host', '--max-per-host'),
+    {
+        'default': DEFAULT_PER_HOST,
+        'type': IntRange(1),
+        'show_default': True,
+        'metavar': '',
+        'help': 'Concurrent requests to the one external host',
+    },
+))
+
+# Connection Errors per Host -----------------------------------------------
+default_options.append((
+    ('max_host_failures', '--max-host-failures'),
+    {
+        'default': DEFAULT_FAILURES,
+        'type': IntRange(0),
+        'show_default': True,
+        'metavar': '',
+        'help': 'DNS/connection errors in a row to skip the host (0 - never skip)',
+    },
+))
+
+# Crawling Engine ----------------------------------------------------------
+default_options.append((
+    ('engine', '--engine'),
+    {
+        'default': 'threads',
+        'type': Choice(['threads', 'asyncio'], case_sensitive=False),
+        'show_default': True,
+        'metavar': '',
+        'help': 'Crawling engine [threads, asyncio]',
+    },
+))
+
+# Results Cache ------------------------------------------------------------
+default_options.append((
+    ('cache', '--cache'),
+    {
+        'default': None,
+        'type': Path(dir_okay=False),
+        'metavar': '',
+        'help': 'Keep external URLs checks results in file',
+    },
+))
+
+default_options.append((
+    ('cache_ttl', '--cache-ttl'),
+    {
+        'default': DEFAULT_TTL,
+        'type': IntRange(0),
+        'show_default': True,
+        'metavar': '',
+        'help': 'Seconds successful checks results are cached',
+    },
+))
+
+default_options.append((
+    ('cache_negative_ttl', '--cache-negative-ttl'),
+    {
+        'default': DEFAULT_NEGATIVE_TTL,
+        'type': IntRange(0),
+        'show_default': True,
+        'metavar': '',
+        'help': 'Seconds failed checks results are cached',
+    },
+))
+
+# Checkpoints --------------------------------------------------------------
+default_options.append((
+    ('checkpoint', '--checkpoint'),
+    {
+        'default': None,
+        'type': Path(dir_okay=False),
+        'metavar': '',
+        'help': 'Save crawling state to file (to resume it later)',
+    },
+))
+
+default_options.append((
+    ('checkpoint_interval', '--checkpoint-interval'),
+    {
+        'default': DEFAULT_INTERVAL,
+        'type': IntRange(1),
+        'show_default': True,
+        'metavar': '',
+        'help': 'Seconds between crawling state saves',
+    },
+))
+
+default_options.append((
+    ('resume', '--resume'),
+    {
+        'default': False,
+        'is_flag': True,
+        'help': 'Resume crawling from checkpoint',
+    },
+))
+
+# Referrers  ---------------------------------------------------------------
+default_options.append((
+    ('max_referrers', '--max-referrers'),
+    {
+        'default': None,
+        'type': IntRange(1),
+        'metavar': '',
+        'help': 'Number of referrers kept for each link (all by default)',
     },
 ))
 
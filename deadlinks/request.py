@@ -24,13 +24,241 @@ deadlinks.request
 
 # -- Imports -------------------------------------------------------------------
 
+from functools import lru_cache
+from http.cookiejar import DefaultCookiePolicy
+from socket import gaierror
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+
 from requests import Response, Session
-from requests.adapters import HTTPAdapter, Retry
+from requests.adapters import BaseAdapter, HTTPAdapter, Retry
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
 
 from .__version__ import __app_package__
+from .limiter import rate_limited
+
+# -- Constants -----------------------------------------------------------------
 
 user_agent = __app_package__
 
+# number of hosts we keep keep-alive pools for.
+DEFAULT_POOLS = 100
+
+# number of connections kept alive per host.
+DEFAULT_POOL_SIZE = 10
+
+# responses (of temporary unavailable server) worth to retry.
+RETRY_STATUSES = {502, 503, 504}
+
+# -- Implementation ------------------------------------------------------------
+
+
+def backoff(attempt: int) -> float:
+    """ Delay before the retry (same as urllib3.Retry with backoff_factor=1). """
+
+    return 0 if attempt <= 1 else 2**(attempt - 1)
+
+
+class Counters:
+    """ Connections counters shared by all pools of the one transport. """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._opened = 0 # type: int
+        self._checkouts = 0 # type: int
+
+    def opened(self) -> None:
+        """ New (TCP/TLS) connection was established. """
+        with self._lock:
+            self._opened += 1
+
+    def checkout(self) -> None:
+        """ Connection (new or pooled one) taken to perform request. """
+        with self._lock:
+            self._checkouts += 1
+
+    def stats(self) -> Dict[str, int]:
+        """ Return opened and reused connections numbers. """
+        with self._lock:
+            return {
+                'opened': self._opened,
+                'reused': max(0, self._checkouts - self._opened),
+            }
+
+
+class Unresolved:
+    """ Host names that failed to resolve (negative DNS cache of the run). """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._hosts = {} # type: Dict[str, str]
+
+    def get(self, host: str) -> Optional[str]:
+        """ Return resolution error of the host (if it failed to resolve). """
+        with self._lock:
+            return self._hosts.get(host)
+
+    def put(self, host: str, error: str) -> None:
+        """ Remember host resolution error. """
+        with self._lock:
+            self._hosts[host] = error
+
+
+def counting_pools(counters: Counters, unresolved: Unresolved) -> Dict[str, Any]:
+    """ Return http/https pool classes reporting to `counters`, and not
+        resolving hosts that are `unresolved` already. """
+
+    def new_conn(connection: HTTPConnection, create: Callable[[], Any]) -> Any:
+        error = unresolved.get(connection.host)
+        if error is not None:
+            raise NewConnectionError(connection, "Failed to resolve '{}' ({})".format(
+                connection.host, error))
+
+        try:
+            return create()
+        except NewConnectionError as exception:
+            if isinstance(exception.__context__, gaierror):
+                unresolved.put(connection.host, str(exception.__context__))
+            raise
+
+    class CountingHTTPConnection(HTTPConnection):
+
+        def connect(self) -> None:
+            counters.opened()
+            super().connect()
+
+        def _new_conn(self) -> Any:
+            return new_conn(self, super()._new_conn)
+
+    class CountingHTTPSConnection(HTTPSConnection):
+
+        def connect(self) -> None:
+            counters.opened()
+            super().connect()
+
+        def _new_conn(self) -> Any:
+            return new_conn(self, super()._new_conn)
+
+    class CountingHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = CountingHTTPConnection
+
+        def _get_conn(self, timeout: Optional[float] = None) -> Any:
+            counters.checkout()
+            return super()._get_conn(timeout)
+
+    class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = CountingHTTPSConnection
+
+        def _get_conn(self, timeout: Optional[float] = None) -> Any:
+            counters.checkout()
+            return super()._get_conn(timeout)
+
+    return {
+        'http': CountingHTTPConnectionPool,
+        'https': CountingHTTPSConnectionPool,
+    }
+
+
+class Adapter(HTTPAdapter):
+    """ HTTPAdapter that counts opened and reused connections. """
+
+    def __init__(self, counters: Counters, unresolved: Unresolved, **kwargs: Any) -> None:
+        self._counters = counters
+        self._unresolved = unresolved
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = counting_pools(
+            self._counters, self._unresolved)
+
+
+class Retries(Retry):
+    """ Retry that leaves rate limited responses to the crawler. """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        headers = {'retry-after': ""} if has_retry_after else {}
+        if rate_limited(status_code, headers):
+            return False
+
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+class Transport:
+    """ Shared keep-alive connections to the crawled hosts.
+
+    One `requests.Session` with a per host connection pool (sized to number
+    of the crawler workers), so each check reuses already established TCP (and
+    TLS) connection to the host instead of doing a new handshake. Host names
+    that failed to resolve aren't resolved again.
+    """
+
+    def __init__(
+            self, pool_size: int = DEFAULT_POOL_SIZE, retries: int = 0,
+            unresolved: Optional[Unresolved] = None) -> None:
+
+        self._counters = Counters()
+        self.unresolved = unresolved or Unresolved()
+
+        # without retries, responses returned as they are.
+        _retry = Retries(
+            total=retries,
+            backoff_factor=1,
+            status_forcelist=sorted(RETRY_STATUSES) if retries else [],
+        )
+
+        adapter = Adapter(
+            self._counters,
+            self.unresolved,
+            pool_connections=DEFAULT_POOLS,
+            pool_maxsize=max(1, pool_size),
+            max_retries=_retry,
+        )
+
+        self._session = Session()
+        self._session.headers.update({'User-agent': user_agent})
+        # link checker has no use of cookies, and it's better not to share
+        # them between the workers.
+        self._session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+    def mount(self, prefix: str, adapter: BaseAdapter) -> None:
+        """ Use adapter for requests to urls with prefix. """
+        self._session.mount(prefix, adapter)
+
+    def request(self, url: str, is_external: bool = False, **kwargs: Any) -> Response:
+        """Request a web resource and return Response
+
+        Perform GET  - for the local resource
+                HEAD - for the remote resource
+        Return Response of the request.
+        """
+
+        _settings = {
+            'allow_redirects': False,
+            **kwargs,
+        }
+
+        method_to_call = (self._session.head if is_external else self._session.get)
+        return method_to_call(url, **_settings)
+
+    def stats(self) -> Dict[str, int]:
+        """ Return opened/reused connections stats. """
+        return self._counters.stats()
+
+    def close(self) -> None:
+        """ Close all pooled connections. """
+        self._session.close()
+
+
+@lru_cache(maxsize=None)
+def shared(retries_attempts: int = 0) -> Transport:
+    """ Return transport shared by all calls with same retries number. """
+    return Transport(retries=retries_attempts)
+
 
 def request(url: str, is_external: bool = False, retries_attempts: int = 1) -> Response:
     """Request a web resource and return Response
@@ -40,21 +268,4 @@ def request(url: str, is_external: bool = False, retries_attempts: int = 1) -> R
     Return Response of the request.
     """
 
-    _headers = {
-        'User-agent': user_agent,
-    }
-    _settings = {
-        'allow_redirects': False,
-    }
-
-    _retry = Retry(
-        total=retries_attempts,
-        backoff_factor=1,
-        status_forcelist=[502, 503, 504],
-    )
-
-    session = Session()
-    session.mount(url, HTTPAdapter(max_retries=_retry))
-
-    method_to_call = (session.head if is_external else session.get)
-    return method_to_call(url, headers=_headers, **_settings)
+    return shared(retries_attempts).request(url, is_external)
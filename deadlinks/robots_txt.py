@@ -12,28 +12,96 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+
 """
-deadlinks.request
-~~~~~~~~~~~~~~~~~
+deadlinks.robots_txt
+~~~~~~~~~~~~~~~~~~~~
 
-`requests` wrapper for getting requests.Response
+robots.txt rules of the crawled hosts.
 
 :copyright: (c) 2019 by Oleg Butuzov.
 :license:   Apache2, see LICENSE for more details.
 """
 
 # -- Imports -------------------------------------------------------------------
-from typing import Any, List, Tuple
+from threading import Lock
+from typing import Any, Dict, List, Optional
 from urllib.robotparser import RobotFileParser
 
-from .request import user_agent
+from .cache import Cache
+from .request import Transport, shared, user_agent
 from .url import URL
 
+# -- Constants -----------------------------------------------------------------
+
+# seconds to wait for robots.txt response.
+TIMEOUT = 10
+
+# longest Crawl-delay (seconds) we agree to wait between requests to the host.
+MAX_CRAWL_DELAY = 10
+
+# -- Implementation ------------------------------------------------------------
+
+
+class Rules:
+    """ Allow/Disallow rules of the robots.txt entry.
+
+    Rule with the longest path matching url path wins (rule later in the
+    file, if paths are same). Rules are kept by path, and only path
+    prefixes of rules lengths are looked up, instead of checking every rule.
+    """
+
+    def __init__(self, rules: Dict[str, bool]) -> None:
+        self._rules = rules
+        self._lengths = sorted({len(path) for path in self._rules}, reverse=True)
+
+    def allowed(self, path: str) -> bool:
+        """ Is path allowed to crawl? """
+
+        if not path:
+            path = "/"
+
+        for length in self._lengths:
+            if length > len(path):
+                continue
+
+            allowance = self._rules.get(path[:length])
+            if allowance is not None:
+                return allowance
+
+        return True
+
+
+def entries(state: RobotFileParser) -> List[Any]:
+    """ Entries of parsed robots.txt, default one (`User-agent: *`) last.
+
+    RobotFileParser has no public API for its entries, so they are read from
+    its (undocumented) attributes. If these ever go away, robots.txt has no
+    entries, and everything is allowed (same as without robots.txt).
+    """
+
+    default = getattr(state, 'default_entry', None)
+    return [*getattr(state, 'entries', []), *([default] if default is not None else [])]
+
 
 class RobotsTxt:
 
-    def __init__(self) -> None:
+    def __init__(
+            self, transport: Optional[Transport] = None, cache: Optional[Cache] = None) -> None:
         self.state = None # type: Any
+        self._transport = transport or shared()
+
+        # parsed robots.txt kept between runs.
+        self._cache = cache
+
+        # only one of the workers requests robots.txt, others wait for it.
+        self._lock = Lock()
+
+        # rules of the entry matching our user agent (or default one).
+        self._rules = None # type: Optional[Rules]
+
+        # robots.txt url, response status code and lines state is based on.
+        self._source = None # type: Optional[List[Any]]
 
     def allowed(self, url: URL) -> bool:
 
@@ -44,27 +112,110 @@ class RobotsTxt:
 
         # We actually can't find out is there robots.txt or not
         # so we going to allow all in this case.
-        if self.state is False or self.state.allow_all:
+        if self.state is False or self._rules is None:
             return True
 
-        if not self.state.last_checked and self.state.disallow_all:
-            return False
+        return self._rules.allowed(url.path)
+
+    def delay(self) -> float:
+        """ Return Crawl-delay (seconds between requests) site asks for. """
+
+        if not self.state:
+            return 0.0
 
-        # find entry
-        return allowed(matched_rules(self._entry(), url))
+        delay = self.state.crawl_delay(user_agent)
+        if delay is None:
+            return 0.0
+
+        return min(float(delay), MAX_CRAWL_DELAY)
 
     def request(self, url: str) -> None:
-        """ Perform robots.txt request """
-        if self.state is not None:
-            return
+        """ Perform robots.txt request (once, even if called by many workers) """
+
+        with self._lock:
+            if self.state is not None or self.cached(url):
+                return
+
+            try:
+                response = self._transport.request(url, allow_redirects=True, timeout=TIMEOUT)
+            except Exception:
+                self.state = False
+                return
+
+            self.consume(url, response)
+
+    def cached(self, url: str) -> bool:
+        """ Restore state from robots.txt parsed by previous run (if any). """
+
+        if self._cache is None:
+            return False
+
+        cached = self._cache.robots(url)
+        if cached is None:
+            return False
+
+        self.parse(url, *cached)
+        return True
+
+    def consume(self, url: str, response: Any) -> None:
+        """ Parse robots.txt response """
 
         try:
-            self.state = RobotFileParser()
-            self.state.set_url(url)
-            self.state.read()
+            lines = [] # type: List[str]
+            if response.status_code < 400:
+                lines = response.content.decode("utf-8").splitlines()
+
+            self.parse(url, response.status_code, lines)
 
         except Exception:
             self.state = False
+            return
+
+        if self._cache is not None:
+            self._cache.put_robots(url, response.status_code, lines)
+
+    def parse(self, url: str, status_code: int, lines: List[str]) -> None:
+        """ Set state based on robots.txt response status code and lines. """
+
+        state = RobotFileParser()
+        state.set_url(url)
+
+        # same logic as RobotFileParser.read() has (4XX allows all, but 401
+        # and 403 disallow all), but using our shared (keep-alive) connections.
+        rules = {} # type: Dict[str, bool]
+        if status_code in {401, 403}:
+            rules = {"/": False}
+        elif status_code >= 500:
+            raise ValueError(f"robots.txt unavailable ({status_code})")
+        elif status_code < 400:
+            state.parse(lines)
+
+            # no entry matching our user agent or default one, allows all.
+            entry = self._entry(state)
+            if entry is not None:
+                rules = {line.path: line.allowance for line in entry.rulelines}
+
+        self._rules = Rules(rules)
+
+        self.state = state
+        self._source = [url, status_code, lines]
+
+    def dump(self) -> Any:
+        """ Return state in form it can be saved (and restored later). """
+
+        if self.state is None or self.state is False:
+            return self.state
+
+        return self._source
+
+    def restore(self, dumped: Any) -> None:
+        """ Restore state from dumped one. """
+
+        if dumped is None or dumped is False:
+            self.state = dumped
+            return
+
+        self.parse(*dumped)
 
     # This is mostly transferred logics from robotparser.py,
     # but we trying to follow 2019 extension of the Google's Robots Txt
@@ -72,40 +223,40 @@ class RobotsTxt:
     # https://www.contentkingapp.com/blog/implications-of-new-robots-txt-rfc/
     # https://tools.ietf.org/html/draft-koster-rep-04
 
-    def _entry(self) -> Any:
+    @staticmethod
+    def _entry(state: RobotFileParser) -> Any:
 
-        for entry in self.state.entries:
+        for entry in entries(state):
             if entry.applies_to(user_agent):
                 return entry
 
-        return self.state.default_entry
+        return None
 
 
-def matched_rules(entry: Any, url: URL) -> List[Tuple[bool, str]]:
-    result: List[Tuple[bool, str]] = []
+class Robots(dict):
+    """ robots.txt rules of the crawled hosts (by domain).
 
-    path = url.path
-    if not path:
-        path = "/"
+    Same RobotsTxt is returned to all workers asking for a new domain at the
+    same time, so robots.txt of each host requested once.
+    """
 
-    for line in entry.rulelines:
-        if not line.applies_to(path):
-            continue
+    def __init__(
+            self, transport: Optional[Transport] = None, cache: Optional[Cache] = None,
+            local: Optional[str] = None) -> None:
+        super().__init__()
 
-        if len(line.path) > len(path):
-            continue
+        self._transport = transport
+        self._cache = cache
+        self._lock = Lock()
 
-        result.append((
-            line.allowance,
-            line.path,
-        ))
+        # domain of the Document Root (its robots.txt isn't cached).
+        self._local = local
 
-    return sorted(result, key=lambda x: x[1])
+    def __missing__(self, domain: str) -> RobotsTxt:
 
+        with self._lock:
+            if domain not in self:
+                cache = self._cache if domain != self._local else None
+                self[domain] = RobotsTxt(self._transport, cache)
 
-def allowed(rules: List[Tuple[bool, str]]) -> bool:
-
-    if not rules:
-        return True
-
-    return rules[-1][0]
+            return self.get(domain) # type: ignore
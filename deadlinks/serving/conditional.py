@@ -0,0 +1,64 @@
+# Copyright 2019 Oleg Butuzov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+deadlinks.serving.conditional
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Conditional requests (ETag/Last-Modified validators) of Document Root files.
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from email.utils import formatdate, parsedate_to_datetime
+from os import stat_result
+from typing import Any, Dict
+
+# -- Implementation ------------------------------------------------------------
+
+
+def validators(stat: stat_result) -> Dict[str, str]:
+    """ Return ETag and Last-Modified headers of the file. """
+
+    return {
+        'ETag': '"{:x}-{:x}"'.format(stat.st_mtime_ns, stat.st_size),
+        'Last-Modified': formatdate(stat.st_mtime, usegmt=True),
+    }
+
+
+def not_modified(headers: Any, stat: stat_result) -> bool:
+    """ Is file not modified since the version client has (request headers)? """
+
+    if headers is None:
+        return False
+
+    # If-Modified-Since ignored if If-None-Match present (rfc7232, section 6)
+    if_none_match = headers.get('If-None-Match')
+    if if_none_match is not None:
+        etags = [etag.strip() for etag in if_none_match.split(",")]
+        return "*" in etags or validators(stat)['ETag'] in etags
+
+    if_modified_since = headers.get('If-Modified-Since')
+    if if_modified_since is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return False
+
+    return int(stat.st_mtime) <= since
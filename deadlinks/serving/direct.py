@@ -0,0 +1,157 @@
+# Copyright 2019 Oleg Butuzov. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+deadlinks.serving.direct
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+Responds on requests to <internal> by reading Document Root files directly
+(without web server).
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from http import HTTPStatus
+from io import BytesIO
+from os import stat
+from typing import BinaryIO, Dict, Mapping, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .conditional import not_modified, validators
+from .router import Router
+
+# -- Constants -----------------------------------------------------------------
+
+# requests to this origin are served by DirectAdapter.
+INTERNAL = "http://internal/"
+
+# request headers (values of requests' prepared request can be bytes).
+Headers = Mapping[str, Union[str, bytes]]
+
+# -- Implementation ------------------------------------------------------------
+
+
+class FileBody:
+    """ File read by chunks, closed as soon as it's read. """
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "rb")
+
+    def read(self, size: int = -1) -> bytes:
+        if self._file.closed:
+            return b""
+
+        data = self._file.read(size)
+        if not data or size < 0:
+            self.close()
+
+        return data
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class DirectAdapter(BaseAdapter):
+    """ requests transport adapter, that responds same way as serving.Handler
+        does, but without HTTP. """
+
+    def __init__(self, router: Router) -> None:
+        super().__init__()
+        self._router = router
+
+    def respond(
+            self, method: str, path: str,
+            headers: Optional[Headers] = None) -> Tuple[int, Dict[str, str], BinaryIO]:
+        """ Return status code, headers and body of the response on request. """
+
+        code, response = self._router(path)
+
+        if code == 301:
+            return (code, {'Location': str(response)}, BytesIO())
+
+        if code == 404:
+            return (code, {}, BytesIO())
+
+        file = stat(str(response))
+        if not_modified(headers, file):
+            return (304, validators(file), BytesIO())
+
+        response_headers = {
+            'Content-Type': "text/html; charset=utf-8",
+            'Content-Length': str(file.st_size),
+            **validators(file),
+        }
+
+        if method == "HEAD":
+            return (code, response_headers, BytesIO())
+
+        return (code, response_headers, FileBody(str(response))) # type: ignore
+
+    def unchanged(self, url: str, headers: Mapping[str, str]) -> bool:
+        """ Is file, url points to, not modified (according conditional request
+            headers)? Same as `respond` returning 304, but cheaper. """
+
+        parts = urlsplit(url)
+        path = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+
+        code, response = self._router(path)
+        if code != 200:
+            return False
+
+        try:
+            file = stat(str(response))
+        except OSError:
+            return False
+
+        return not_modified(headers, file)
+
+    def send( # pylint: disable-msg=R0913,W0613
+            self, request: PreparedRequest, stream: bool = False,
+            timeout: Union[None, float, Tuple[Optional[float], Optional[float]]] = None,
+            verify: Union[bool, str] = True, cert: Union[None, str, Tuple[str, str]] = None,
+            proxies: Optional[Dict[str, str]] = None) -> Response:
+        """ Respond on prepared request (timeout, verify, cert and proxies
+            have no use without network). """
+
+        try:
+            code, headers, body = self.respond(
+                str(request.method), request.path_url, request.headers)
+        except OSError as error:
+            raise RequestsConnectionError(error, request=request)
+
+        response = Response()
+        response.status_code = code
+        response.reason = HTTPStatus(code).phrase
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = body
+        response.url = str(request.url)
+        response.request = request
+
+        if not stream:
+            response.content # pylint: disable-msg=W0104
+
+        return response
+
+    def close(self) -> None:
+        """ Nothing to clean up. """
@@ -24,6 +24,7 @@ Handles requests responses via simple webserver.
 
 # -- Imports -------------------------------------------------------------------
 
+from os import fstat
 from typing import Any
 
 try:
@@ -31,6 +32,7 @@ try:
 except ModuleNotFoundError:
     from BaseHTTPServer import BaseHTTPRequestHandler # type: ignore
 
+from .conditional import not_modified, validators
 from .router import Router
 
 # -- Implementation ------------------------------------------------------------
@@ -38,6 +40,15 @@ from .router import Router
 
 class Handler(BaseHTTPRequestHandler):
 
+    # persistent connections (every response has Content-Length).
+    protocol_version = "HTTP/1.1"
+
+    # idle persistent connection closed after (seconds)
+    timeout = 30
+
+    # headers and body are sent separately.
+    disable_nagle_algorithm = True
+
     def __init__(self, router: Router, *args: Any, **kwargs: Any) -> None:
         """ Defined logic for responding on static files requests. """
         self._router = router
@@ -52,25 +63,52 @@ class Handler(BaseHTTPRequestHandler):
 
         Responds with (addording router results for requested path):
             Code 200 -> Content
+            Code 304 -> Nothing (file not modified)
             Code 301 -> New Location
             Code 404 -> Nothing (None)
         """
 
+        self.respond(with_body=True)
+
+    def do_HEAD(self) -> None:
+        """ Same as GET, but without Content. """
+
+        self.respond(with_body=False)
+
+    def respond(self, with_body: bool) -> None:
+        """ Respond on request, file content sent with sendfile. """
+
         code, response = self._router(self.path)
 
         if code == 301:
             self.send_response(code)
             self.send_header('Location', str(response))
+            self.send_header('Content-Length', '0')
             self.end_headers()
             return
 
         if code == 404:
             self.send_response(code)
+            self.send_header('Content-Length', '0')
             self.end_headers()
             return
 
         with open(response, "rb") as file:
+            stat = fstat(file.fileno())
+
+            if not_modified(self.headers, stat):
+                self.send_response(304)
+                for header, value in validators(stat).items():
+                    self.send_header(header, value)
+                self.end_headers()
+                return
+
             self.send_response(code)
             self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(stat.st_size))
+            for header, value in validators(stat).items():
+                self.send_header(header, value)
             self.end_headers()
-            self.wfile.write(file.read())
+
+            if with_body:
+                self.connection.sendfile(file)
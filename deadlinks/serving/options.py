@@ -42,3 +42,14 @@ default_options.append((
         'type': Path()
     },
 ))
+
+# files are read directly, unless web server is asked for.
+default_options.append((
+    ('http_server', '--http-server'),
+    {
+        'default': False,
+        'is_flag': True,
+        'show_default': False,
+        'help': 'Serve Document Root with local web server',
+    },
+))
@@ -25,8 +25,10 @@ Implements simple file system lookups for web requests on generated docs.
 # -- Imports -------------------------------------------------------------------
 
 from collections import OrderedDict
-from pathlib import Path
-from typing import Dict, Optional, Tuple, Union
+from os import scandir
+from pathlib import Path, PurePosixPath
+from threading import Lock
+from typing import Dict, Optional, Set, Tuple, Union
 
 from ..exceptions import DeadlinksSettingsRoot
 
@@ -40,7 +42,12 @@ root_web_files = [
 
 
 class Router():
-    """ Router for the static site  """
+    """ Router for the static site
+
+    Document Root is scanned once, and requests are answered by the lookup
+    in files table (without file system access). `refresh` rescans Document
+    Root.
+    """
 
     def __init__(self, siteroot: Union[Path, str]) -> None:
         """ Transform startup params and load redirections. """
@@ -57,9 +64,16 @@ class Router():
         if not self._siteroot.is_dir():
             raise DeadlinksSettingsRoot("This is not a directory")
 
+        self._lock = Lock()
+
         # redirects
         self._redirects: Dict[str, str] = OrderedDict()
-        self.load_redirects()
+
+        # files table
+        self._files = set() # type: Set[str]
+        self._table = {} # type: Dict[str, str]
+
+        self.refresh()
 
     def load_redirects(self) -> None:
         """  Supports only _redirects - docs.netlify.com/routing/redirects . """
@@ -80,6 +94,63 @@ class Router():
 
                 self._redirects[p[0]] = p[1]
 
+    def refresh(self) -> None:
+        """ Scan Document Root and build lookup table. """
+
+        with self._lock:
+            files, dirs = self.scan()
+
+            # same order of tries, as web server would do with file system:
+            # index files for directory, or file with .html, .htm or no extension.
+            table = {} # type: Dict[str, str]
+            for key in dirs | files | {f.rsplit(".", 1)[0] for f in files}:
+                if key == ".":
+                    tries = ["index.html", "index.htm"]
+                elif key in dirs:
+                    tries = [f"{key}/index.html", f"{key}/index.htm"]
+                else:
+                    tries = [f"{key}.html", f"{key}.htm", key]
+
+                for file in tries:
+                    if file in files:
+                        table[key] = str(self._siteroot / file)
+                        break
+
+            self._redirects = OrderedDict()
+            self.load_redirects()
+
+            self._files, self._table = files, table
+
+    def scan(self) -> Tuple[Set[str], Set[str]]:
+        """ Return files and directories (relative to Document Root). """
+
+        files, dirs = set(), {"."} # type: Set[str], Set[str]
+        seen = set() # type: Set[str]
+
+        pending = [(str(self._siteroot), "")]
+        while pending:
+            path, prefix = pending.pop()
+
+            # symlinked directories can make loops.
+            real = str(Path(path).resolve())
+            if real in seen:
+                continue
+            seen.add(real)
+
+            with scandir(path) as entries:
+                for entry in entries:
+                    name = prefix + entry.name
+                    try:
+                        if entry.is_dir():
+                            dirs.add(name)
+                            pending.append((entry.path, name + "/"))
+                        elif entry.is_file():
+                            files.add(name)
+                    except OSError:
+                        continue
+
+        return (files, dirs)
+
     def __call__(self, request_url: str) -> Tuple[int, Optional[str]]:
         """ Implements router logic. """
 
@@ -91,29 +162,20 @@ class Router():
         if request_url in self._redirects:
             return (301, self._redirects[request_url])
 
+        # same normalization Path does ("a//b/./c/" is "a/b/c").
+        key = request_url.strip("/") or "."
+        if "//" in key or "." in key.split("/"):
+            key = str(PurePosixPath(key))
+
         # requests for favicon, robots.txt and sitemap.xml
         if request_url in root_web_files:
-            request_file = self._siteroot / request_url.lstrip("/")
-            if request_file.is_file():
-                return (200, str(request_file.resolve()))
+            if key in self._files:
+                return (200, str((self._siteroot / key).resolve()))
 
             return (404, None)
 
-        request_file = self._siteroot / request_url.lstrip("/")
-
-        try_files = []
-
-        if request_file.is_dir():
-            try_files.append(request_file / "index.html")
-            try_files.append(request_file / "index.htm")
-        else:
-            _path = str(request_file)
-            try_files.append(Path(_path + ".html"))
-            try_files.append(Path(_path + ".htm"))
-            try_files.append(request_file)
-
-        for file in try_files:
-            if file.is_file():
-                return (200, str(file))
+        file = self._table.get(key)
+        if file is None:
+            return (404, None)
 
-        return (404, None)
+        return (200, file)
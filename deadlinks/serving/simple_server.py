@@ -48,6 +48,9 @@ class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
     """Handle requests in a separate thread."""
     daemon_threads = True
 
+    # connections of many concurrent crawlers shouldn't be dropped.
+    request_queue_size = 128
+
 
 class SimpleServer:
 
@@ -24,14 +24,32 @@ Handles settings passed to crawler.
 
 # -- Imports -------------------------------------------------------------------
 
+import re
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
 from .baseurl import BaseURL
-from .exceptions import (DeadlinksSettingsBase, DeadlinksSettingsChange, DeadlinksSettingsDomains,
-                         DeadlinksSettingsPath, DeadlinksSettingsPathes, DeadlinksSettingsRetry,
-                         DeadlinksSettingsRoot, DeadlinksSettingsThreads)
+from .breaker import DEFAULT_FAILURES
+from .cache import DEFAULT_NEGATIVE_TTL, DEFAULT_TTL
+from .checkpoint import DEFAULT_INTERVAL
+from .exceptions import (DeadlinksSettingsBase, DeadlinksSettingsCache, DeadlinksSettingsChange,
+                         DeadlinksSettingsCheckpoint, DeadlinksSettingsDomains,
+                         DeadlinksSettingsHostFailures, DeadlinksSettingsPath,
+                         DeadlinksSettingsPathes, DeadlinksSettingsPerHost,
+                         DeadlinksSettingsReferrers, DeadlinksSettingsRetry, DeadlinksSettingsRoot,
+                         DeadlinksSettingsThreads)
+from .frontier import DEFAULT_PER_HOST
+from .matcher import Matcher
 from .serving import Server
+from .serving.router import Router
+
+# -- Constants -----------------------------------------------------------------
+
+# maximum number of concurrent crawlers.
+THREADS_LIMIT = 1000
+
+# maximum number of concurrent crawlers autoscaling can grow to.
+THREADS_AUTO_LIMIT = 128
 
 # -- Implementation ------------------------------------------------------------
 # TODO - Review, and may be somehow simplify arguments
@@ -43,12 +61,25 @@ class Settings:
     _stay_within_path = None # type: Optional[bool]
     _skip_robots = None # type Optional[bool]
     _external = None # type: Optional[bool]
-    _threads = None # type: Optional[int]
+    _autoscale = False # type: bool
     _domains = None # type: Optional[List[str]]
     _pathes = None # type: Optional[List[str]]
-    _retry = None # type: Optional[int]
     _base = None # type: Optional[BaseURL]
     _root = None # type: Optional[Path]
+    _router = None # type: Optional[Router]
+    _cache = None # type: Optional[str]
+    _checkpoint = None # type: Optional[str]
+    _resume = None # type: Optional[bool]
+    _max_referrers = None # type: Optional[int]
+    _max_per_host = None # type: Optional[int]
+
+    # validated numbers (attributes exist only once they are set).
+    _threads: int
+    _retry: int
+    _max_host_failures: int
+    _cache_ttl: int
+    _cache_negative_ttl: int
+    _checkpoint_interval: int
 
     def __init__(self, url: str, **kwargs: Any) -> None:
         """ Instantiate settings class. """
@@ -60,7 +91,28 @@ class Settings:
         self.external = defaults['check_external_urls']
         self.retry = defaults['retry']
 
-        # ignoring pathes.
+        # concurrent requests to the one external host.
+        self.max_per_host = defaults['max_per_host']
+
+        # connection errors in a row, that make crawler skip the host.
+        self.max_host_failures = defaults['max_host_failures']
+
+        # results of external urls checks kept between runs.
+        self.cache = defaults['cache']
+        self.cache_ttl = defaults['cache_ttl']
+        self.cache_negative_ttl = defaults['cache_negative_ttl']
+
+        # crawling state saved to resume crawling later.
+        self.checkpoint = defaults['checkpoint']
+        self.checkpoint_interval = defaults['checkpoint_interval']
+        self.resume = defaults['resume']
+
+        # number of referrers kept for each link.
+        self.max_referrers = defaults['max_referrers']
+
+        # ignoring pathes (nothing is ignored till rules are set).
+        self._ignored_domains = Matcher([])
+        self._ignored_pathes = Matcher([])
         self.domains = defaults['ignore_domains']
         self.pathes = defaults['ignore_pathes']
 
@@ -78,11 +130,16 @@ class Settings:
             self._is_masked = True
             if defaults['root'] is None:
                 # Suppose to raise error
-                self.root = defaults['root']
+                self.root = None
 
-            self.root = Path(defaults['root']) # type: ignore
-            web_server = Server(self.root)
-            base = BaseURL(web_server.url() + base.path)
+            root = Path(str(defaults['root']))
+            self.root = root
+            if defaults['http_server']:
+                web_server = Server(root)
+                base = BaseURL(web_server.url() + base.path)
+            else:
+                # files are read by crawler directly, see serving.direct
+                self._router = Router(root.resolve())
 
         self.base = base
 
@@ -92,6 +149,7 @@ class Settings:
 
         _defaults = {
             'root': '.',
+            'http_server': False,
             'check_external_urls': False,
             'ignore_domains': [],
             'ignore_pathes': [],
@@ -99,6 +157,15 @@ class Settings:
             'check_robots_txt': True,
             'retry': None,
             'threads': None,
+            'max_per_host': DEFAULT_PER_HOST,
+            'max_host_failures': DEFAULT_FAILURES,
+            'cache': None,
+            'cache_ttl': DEFAULT_TTL,
+            'cache_negative_ttl': DEFAULT_NEGATIVE_TTL,
+            'checkpoint': None,
+            'checkpoint_interval': DEFAULT_INTERVAL,
+            'resume': False,
+            'max_referrers': None,
         }
 
         return {**_defaults, **kwargs}
@@ -112,12 +179,18 @@ class Settings:
         return self._is_masked
 
     @property
-    def root(self) -> str:
+    def router(self) -> Optional[Router]:
+        """ Router of <internal> Document Root (if it's not served via HTTP). """
+
+        return self._router
+
+    @property
+    def root(self) -> Optional[Path]:
         """ Getter for Document Root value. """
         return self._root
 
     @root.setter
-    def root(self, value: Path) -> None:
+    def root(self, value: Optional[Path]) -> None:
         if self._root is not None: #pylint: disable-msg=C0325
             error = "root is already set to {}"
             raise DeadlinksSettingsRoot(error.format(self._root))
@@ -200,8 +273,19 @@ class Settings:
                 error = 'Domain "{}" should conform to rfc3986.'
                 raise DeadlinksSettingsDomains(error.format(domain))
 
+        try:
+            self._ignored_domains = Matcher(values)
+        except re.error as e:
+            error = 'Domain rule is not valid: {}'
+            raise DeadlinksSettingsDomains(error.format(e))
+
         self._domains = values
 
+    @property
+    def ignored_domains(self) -> Matcher:
+        """ Getter for Ignored Domains (compiled) matcher. """
+        return self._ignored_domains
+
     # -- Ignored Pathes --------------------------------------------------------
     @property
     def pathes(self) -> List[str]:
@@ -223,7 +307,20 @@ class Settings:
                 error = 'Empty Path is not accepted.'
                 raise DeadlinksSettingsPathes(error.format(path))
 
-        self._pathes = list(set(values)) # only uniq values
+        values = list(set(values)) # only uniq values
+
+        try:
+            self._ignored_pathes = Matcher(values)
+        except re.error as e:
+            error = 'Path rule is not valid: {}'
+            raise DeadlinksSettingsPathes(error.format(e))
+
+        self._pathes = values
+
+    @property
+    def ignored_pathes(self) -> Matcher:
+        """ Getter for Ignored Pathes (compiled) matcher. """
+        return self._ignored_pathes
 
     # -- Stay with in path setting ---------------------------------------------
     @property
@@ -268,11 +365,11 @@ class Settings:
     @property
     def retry(self) -> int:
         """ Getter for retry information. """
-        return int(self._retry)
+        return self._retry
 
     @retry.setter
     def retry(self, value: Optional[int]) -> None:
-        if self._retry is not None: #pylint: disable-msg=C0325
+        if hasattr(self, '_retry'):
             raise DeadlinksSettingsChange("Change not allowed")
 
         # retry validation
@@ -290,6 +387,61 @@ class Settings:
 
         raise DeadlinksSettingsRetry('Setting "retry" is not a number')
 
+    # -- Requests per Host -----------------------------------------------------
+
+    """
+    Maximum number of concurrent requests to the one external host (crawled
+    site itself is limited only by number of threads). None - no limit.
+    """
+
+    @property
+    def max_per_host(self) -> Optional[int]:
+        """ Getter for concurrent requests to the one host limit. """
+        return self._max_per_host
+
+    @max_per_host.setter
+    def max_per_host(self, value: Optional[int]) -> None:
+        if self._max_per_host is not None: #pylint: disable-msg=C0325
+            raise DeadlinksSettingsChange("Change not allowed")
+
+        if value is None:
+            return
+
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise DeadlinksSettingsPerHost('Setting "max_per_host" is not a number')
+
+        if value < 1:
+            error = 'Setting "max_per_host" value should be positive.'
+            raise DeadlinksSettingsPerHost(error)
+
+        self._max_per_host = value
+
+    # -- Host Failures ---------------------------------------------------------
+
+    """
+    Number of connection errors in a row, after which remaining links of the
+    host reported as failed without requests. 0 - links are always requested.
+    """
+
+    @property
+    def max_host_failures(self) -> int:
+        """ Getter for connection errors (in a row) per host limit. """
+        return self._max_host_failures
+
+    @max_host_failures.setter
+    def max_host_failures(self, value: int) -> None:
+        if hasattr(self, '_max_host_failures'):
+            raise DeadlinksSettingsChange("Change not allowed")
+
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise DeadlinksSettingsHostFailures('Setting "max_host_failures" is not a number')
+
+        if value < 0:
+            error = 'Setting "max_host_failures" value should be positive (or 0).'
+            raise DeadlinksSettingsHostFailures(error)
+
+        self._max_host_failures = value
+
     # -- External -------------------------------------------------------------
 
     """
@@ -314,28 +466,202 @@ class Settings:
 
     """
     Concurrent execution of indexation. "Off" by default.
+
+    With "auto" value number of crawlers is adjusted while crawling (up to
+    THREADS_AUTO_LIMIT) based on latency, queue depth and errors rate.
     """
 
     @property
     def threads(self) -> int:
-        """ Getter for number of threads to run """
-        return int(self._threads)
+        """ Getter for number of threads to run (maximum in "auto" mode) """
+        return self._threads
 
     @threads.setter
-    def threads(self, value: Optional[int]) -> None:
-        if self._threads is not None: #pylint: disable-msg=C0325
+    def threads(self, value: Optional[Union[int, str]]) -> None:
+        if hasattr(self, '_threads'):
             raise DeadlinksSettingsChange("Change not allowed")
 
         if value is None:
             self._threads = 1
             return
 
+        if value == "auto":
+            self._autoscale = True
+            self._threads = THREADS_AUTO_LIMIT
+            return
+
         if isinstance(value, int):
-            if 1 <= value <= 10:
+            if 1 <= value <= THREADS_LIMIT:
                 self._threads = value
                 return
 
-            error = 'Setting "threads" value out of the allowed range (1...10).'
-            raise DeadlinksSettingsThreads(error)
+            error = 'Setting "threads" value out of the allowed range (1...{}).'
+            raise DeadlinksSettingsThreads(error.format(THREADS_LIMIT))
 
         raise DeadlinksSettingsThreads('Setting "threads" is not a number')
+
+    @property
+    def autoscale(self) -> bool:
+        """ Is number of threads adjusted automatically? """
+        return self._autoscale
+
+    # -- Results Cache ---------------------------------------------------------
+
+    """
+    Results of external urls checks can be kept in the file (sqlite database)
+    and reused by the next runs: successful checks (and redirections) during
+    `cache_ttl` seconds, failed ones - during `cache_negative_ttl` seconds.
+    """
+
+    @property
+    def cache(self) -> Optional[str]:
+        """ Getter for path to the results cache. """
+        return self._cache
+
+    @cache.setter
+    def cache(self, value: Optional[str]) -> None:
+        if self._cache is not None: #pylint: disable-msg=C0325
+            raise DeadlinksSettingsChange("Change not allowed")
+
+        if value is None:
+            return
+
+        if not isinstance(value, str) or not value:
+            raise DeadlinksSettingsCache('Setting "cache" is not a path')
+
+        if Path(value).is_dir() or not Path(value).resolve().parent.is_dir():
+            error = 'Cache file "{}" can\'t be created.'
+            raise DeadlinksSettingsCache(error.format(value))
+
+        self._cache = value
+
+    @property
+    def cache_ttl(self) -> int:
+        """ Getter for time (seconds) successful checks are cached. """
+        return self._cache_ttl
+
+    @cache_ttl.setter
+    def cache_ttl(self, value: int) -> None:
+        if hasattr(self, '_cache_ttl'):
+            raise DeadlinksSettingsChange("Change not allowed")
+
+        self._cache_ttl = self._ttl('cache_ttl', value)
+
+    @property
+    def cache_negative_ttl(self) -> int:
+        """ Getter for time (seconds) failed checks are cached. """
+        return self._cache_negative_ttl
+
+    @cache_negative_ttl.setter
+    def cache_negative_ttl(self, value: int) -> None:
+        if hasattr(self, '_cache_negative_ttl'):
+            raise DeadlinksSettingsChange("Change not allowed")
+
+        self._cache_negative_ttl = self._ttl('cache_negative_ttl', value)
+
+    @staticmethod
+    def _ttl(name: str, value: int) -> int:
+        """ Validate TTL setting value. """
+
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise DeadlinksSettingsCache('Setting "{}" is not a number'.format(name))
+
+        if value < 0:
+            error = 'Setting "{}" value can\'t be negative.'
+            raise DeadlinksSettingsCache(error.format(name))
+
+        return value
+
+    # -- Checkpoints -----------------------------------------------------------
+
+    """
+    Crawling state (index, queue and robots.txt rules) saved to `checkpoint`
+    file every `checkpoint_interval` seconds (and once crawling is finished or
+    terminated). With `resume` crawling continues from the saved state.
+    """
+
+    @property
+    def checkpoint(self) -> Optional[str]:
+        """ Getter for path to the checkpoint file. """
+        return self._checkpoint
+
+    @checkpoint.setter
+    def checkpoint(self, value: Optional[str]) -> None:
+        if self._checkpoint is not None: #pylint: disable-msg=C0325
+            raise DeadlinksSettingsChange("Change not allowed")
+
+        if value is None:
+            return
+
+        if not isinstance(value, str) or not value:
+            raise DeadlinksSettingsCheckpoint('Setting "checkpoint" is not a path')
+
+        if Path(value).is_dir() or not Path(value).resolve().parent.is_dir():
+            error = 'Checkpoint file "{}" can\'t be created.'
+            raise DeadlinksSettingsCheckpoint(error.format(value))
+
+        self._checkpoint = value
+
+    @property
+    def checkpoint_interval(self) -> int:
+        """ Getter for time (seconds) between checkpoints. """
+        return self._checkpoint_interval
+
+    @checkpoint_interval.setter
+    def checkpoint_interval(self, value: int) -> None:
+        if hasattr(self, '_checkpoint_interval'):
+            raise DeadlinksSettingsChange("Change not allowed")
+
+        if isinstance(value, bool) or not isinstance(value, int):
+            error = 'Setting "checkpoint_interval" is not a number'
+            raise DeadlinksSettingsCheckpoint(error)
+
+        if value < 1:
+            error = 'Setting "checkpoint_interval" value should be positive.'
+            raise DeadlinksSettingsCheckpoint(error)
+
+        self._checkpoint_interval = value
+
+    @property
+    def resume(self) -> bool:
+        """ Getter for resume crawling from checkpoint setting. """
+        return bool(self._resume)
+
+    @resume.setter
+    def resume(self, value: bool) -> None:
+        if self._resume is not None: #pylint: disable-msg=C0325
+            raise DeadlinksSettingsChange("Change not allowed")
+
+        if not isinstance(value, bool):
+            raise DeadlinksSettingsCheckpoint('Setting "resume" is not a bool')
+
+        if value and self._checkpoint is None:
+            error = 'Crawling can\'t be resumed without "checkpoint" file.'
+            raise DeadlinksSettingsCheckpoint(error)
+
+        self._resume = value
+
+    # -- Referrers -------------------------------------------------------------
+
+    @property
+    def max_referrers(self) -> Optional[int]:
+        """ Getter for number of referrers kept for each link. """
+        return self._max_referrers
+
+    @max_referrers.setter
+    def max_referrers(self, value: Optional[int]) -> None:
+        if self._max_referrers is not None: #pylint: disable-msg=C0325
+            raise DeadlinksSettingsChange("Change not allowed")
+
+        if value is None:
+            return
+
+        if isinstance(value, bool) or not isinstance(value, int):
+            error = 'Setting "max_referrers" is not a number'
+            raise DeadlinksSettingsReferrers(error)
+
+        if value < 1:
+            error = 'Setting "max_referrers" value should be positive.'
+            raise DeadlinksSettingsReferrers(error)
+
+        self._max_referrers = value
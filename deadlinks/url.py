@@ -24,65 +24,76 @@ URL representation with benefits
 
 # -- Imports -------------------------------------------------------------------
 
-from html import unescape
-from re import compile as _compile
-from typing import List, Union  # pylint: disable-msg=W0611
+from sys import intern
+from typing import Dict, List, Optional  # pylint: disable-msg=W0611
 from urllib.parse import urljoin, urlparse
 
-from requests import RequestException
+from requests import RequestException, Response
 
-from .exceptions import DeadlinksIgnoredURL, DeadlinksRedirectionURL
-from .request import request
+from .breaker import unreachable
+from .cache import Page
+from .exceptions import DeadlinksIgnoredURL, DeadlinksRateLimitedURL, DeadlinksRedirectionURL
+from .extractor import links_of
+from .limiter import rate_limited
+from .request import Transport, shared
 from .status import Status
 
-# -- Constants -----------------------------------------------------------------
-
-__RE_LINKS__ = _compile(r'<a\s{1}([^>]+)>') # pylint: disable=W1401
-
-# filters
-def CLEANER(x:str) -> str:
-    """removes quotes, spaces and new lines"""
-    return x.strip("\"'\n ")
-def ANCHORS(x:str) -> str:
-    """removes anschor"""
-    return x.split("#")[0]
-def UNESCPE(x:str) -> str:
-    return unescape(x)
+# -- Implementation ------------------------------------------------------------
 
 
 class URL:
     """ URL abstraction representation. """
 
+    # Millions of (external) links can be discovered by crawler, so no
+    # per object __dict__, and (only) parts of the url used are kept.
+    __slots__ = (
+        '_location', '_scheme', '_domain', '_path', '_status', '_referrers', '_referred',
+        '_links', '_validators', '_message', '_unreachable'
+    )
+
     def __init__(self, location: str) -> None:
-        # print(urlparse(location))
-        self._url = urlparse(location)
+        url = urlparse(location)
+
+        # url, and its parts we use. Hosts and schemes are same for the many
+        # urls, so their strings are shared (interned).
+        self._location = url.geturl() # type: str
+        self._scheme = intern(url.scheme) # type: str
+        self._domain = intern(url.netloc) # type: str
+        self._path = url.path # type: str
+
         self._status = Status.UNDEFINED # type: Status
 
-        # some predefined states
-        self._referrers = [] # type: List[str]
-        self._text: Union[str, None] = None
-        self._links = [] # type: List[str]
+        # some predefined states (lists created once needed)
+        self._referrers = None # type: Optional[Dict[str, None]]
+        self._referred = 0 # type: int
+        self._links = None # type: Optional[List[str]]
+
+        # ETag and Last-Modified of the page (if server provided any).
+        self._validators = None # type: Optional[Dict[str, str]]
 
         # internal error or mesage field, used to store ignore message
         # or error or status code.
         # TODO - rethink logic behind this value.
         self._message = "" # type: str
 
+        # request failed, because host wasn't reachable (see breaker).
+        self._unreachable = False # type: bool
+
     # Basic properties of the URL Link
     @property
     def domain(self) -> str:
         """ Short netlocation prop. """
-        return self._url.netloc
+        return self._domain
 
     @property
     def scheme(self) -> str:
         """ Short scheme prop. """
-        return self._url.scheme
+        return self._scheme
 
     @property
     def path(self) -> str:
         """ Short path prop. """
-        return self._url.path
+        return self._path
 
     @property
     def status(self) -> Status:
@@ -106,6 +117,14 @@ class URL:
             raise TypeError("message can be only string")
         self._message = value
 
+    @property
+    def unreachable(self) -> bool:
+        return self._unreachable
+
+    @unreachable.setter
+    def unreachable(self, value: bool) -> None:
+        self._unreachable = value
+
     def is_valid(self) -> bool:
         """ Check if url looks "valid". """
 
@@ -117,7 +136,7 @@ class URL:
         return self.scheme in {"http", "https"}
 
     def is_schema_valid(self) -> bool:
-        return self._url.scheme in [
+        return self._scheme in [
             "http",
             "https",
             "ftp",
@@ -128,32 +147,46 @@ class URL:
             "news",
         ]
 
-    def add_referrer(self, url: str) -> None:
-        """ Add a page that links (referrer) to self object. """
-        if url in self._referrers:
+    def add_referrer(self, url: str, limit: Optional[int] = None) -> None:
+        """ Add a page that links (referrer) to self object.
+
+        Referrers are (insertion ordered) set of interned urls, so every page
+        url (referrer of many links) kept in memory once. Only first `limit`
+        referrers kept, if limit is set, others are only counted.
+        """
+        if self._referrers is None:
+            self._referrers = {}
+        elif url in self._referrers:
             return
-        self._referrers.append(url)
 
-    def get_referrers(self) -> List[str]:
-        """ Return URL refferers list. """
-        return self._referrers
+        self._referred += 1
+        if limit is not None and len(self._referrers) >= limit:
+            return
 
-    def match_domains(self, domains: List[str]) -> bool:
-        """ Match ignored pathes (argument pathes) to `url.netloc`. """
-        for domain in domains:
-            if domain in self._url.netloc:
-                return True
-        return False
+        self._referrers[intern(url)] = None
 
-    def match_pathes(self, pathes: List[str]) -> bool:
-        """ Match ignored pathes (argument pathes) to `url.path`. """
-        for path in pathes:
-            if path in self._url.path:
-                return True
-        return False
+    def get_referrers(self) -> List[str]:
+        """ Return URL refferers list. """
+        return list(self._referrers) if self._referrers is not None else []
 
-    def exists(self, is_external: bool = False, retries: int = 0) -> bool:
-        """ Return "found" (or "not found") status of the page as bool. """
+    @property
+    def referred(self) -> int:
+        """ Return number of URL refferers (including not kept ones). """
+        return self._referred
+
+    @referred.setter
+    def referred(self, value: int) -> None:
+        """ Setter for number of URL referrers (restored ones). """
+        self._referred = value
+
+    def exists(
+            self, is_external: bool = False, retries: int = 0,
+            transport: Optional[Transport] = None, page: Optional[Page] = None) -> bool:
+        """ Return "found" (or "not found") status of the page as bool.
+
+        If `page` (previously crawled version of this page) is known, request
+        is conditional and page's links are reused if it wasn't modified.
+        """
 
         if self.status == Status.FOUND:
             return True
@@ -166,27 +199,65 @@ class URL:
             raise DeadlinksIgnoredURL(error.format(self.url()))
 
         try:
-            response = request(self.url(), is_external, retries)
+            if transport is None:
+                transport = shared(retries)
+            headers = page.headers() if page is not None else None
+            response = transport.request(self.url(), is_external, stream=True, headers=headers)
+            return self.consume(response, page)
         except RequestException as exception:
             self.message = str(exception)
+            self.unreachable = unreachable(exception)
             return False
 
+    def consume(
+            self, response: Response, page: Optional[Page] = None,
+            links: Optional[List[str]] = None) -> bool:
+        """ Return "found" status of the page based on the response.
+
+        `links` - found in the response body, if it was read already.
+        """
+
+        if response.status_code == 304 and page is not None:
+            response.content # pylint: disable-msg=W0104
+            return self.not_modified(page)
+
         # Group of 2XX responses. In general we think its OK to mark URL as
-        # reachable and exists
+        # reachable and exists. Page body isn't kept, only links found in it,
+        # while it's read.
         if response.status_code // 100 == 2:
-            self._text = response.text
+            self._links = links if links is not None else links_of(response)
+
+            etag = response.headers.get('etag', '')
+            modified = response.headers.get('last-modified', '')
+            if etag or modified:
+                self._validators = {'etag': etag, 'modified': modified}
+
             return True
 
+        # reading (small) body of other responses, so connection can be reused.
+        response.content # pylint: disable-msg=W0104
+
         # redirections catching.
         if response.status_code // 100 == 3:
             raise DeadlinksRedirectionURL(response.headers['location'])
 
         self.message = str(response.status_code)
+
+        # host asks to slow down, crawler decides when to try again.
+        if rate_limited(response.status_code, response.headers):
+            raise DeadlinksRateLimitedURL(response.headers.get('retry-after', ''))
+
         return False
 
+    def not_modified(self, page: Page) -> bool:
+        """ Page not modified since it was crawled, so it has same links. """
+
+        self._links = list(page.links)
+        return True
+
     def url(self) -> str:
         """ Return url based on abstraction, minus ending slash. """
-        return self._url.geturl()
+        return self._location
 
     def __str__(self) -> str:
         """ Converts URL object to string (actual URL). """
@@ -197,66 +268,33 @@ class URL:
 
         return f"{self.__class__.__name__}<{self.url()}>"
 
-    def _consume_links(self) -> None:
-        """ Parse response text into list of links. """
-
-        links = []
-        for attr in __RE_LINKS__.findall(self._text):
-            pos = attr.find("href=")
-            if pos == -1:
-                "href not found"
-                continue
-
-            href = attr[pos + 5:].strip()
-            if not href:
-                continue
-
-            link: str = ""
-            quoted = href[0] in {'"', "'"}
-            if quoted:
-                end_pos = href[1:].find(href[0])
-                if end_pos == -1:
-                    "unquoted link"
-                    continue
-                link = href[1:end_pos + 1]
-            else:
-                end_pos = href[0:].find(" ")
-                link = href if end_pos == -1 else href[:end_pos + 1]
-
-            if not link:
-                "empty link"
-                continue
-
-            links.append(link.replace("\n", ""))
-
-        self._links = list(links)
-        self._links = list(map(CLEANER, self._links))
-        self._links = list(map(ANCHORS, self._links))
-        self._links = list(map(UNESCPE, self._links))
-
     @property
     def links(self) -> List[str]:
         """ Return links found at the page. """
+        return self._links if self._links is not None else []
 
-        if not self._text or self._links:
-            return self._links
-
-        self._consume_links()
+    @property
+    def validators(self) -> Optional[Dict[str, str]]:
+        """ Return ETag and Last-Modified of the (modified) page. """
+        return self._validators
 
-        return list(set(self._links))
+    def release(self) -> None:
+        """ Forget links found at the page (once they are queued). """
+        self._links = None
+        self._validators = None
 
     def link(self, href: str) -> str:
         """
         Construct a full (“absolute”) URL by combining a
         “URL” object as base with another URL (url).
 
-        avoiding using urljoin if self._url and href are same.
+        avoiding using urljoin if self and href are same.
         """
 
-        if self._url.geturl() == href:
+        if self._location == href:
             return href
 
-        return urljoin(self._url.geturl(), href)
+        return urljoin(self._location, href)
 
 
 if __name__ == "__main__": # pragma: no cover
@@ -0,0 +1,278 @@
+"""
+tests.components.tests_async_crawler.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+AsyncCrawler (asyncio engine) tests, results expected to be same as
+threaded Crawler has.
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+import asyncio
+from threading import current_thread, main_thread
+from time import time
+
+import pytest
+from click.testing import CliRunner
+from requests import Request
+from requests.exceptions import Timeout
+
+from deadlinks import AsyncCrawler, Crawler, DeadlinksEngine, DeadlinksIgnoredURL, Settings
+from deadlinks.__main__ import main
+from deadlinks.async_request import AsyncTransport
+from deadlinks.extractor import CHUNK_SIZE
+
+from ..utils import Page
+from .tests_crawler import site_with_links_defaults
+
+# -- Tests ---------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    'check_external, threads, ignore_domains, ignore_pathes, results',
+    [params for params in site_with_links_defaults if not params[0]])
+def test_same_as_crawler(site_with_links, check_external, threads, ignore_domains, ignore_pathes,
+                         results):
+
+    options = {
+        'check_external_urls': check_external,
+        'stay_within_path': False,
+        'threads': threads,
+        'ignore_domains': ignore_domains,
+        'ignore_pathes': ignore_pathes,
+    }
+
+    c = AsyncCrawler(Settings(site_with_links, **options))
+    c.start()
+
+    indexed, failed, succeed, ignored, redirected = results
+
+    assert len(c.index) == indexed
+    assert len(c.redirected) == redirected
+    assert len(c.failed) == failed
+    assert len(c.succeed) == succeed
+    assert len(c.ignored) == ignored
+
+    t = Crawler(Settings(site_with_links, **options))
+    t.start()
+
+    for attr in ['succeed', 'failed', 'ignored', 'redirected']:
+        assert [x.url() for x in getattr(c, attr)] == [x.url() for x in getattr(t, attr)]
+
+
+def test_redirections(server):
+
+    address = server.router({
+        '^/$': Page("<a href='/link-1'></a>").exists(),
+        '^/link-\d{1,}$': Page("ok").exists().redirects(pattern='%s/'),
+        '^/link-\d{1,}/$': Page("ok").exists(),
+    })
+
+    c = AsyncCrawler(Settings(address))
+    c.start()
+
+    assert len(c.redirected) == 1
+    assert len(c.succeed) == 2
+
+
+@pytest.mark.parametrize(
+    'unlocked_after, do_retries, fails',
+    [
+        (0, 0, 0), # no fails
+        (1, 0, 1), # not available page
+        (2, 1, 1), # not available page
+        (1, 1, 0), # no fails
+    ])
+def test_retry(server, unlocked_after, do_retries, fails):
+    address = server.router({
+        '^/$': Page("ok").exists().unlock_after(unlocked_after),
+    })
+
+    c = AsyncCrawler(Settings(address, retry=do_retries))
+    c.start()
+
+    assert len(c.failed) == fails
+
+
+def test_not_available(server):
+
+    address = server.router({
+        '^/$': Page("<a href='http://127.0.0.1:79/'>closed port</a>").exists(),
+    })
+
+    c = AsyncCrawler(Settings(address, check_external_urls=True))
+    c.start()
+
+    assert len(c.failed) == 1
+    assert "Failed to establish a connection" in c.failed[0].message
+
+
+def test_robots_txt(server):
+
+    address = server.router({
+        '^/$': Page("<a href='/link-1'>1</a><a href='/link-2'>2</a>").exists(),
+        '^/link-\d{1,}$': Page("ok").exists(),
+        '^/robots.txt$': Page("User-agent: *\nDisallow: /link-2").mime('text/plain').exists(),
+    })
+
+    c = AsyncCrawler(Settings(address))
+    c.start()
+
+    assert len(c.succeed) == 2
+    assert len(c.ignored) == 1
+
+    with pytest.raises(DeadlinksIgnoredURL):
+        AsyncCrawler(Settings(address + "/link-2"))
+
+
+def tree(path):
+    """ Every page (of first 21) links to 10 more pages. """
+
+    page = 0 if path == "/" else int(path.strip("/"))
+    links = range(page * 10 + 1, page * 10 + 11) if page < 20 else range(0)
+
+    return "".join([f"<a href='/{x}'>{x}</a>" for x in links])
+
+
+@pytest.fixture
+def slow_server(server):
+    """ Every page responds after 0.5s. """
+    page = Page(tree).slow(0.5).mime('text/html').exists()
+    return server.router({'^/\d*$': page}, keep_alive=True) + "/"
+
+
+@pytest.mark.timeout(10)
+def test_many_in_flight(slow_server):
+    """ 201 pages (0.5s each) - in 3 "waves" of requests """
+
+    c = AsyncCrawler(Settings(slow_server, check_robots_txt=False), concurrency=200)
+
+    started = time()
+    c.start()
+
+    assert len(c.succeed) == 201
+    assert time() - started < 5
+
+
+def test_links_while_read(server):
+    """ Links found while body (of a few chunks) is read, body isn't kept. """
+
+    page = "<a href='/a'></a>" + " " * (CHUNK_SIZE - 20) + "<a href='/b'></a>" * 3
+    address = server.router({
+        '^/$': Page(page).mime('text/html').exists(),
+        '^/robots.txt$': Page("User-agent: *").mime('text/plain').exists(),
+    }, keep_alive=True)
+
+    async def requests():
+        aio = AsyncTransport()
+        try:
+            links = await aio.request(address, extract=True)
+            robots = await aio.request(address + "/robots.txt", extract=False)
+        finally:
+            await aio.close()
+        return links, robots
+
+    links, robots = asyncio.run(requests())
+
+    assert (links.links, links.content) == (["/a", "/b"], b"")
+    assert (robots.links, robots.content) == (None, b"User-agent: *")
+
+
+@pytest.mark.timeout(5)
+def test_read_timeout(server):
+
+    address = server.router({'^/$': Page("").slow().exists()}, keep_alive=True)
+
+    async def request():
+        aio = AsyncTransport(timeout=0.2)
+        try:
+            await aio.request(address)
+        finally:
+            await aio.close()
+
+    with pytest.raises(Timeout):
+        asyncio.run(request())
+
+
+def test_cache_off_loop(server, tmp_path, monkeypatch):
+    """ sqlite cache read (and written) in executor, not by event loop. """
+
+    address = server.router({
+        '^/$': Page("<a href='/link-1'>1</a><a href='/link-2'>2</a>").exists(),
+        '^/link-\d{1,}$': Page("ok").exists(),
+    })
+
+    threads = set()
+    page_of = AsyncCrawler.page_of
+
+    def recorded(self, *args):
+        threads.add(current_thread())
+        return page_of(self, *args)
+
+    monkeypatch.setattr(AsyncCrawler, 'page_of', recorded)
+
+    c = AsyncCrawler(Settings(address, cache=str(tmp_path / "cache.db")))
+    c.start()
+
+    assert len(c.succeed) == 3
+    assert threads and main_thread() not in threads
+
+
+def test_cli_engine(site_with_links):
+
+    args = [site_with_links, '--engine', 'asyncio', '-s', 'none', '--stats']
+    args += ['--no-colors', '--no-progress']
+
+    result = CliRunner().invoke(main, args)
+
+    assert result.exit_code == 0
+    assert "Links Total: 27; Found: 17; Not Found: 2; Ignored: 8; Redirects: 0" in result.output
+    assert "Connections: " in result.output
+
+
+def test_basic_auth(server, monkeypatch):
+    """ user:pass@ of url sent as Authorization header, as requests does. """
+
+    address = server.router({'^/$': Page("").exists()})
+    url = address.replace("://", "://us%40er:p%3Ass@")
+
+    sent = []
+    exchange = AsyncTransport._exchange
+
+    async def recorded(self, connection, method, url, request, extract):
+        sent.append(request.decode('latin-1'))
+        return await exchange(self, connection, method, url, request, extract)
+
+    monkeypatch.setattr(AsyncTransport, '_exchange', recorded)
+
+    async def request():
+        aio = AsyncTransport()
+        try:
+            return await aio.request(url)
+        finally:
+            await aio.close()
+
+    assert asyncio.run(request()).status_code == 200
+
+    expected = Request('GET', url).prepare().headers['Authorization']
+    assert f"Authorization: {expected}\r\n" in sent[0]
+    assert "us%40er" not in sent[0].split("\r\n")[1]
+
+
+@pytest.mark.parametrize('variable', ['HTTP_PROXY', 'https_proxy'])
+def test_refuses_proxies(site_with_links, monkeypatch, variable):
+
+    monkeypatch.setenv(variable, "http://proxy.example.com:3128")
+
+    with pytest.raises(DeadlinksEngine):
+        AsyncCrawler(Settings(site_with_links))
+
+    # threads engine (requests) handles proxies itself.
+    Crawler(Settings(site_with_links))
+
+    result = CliRunner().invoke(main, [site_with_links, '--engine', 'asyncio', '--no-progress'])
+    assert result.exit_code == 2
+    assert "doesn't support proxies" in result.output
@@ -0,0 +1,112 @@
+"""
+tests.components.tests_autoscale.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Automatic workers sizing (`--threads auto`) tests.
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+import pytest
+from click.testing import CliRunner
+
+from deadlinks import AsyncCrawler, Crawler, Settings
+from deadlinks.__main__ import main
+from deadlinks.autoscale import Autoscaler
+
+from .tests_async_crawler import slow_server # pylint: disable-msg=W0611
+
+# -- Tests ---------------------------------------------------------------------
+
+
+def test_grows_while_queued():
+
+    a = Autoscaler(maximum=20, initial=4)
+
+    targets = []
+    for _ in range(5):
+        a.observe(0.1, False)
+        targets.append(a.adjust(queued=100, workers=a.target))
+
+    assert targets == [6, 9, 13, 19, 20]
+
+
+def test_stays_without_work():
+
+    a = Autoscaler(maximum=20, initial=4)
+    a.observe(0.1, False)
+
+    assert a.adjust(queued=0, workers=4) == 4
+
+
+def test_shrinks_on_errors():
+
+    a = Autoscaler(maximum=20, initial=16)
+    for _ in range(4):
+        a.observe(0.1, True)
+    a.observe(0.1, False)
+
+    assert a.adjust(queued=100, workers=16) == 8
+
+
+def test_shrinks_on_latency():
+
+    a = Autoscaler(maximum=20, initial=10)
+    a.observe(0.1, False)
+    assert a.adjust(queued=100, workers=10) == 15
+
+    a.observe(0.5, False)
+    assert a.adjust(queued=100, workers=15) == 14
+
+
+def test_limits():
+
+    a = Autoscaler(maximum=3, minimum=2, initial=10)
+    assert a.target == 3
+
+    a.observe(0.1, True)
+    assert a.adjust(queued=0, workers=3) == 2
+
+    a.observe(0.1, True)
+    assert a.adjust(queued=0, workers=2) == 2
+
+
+def test_concurrency():
+
+    a = Autoscaler(maximum=10)
+    assert a.concurrency() == (4, 4.0)
+
+    a.adjust(queued=0, workers=2)
+    a.adjust(queued=0, workers=6)
+
+    assert a.concurrency() == (6, 4.0)
+
+
+@pytest.mark.timeout(20)
+@pytest.mark.parametrize('engine', [Crawler, AsyncCrawler])
+def test_crawling(slow_server, engine):
+    """ 201 slow pages - much faster than 4 initial workers could do. """
+
+    c = engine(Settings(slow_server, threads="auto", check_robots_txt=False))
+    c.start()
+
+    assert len(c.succeed) == 201
+
+    peak, _ = c.autoscaler.concurrency()
+    assert peak > 4
+    assert c.statistics()['Concurrency'].startswith("peak ")
+
+
+def test_cli_auto(site_with_links):
+
+    args = [site_with_links, '-n', 'auto', '-s', 'none', '--stats']
+    args += ['--no-colors', '--no-progress']
+
+    result = CliRunner().invoke(main, args)
+
+    assert result.exit_code == 0
+    assert "Threads=auto" in result.output
+    assert "Concurrency: peak " in result.output
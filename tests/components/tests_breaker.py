@@ -0,0 +1,225 @@
+"""
+tests.components.tests_breaker.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Per host circuit breaker and negative DNS cache tests.
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+import asyncio
+import socket
+from time import monotonic
+
+import pytest
+import requests
+from click.testing import CliRunner
+from requests.exceptions import SSLError, TooManyRedirects
+
+from deadlinks import (AsyncCrawler, Crawler, DeadlinksSettingsChange,
+                       DeadlinksSettingsHostFailures, Link, Settings)
+from deadlinks.__main__ import main
+from deadlinks.async_request import AsyncTransport
+from deadlinks.breaker import Breaker, unreachable
+
+from ..utils import Page
+
+# -- Tests ---------------------------------------------------------------------
+
+
+def test_breaker():
+
+    b = Breaker(threshold=3)
+
+    b.failed("example.com", "Connection refused")
+    b.failed("example.com", "Connection refused")
+    b.succeeded("example.com")
+    b.failed("example.com", "Connection refused")
+    b.failed("example.com", "Connection refused")
+    assert not b.tripped("example.com")
+    assert b.skipped("example.com") is None
+
+    assert b.failed("example.com", "Connection refused")
+    assert b.tripped("example.com")
+    assert not b.failed("example.com", "Connection refused")
+    assert b.skipped("example.com") == \
+        "Skipped, 3 connection errors in a row: Connection refused"
+
+    # host stays tripped, even if requests in flight succeed.
+    b.succeeded("example.com")
+    b.skipped("example.com")
+    assert b.stats() == {'tripped': ["example.com"], 'skipped': 2}
+
+    # never trips without threshold.
+    b = Breaker(threshold=None)
+    for _ in range(10):
+        b.failed("example.com", "Connection refused")
+    assert not b.tripped("example.com")
+
+
+@pytest.mark.timeout(20)
+@pytest.mark.parametrize('engine', [Crawler, AsyncCrawler])
+def test_tripped(server, engine):
+
+    address = server.router({
+        '^/$': Page("".join(f"<a href='http://127.0.0.1:79/{x}'></a>" for x in range(20))).exists(),
+    })
+
+    c = engine(Settings(address, check_external_urls=True, threads=1))
+    c.start()
+
+    assert len(c.failed) == 20
+
+    messages = [x.message for x in c.failed]
+    skipped = [x for x in messages if x.startswith("Skipped, 5 connection errors in a row: ")]
+    assert len(skipped) == 15
+
+    assert c.statistics()['Tripped'] == "127.0.0.1:79 (15 requests skipped)"
+
+
+@pytest.mark.timeout(20)
+def test_cli(server):
+    """ Tripped hosts reported without --stats. """
+
+    address = server.router({
+        '^/$': Page("".join(f"<a href='http://127.0.0.1:79/{x}'></a>" for x in range(20))).exists(),
+    })
+
+    result = CliRunner().invoke(main, [address, '-e', '-s', 'none', '--no-colors', '--no-progress'])
+
+    assert result.exit_code == 0
+    assert "Tripped: 127.0.0.1:79 (15 requests skipped)" in result.output
+    assert "Connections: " not in result.output
+
+
+@pytest.mark.timeout(20)
+@pytest.mark.parametrize('engine', [Crawler, AsyncCrawler])
+def test_tripped_waiting(server, monkeypatch, engine):
+    """ Urls waiting for the host's turn, fail once it's tripped. """
+
+    address = server.router({
+        '^/$': Page("".join(f"<a href='http://127.0.0.1:79/{x}'></a>" for x in range(20))).exists(),
+    })
+
+    def delay(self, host):
+        return 1.0 if host == "127.0.0.1:79" else 0.0
+
+    monkeypatch.setattr(engine, 'host_delay', delay)
+
+    c = engine(Settings(address, check_external_urls=True, threads=4, check_robots_txt=False))
+
+    started = monotonic()
+    c.start()
+
+    assert len(c.failed) == 20
+    assert c.statistics()['Tripped'] == "127.0.0.1:79 (15 requests skipped)"
+    assert monotonic() - started < 10
+
+
+def test_site_never_trips():
+
+    c = Crawler(Settings("http://example.com", max_host_failures=1))
+
+    for url in ["http://example.com/a", "http://example.org/a"]:
+        link = Link(url)
+        link.message = "Connection refused"
+        link.unreachable = True
+        c.connected(link)
+
+    assert not c.breaker.tripped("example.com")
+    assert c.breaker.tripped("example.org")
+
+
+def test_responding_never_trips():
+    """ Read timeouts, SSL errors and such are errors of the (responding) host. """
+
+    c = Crawler(Settings("http://example.com", max_host_failures=1))
+
+    link = Link("http://example.org/a")
+    link.message = "Read timed out."
+    c.connected(link)
+
+    assert not c.breaker.tripped("example.org")
+
+
+def aio_error(url, **kwargs):
+
+    async def request():
+        aio = AsyncTransport(**kwargs)
+        try:
+            await aio.request(url)
+        finally:
+            await aio.close()
+
+    try:
+        asyncio.run(request())
+    except requests.RequestException as exception:
+        return exception
+
+
+def sync_error(url, **kwargs):
+
+    try:
+        requests.get(url, **kwargs)
+    except requests.RequestException as exception:
+        return exception
+
+
+@pytest.mark.timeout(10)
+@pytest.mark.parametrize('error', [sync_error, aio_error])
+def test_unreachable(server, error):
+
+    assert unreachable(error("http://127.0.0.1:79/"))
+
+    address = server.router({'^/$': Page("").slow().exists()}, keep_alive=True)
+    assert not unreachable(error(address, timeout=0.2))
+
+    assert not unreachable(SSLError("certificate verify failed"))
+    assert not unreachable(TooManyRedirects("Exceeded 30 redirects."))
+
+
+@pytest.mark.timeout(20)
+@pytest.mark.parametrize('engine', [Crawler, AsyncCrawler])
+def test_unresolved(server, monkeypatch, engine):
+    """ Host name that failed to resolve, isn't resolved again. """
+
+    address = server.router({
+        '^/$': Page("".join(f"<a href='http://dead.example/{x}'></a>" for x in range(3))).exists(),
+    })
+
+    lookups = []
+    getaddrinfo = socket.getaddrinfo
+
+    def resolve(host, *args, **kwargs):
+        if host == "dead.example":
+            lookups.append(host)
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return getaddrinfo(host, *args, **kwargs)
+
+    monkeypatch.setattr(socket, 'getaddrinfo', resolve)
+
+    c = engine(Settings(address, check_external_urls=True, threads=1, max_host_failures=0))
+    c.start()
+
+    assert len(c.failed) == 3
+    assert all("Name or service not known" in x.message for x in c.failed)
+    assert lookups == ["dead.example"]
+    assert 'Tripped' not in c.statistics()
+
+
+@pytest.mark.parametrize('value', [-1, "2", True, None])
+def test_settings(value):
+    with pytest.raises(DeadlinksSettingsHostFailures):
+        Settings("http://example.com", max_host_failures=value)
+
+
+def test_settings_change():
+
+    settings = Settings("http://example.com", max_host_failures=0)
+    assert settings.max_host_failures == 0
+
+    with pytest.raises(DeadlinksSettingsChange):
+        settings.max_host_failures = 5
@@ -0,0 +1,217 @@
+"""
+tests.components.tests_cache.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+External URLs checks results cache tests.
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from threading import Thread
+from time import time
+
+import pytest
+from click.testing import CliRunner
+
+from deadlinks import (AsyncCrawler, Crawler, DeadlinksSettingsCache, DeadlinksSettingsChange,
+                       Settings, Status)
+from deadlinks.__main__ import main
+from deadlinks.cache import DEFAULT_NEGATIVE_TTL, Cache, canonical
+
+from ..utils import Page
+
+# -- Tests ---------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    'url, expected',
+    [
+        ("http://example.com", "http://example.com/"),
+        ("HTTP://Example.COM:80/Path?q=1#top", "http://example.com/Path?q=1"),
+        ("https://example.com:443/", "https://example.com/"),
+        ("https://example.com:8443/", "https://example.com:8443/"),
+        ("http://example.com:abc/", "http://example.com:abc/"),
+        ("http://example.com:70000/", "http://example.com:70000/"),
+    ])
+def test_canonical(url, expected):
+    assert canonical(url) == expected
+
+
+def test_ttl(tmp_path, monkeypatch):
+
+    cache = Cache(str(tmp_path / "cache.db"), ttl=100, negative_ttl=10)
+    cache.put("http://example.com/found", Status.FOUND, elapsed=1.5)
+    cache.put("http://example.com/missing", Status.NOT_FOUND, "404", elapsed=0.5)
+    cache.put("http://example.com/moved", Status.REDIRECTION, location="http://example.org/")
+
+    now = time()
+
+    assert cache.get("http://EXAMPLE.com/found#anchor").status == Status.FOUND
+    assert cache.get("http://example.com/missing").message == "404"
+    assert cache.get("http://example.com/moved").location == "http://example.org/"
+    assert cache.get("http://example.com/unknown") is None
+
+    # negative results expire first.
+    monkeypatch.setattr('deadlinks.cache.time', lambda: now + 50)
+    assert cache.get("http://example.com/found") is not None
+    assert cache.get("http://example.com/missing") is None
+
+    monkeypatch.setattr('deadlinks.cache.time', lambda: now + 200)
+    assert cache.get("http://example.com/found") is None
+
+    assert cache.stats() == {
+        'hits': 4,
+        'misses': 3,
+        'saved': 3.5,
+        'revalidated': 0,
+        'not_modified': 0,
+    }
+
+    cache.close()
+    assert cache.get("http://example.com/found") is None
+
+
+def test_pages(tmp_path):
+
+    cache = Cache(str(tmp_path / "cache.db"))
+    assert cache.page("http://example.com/") is None
+
+    cache.put_page("http://example.com/", '"etag"', "", ["/a", "/b"])
+    page = cache.page("http://example.com/#top")
+
+    assert page.links == ["/a", "/b"]
+    assert page.headers() == {'If-None-Match': '"etag"'}
+
+
+def test_shared(tmp_path):
+    """ Few crawlers (own connections) writing same cache file. """
+
+    path = str(tmp_path / "cache.db")
+
+    def writer(number):
+        cache = Cache(path)
+        for idx in range(200):
+            cache.put(f"http://example.com/{number}/{idx}", Status.FOUND)
+        cache.close()
+
+    threads = [Thread(target=writer, args=(n, )) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    cache = Cache(path)
+    for number in range(4):
+        for idx in range(200):
+            assert cache.get(f"http://example.com/{number}/{idx}") is not None
+
+
+@pytest.mark.parametrize(
+    'options',
+    [
+        {'cache': ""},
+        {'cache': 1},
+        {'cache': "/not/existing/directory/cache.db"},
+        {'cache_ttl': -1},
+        {'cache_negative_ttl': "1"},
+    ])
+def test_settings(options):
+    with pytest.raises(DeadlinksSettingsCache):
+        Settings("http://example.com", **options)
+
+
+def test_settings_change():
+
+    settings = Settings("http://example.com", cache_ttl=0)
+    assert (settings.cache_ttl, settings.cache_negative_ttl) == (0, DEFAULT_NEGATIVE_TTL)
+
+    with pytest.raises(DeadlinksSettingsChange):
+        settings.cache_ttl = 1
+
+    with pytest.raises(DeadlinksSettingsChange):
+        settings.cache_negative_ttl = 1
+
+
+@pytest.fixture
+def external_site(servers):
+    site, external = servers
+
+    external_address = external.router({
+        '^/ok$': Page("ok").exists(),
+        '^/moved$': Page("").exists().redirects(pattern='%s/'),
+        '^/moved/$': Page("ok").exists(),
+    })
+
+    links = ["/ok", "/moved", "/missing"]
+    address = site.router({
+        '^/$': Page("".join(f"<a href='{external_address}{x}'></a>" for x in links)).exists(),
+    })
+
+    return address, external
+
+
+@pytest.mark.parametrize('engine', [Crawler, AsyncCrawler])
+def test_crawler(tmp_path, external_site, engine):
+
+    address, external = external_site
+    options = {
+        'check_external_urls': True,
+        'check_robots_txt': False,
+        'cache': str(tmp_path / "cache.db"),
+    }
+
+    c = engine(Settings(address, **options))
+    c.start()
+
+    results = (len(c.succeed), len(c.failed), len(c.redirected))
+    assert results == (3, 1, 1)
+    assert c.statistics()['Cache'].startswith("0 hits, 4 misses")
+
+    # results of the next run are same, even if external site isn't available.
+    external.destroy()
+    external.s.server_close()
+
+    c = engine(Settings(address, **options))
+    c.start()
+
+    assert (len(c.succeed), len(c.failed), len(c.redirected)) == results
+    assert c.failed[0].message == "404"
+    assert c.statistics()['Cache'].startswith("4 hits, 0 misses")
+
+
+@pytest.mark.timeout(20)
+@pytest.mark.parametrize('engine', [Crawler, AsyncCrawler])
+def test_bad_port(tmp_path, server, engine):
+    """ Link with a bad port fails alone, not the whole crawling. """
+
+    address = server.router({
+        '^/$': Page("<a href='http://example.com:abc/'></a><a href='/ok'></a>").exists(),
+        '^/ok$': Page("ok").exists(),
+    })
+
+    c = engine(Settings(address, check_external_urls=True, cache=str(tmp_path / "cache.db")))
+    c.start()
+
+    assert len(c.succeed) == 2
+    assert [x.url() for x in c.failed] == ["http://example.com:abc/"]
+
+
+def test_cli(tmp_path, external_site):
+
+    address, _ = external_site
+
+    args = [address, '-e', '-s', 'none', '--no-colors', '--no-progress']
+    args += ['--skip-robots-checks', '--cache', str(tmp_path / "cache.db")]
+
+    # cache results reported without --stats.
+    result = CliRunner().invoke(main, args)
+    assert result.exit_code == 0
+    assert "Cache: 0 hits, 4 misses" in result.output
+    assert "Connections: " not in result.output
+
+    result = CliRunner().invoke(main, args)
+    assert result.exit_code == 0
+    assert "Cache: 4 hits, 0 misses" in result.output
@@ -0,0 +1,196 @@
+"""
+tests.components.tests_checkpoint.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Crawling state checkpoints and resumed crawling tests.
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+import pytest
+from click.testing import CliRunner
+
+from deadlinks import (AsyncCrawler, Crawler, DeadlinksSettingsChange, DeadlinksSettingsCheckpoint,
+                       Settings, Status)
+from deadlinks.__main__ import main
+from deadlinks.checkpoint import read_checkpoint, write_checkpoint
+
+from ..utils import Page
+
+# -- Tests ---------------------------------------------------------------------
+
+
+@pytest.fixture
+def site(server):
+    return server.router({
+        '^/$': Page("<a href='/a'></a><a href='/b'></a><a href='/private/c'></a>").exists(),
+        '^/a$': Page("<a href='/a/1'></a><a href='/a/2'></a><a href='/missing'></a>").exists(),
+        '^/a/\d$': Page("<a href='/'></a>").exists(),
+        '^/b$': Page("").exists().redirects(pattern='%s/'),
+        '^/b/$': Page("<a href='/a'></a>").exists(),
+        '^/robots.txt$': Page("User-agent: *\nDisallow: /private").exists(),
+    })
+
+
+def results(crawler):
+    return {
+        attr: sorted((x.url(), x.message) for x in getattr(crawler, attr))
+        for attr in ['succeed', 'failed', 'ignored', 'redirected', 'undefined']
+    }
+
+
+@pytest.mark.parametrize('engine', [Crawler, AsyncCrawler])
+def test_resume_interrupted(site, server, tmpdir, engine):
+
+    checkpoint = str(tmpdir.join("checkpoint.gz"))
+
+    full = engine(Settings(site))
+    full.start()
+
+    # crawling interrupted after 3 urls checked.
+    c = Crawler(Settings(site, checkpoint=checkpoint))
+    for _ in range(3):
+        url = c.frontier.get()
+        c.update(url)
+        c.frontier.task_done()
+    c.save()
+
+    state = read_checkpoint(checkpoint)
+    assert len([x for x in state['index'] if x[1] != Status.UNDEFINED.value]) == 3
+
+    c = engine(Settings(site, checkpoint=checkpoint, resume=True))
+    assert c.resumed == 3
+    assert c.robots[c.settings.base.domain].state is not None
+    c.start()
+
+    assert results(c) == results(full)
+    assert c.statistics()['Resumed'] == "3 links checked before"
+
+    referrers = {x.url(): sorted(x.get_referrers()) for x in c.index}
+    assert referrers == {x.url(): sorted(x.get_referrers()) for x in full.index}
+
+    # finished crawling resumed without requests.
+    server.destroy()
+    server.s.server_close()
+
+    c = engine(Settings(site, checkpoint=checkpoint, resume=True))
+    c.start()
+
+    assert results(c) == results(full)
+
+
+@pytest.mark.parametrize('engine', [Crawler, AsyncCrawler])
+def test_resume_internal(tmpdir, engine):
+    """ Only urls of Document Root are masked, external ones kept as they are. """
+
+    root = tmpdir.mkdir("html")
+    root.join("index.html").write("<a href='/a.html'></a>"
+                                  "<a href='https://example.com/internal-tools'></a>")
+    root.join("a.html").write("<a href='https://example.com/internal-tools'></a>")
+
+    checkpoint = str(tmpdir.join("checkpoint.gz"))
+    options = {'root': str(root), 'http_server': True, 'checkpoint': checkpoint}
+
+    # crawling interrupted after index page checked.
+    c = Crawler(Settings("http://internal/", **options))
+    url = c.frontier.get()
+    c.update(url)
+    c.frontier.task_done()
+    c.save()
+
+    external = "https://example.com/internal-tools"
+    urls = {x[0] for x in read_checkpoint(checkpoint)['index']}
+    assert external in urls
+    assert all(x.startswith("http://internal/") for x in urls - {external})
+
+    c = engine(Settings("http://internal/", resume=True, **options))
+    c.start()
+
+    assert c.resumed == 1
+    assert [x.url() for x in c.ignored] == [external]
+    assert len(c.succeed) == 2 and not c.failed
+    assert c.internal(c.ignored) == c.ignored
+
+
+def test_periodic_checkpoints(server, tmpdir):
+
+    site = server.router({
+        '^/$': Page("".join(f"<a href='/{x}'></a>" for x in range(4))).exists(),
+        '^/\d$': Page("").slow().exists(),
+    })
+
+    checkpoint = str(tmpdir.join("checkpoint.gz"))
+    c = Crawler(Settings(site, checkpoint=checkpoint, checkpoint_interval=1))
+
+    saves = []
+    save = c.save
+    c.save = lambda: saves.append(save())
+    c.start()
+
+    # periodic checkpoints and final one.
+    assert len(saves) > 1
+    assert all(x[1] == Status.FOUND.value for x in read_checkpoint(checkpoint)['index'])
+
+
+def test_resume_without_checkpoint(site, tmpdir):
+
+    checkpoint = str(tmpdir.join("checkpoint.gz"))
+
+    c = Crawler(Settings(site, checkpoint=checkpoint, resume=True))
+    assert c.resumed == 0
+    c.start()
+
+    assert read_checkpoint(checkpoint)['base'] == site
+
+
+@pytest.mark.parametrize(
+    'options',
+    [
+        {'resume': True},
+        {'checkpoint': ""},
+        {'checkpoint': "/not/existing/directory/checkpoint.gz"},
+        {'checkpoint_interval': 0},
+        {'checkpoint_interval': "1"},
+    ])
+def test_settings(options):
+    with pytest.raises(DeadlinksSettingsCheckpoint):
+        Settings("http://example.com", **options)
+
+
+def test_settings_change():
+
+    settings = Settings("http://example.com", checkpoint_interval=5)
+    assert settings.checkpoint_interval == 5
+
+    with pytest.raises(DeadlinksSettingsChange):
+        settings.checkpoint_interval = 10
+
+
+def test_bad_checkpoint(tmpdir):
+
+    checkpoint = tmpdir.join("checkpoint.gz")
+    checkpoint.write("not a checkpoint")
+
+    with pytest.raises(DeadlinksSettingsCheckpoint):
+        Crawler(Settings("http://example.com", checkpoint=str(checkpoint), resume=True))
+
+    write_checkpoint(str(checkpoint), {'base': "http://example.org", 'index': [], 'robots': {}})
+    with pytest.raises(DeadlinksSettingsCheckpoint):
+        Crawler(Settings("http://example.com", checkpoint=str(checkpoint), resume=True))
+
+
+def test_cli(site, tmpdir):
+
+    args = [site, '-s', 'none', '--stats', '--no-colors', '--no-progress']
+    args += ['--checkpoint', str(tmpdir.join("checkpoint.gz")), '--resume']
+
+    result = CliRunner().invoke(main, args)
+    assert result.exit_code == 0
+    assert "Resumed:" not in result.output
+
+    result = CliRunner().invoke(main, args)
+    assert result.exit_code == 0
+    assert "Resumed: 9 links checked before" in result.output
@@ -12,10 +12,14 @@ long as testing currently implemented things.
 
 # -- Imports -------------------------------------------------------------------
 
+from collections import Counter
+from time import time
+
 import pytest
 from flaky import flaky
 
-from deadlinks import Crawler, DeadlinksIgnoredURL, DeadlinksSettingsBase, Settings
+from deadlinks import (AsyncCrawler, Crawler, DeadlinksIgnoredURL, DeadlinksSettingsBase,
+                       Settings)
 
 from ..utils import Page
 
@@ -162,6 +166,31 @@ def test_crawling_retry(server, unlocked_after, do_retries, fails):
     assert len(c.failed) == fails
 
 
+@pytest.mark.timeout(20)
+@pytest.mark.parametrize('engine', [Crawler, AsyncCrawler])
+def test_crawling_retry_not_blocking(server, engine):
+    """ Worker checks other links, while failed one waits for the retry. """
+
+    slow = "".join(f"<a href='/slow-{x}'></a>" for x in range(4))
+    address = server.router({
+        '^/$': Page("<a href='/flaky'></a>" + slow).exists(),
+        '^/flaky$': Page("ok").exists().unlock_after(2),
+        '^/slow-\d$': Page("ok").slow().exists(),
+    })
+
+    c = engine(Settings(address, threads=1, retry=3))
+
+    started = time()
+    c.start()
+
+    assert len(c.succeed) == 6
+    assert c.statistics()['Retried'] == "1 urls, 2 retries"
+
+    # slow pages (1 second each) checked during 2 seconds backoff of the
+    # second retry, not after it.
+    assert time() - started < 5
+
+
 @pytest.mark.parametrize(
     'url',
     [
@@ -367,3 +396,49 @@ def test_within_site_root(server):
         c.start()
 
         assert len(c.ignored) == 0
+
+
+def test_links_released(server):
+    """ Checked pages don't keep links found at them. """
+
+    address = server.router({
+        '^/$': Page("<a href='/link-1'>1</a><a href='/link-2'>2</a>").exists(),
+        '^/link-\d{1,}$': Page("<a href='/link-1'>1</a>").exists(),
+    })
+
+    c = Crawler(Settings(address))
+    c.start()
+
+    assert len(c.succeed) == 3
+    assert all(not link.links for link in c.index.succeed())
+
+
+@pytest.fixture
+def dense_site(server):
+    """ Every page links to every other page. """
+
+    page = "".join(f"<a href='/page-{x}'>{x}</a>" for x in range(100))
+    return server.router({'.*': Page(page).mime('text/html').exists()}, keep_alive=True)
+
+
+@pytest.mark.timeout(60)
+@pytest.mark.parametrize('engine', [Crawler, AsyncCrawler])
+def test_single_request_per_url(server, dense_site, engine):
+    """ Concurrent workers discovering same urls request each of them once. """
+
+    address, pages = dense_site + "/", 100
+
+    c = engine(Settings(address, threads=50, check_robots_txt=False))
+    c.start()
+
+    requests = Counter(path for _, path, _ in server.requests)
+    assert len(c.succeed) == pages + 1
+    assert set(requests.values()) == {1}
+    assert len(requests) == pages + 1
+
+    # links found at all pages, but the first discovery of every page.
+    assert c.index.duplicates() == (pages + 1) * pages - pages
+    assert c.statistics()['Duplicates'] == f"{c.index.duplicates()} requests avoided"
+
+    # all discoverers are recorded as referrers.
+    assert all(len(link.get_referrers()) == pages + 1 for link in c.index if link.url() != address)
@@ -0,0 +1,124 @@
+"""
+tests.components.tests_extractor.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Incremental links extractor tests.
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+import pytest
+
+from deadlinks.extractor import (__RE_LINKS__, LinksExtractor, encoding_of, extract, href,
+                                 iter_text, links_of)
+
+# -- Tests ---------------------------------------------------------------------
+
+pages = [
+    "<a href='/link'>link</a>",
+    "<html><body><a href=\"/a\">a</a> <a href='/b#top'>b</a><a href=/c>c</a></body></html>",
+    "<a  href='/double-space'>x</a><a\nhref='/new-line'>y</a><A href='/upper'>z</A>",
+    "<a >empty</a><a href=''>empty</a><a name='anchor'>no href</a><a href='/>'>gt</a>",
+    "<a title='x<y' href='/lt'>lt</a><<a href='/after-lt'>a</a><a href='/unquoted>",
+    "<a href='/li\nnk'>nl</a><a href='/amp?a=1&amp;b=2'>amp</a><a href='/a'>dup</a>",
+    "text without links < and > signs <a",
+]
+
+
+def reference(text):
+    """ Whole text scanned with regular expression. """
+    links = [href(attrs) for attrs in __RE_LINKS__.findall(text)]
+    return list(dict.fromkeys(link for link in links if link is not None))
+
+
+@pytest.mark.parametrize('page', pages)
+def test_same_as_whole_text(page):
+
+    expected = reference(page)
+
+    # every possible split into two and one char chunks.
+    for pos in range(len(page) + 1):
+        assert extract([page[:pos], page[pos:]]) == expected
+
+    assert extract(list(page)) == expected
+
+
+@pytest.mark.parametrize('page', pages)
+def test_bytes_same_as_whole_text(page):
+
+    expected = reference(page)
+    content = page.encode()
+
+    for pos in range(len(content) + 1):
+        assert extract([content[:pos], content[pos:]]) == expected
+
+
+def test_tail_is_small():
+    """ Only possible beginning of the tag kept between chunks. """
+
+    extractor = LinksExtractor()
+    extractor.feed("x" * 100000 + "<a href='/link'>link</a>" + "x" * 100000 + "<a hr")
+
+    assert extractor.links == ["/link"]
+    assert extractor._tail == "<a hr"
+
+    extractor.feed("ef='/next'>")
+    assert extractor.links == ["/link", "/next"]
+    assert not extractor._tail
+
+
+class Response:
+
+    def __init__(self, content, content_type="text/html"):
+        self.content = content
+        self.headers = {'content-type': content_type}
+
+    def iter_content(self, chunk_size):
+        for pos in range(0, len(self.content), 3):
+            yield self.content[pos:pos + 3]
+
+
+@pytest.mark.parametrize('encoding', ['utf-8', 'cp1251', 'utf-16'])
+def test_iter_text(encoding):
+    """ Multibyte characters split between chunks. """
+
+    text = "<a href='/привіт'>привіт</a>"
+    content = text.encode(encoding)
+    chunks = Response(content).iter_content(3)
+
+    assert "".join(iter_text(chunks, encoding)) == text
+
+
+@pytest.mark.parametrize(
+    'content_type, head, encoding',
+    [
+        ("text/html", b"<html>", "utf-8"),
+        ("text/html; charset=windows-1251", b"<html>", "cp1251"),
+        ("text/html; charset=\"KOI8-U\"", b"<html>", "koi8-u"),
+        ("text/html; charset=unknown", b"<html>", "utf-8"),
+        ("text/html", b"<meta charset=\"cp1251\">", "cp1251"),
+        ("text/html", b"<meta http-equiv='Content-Type' content='text/html; charset=koi8-r'>",
+         "koi8-r"),
+        ("text/html; charset=utf-8", b"<meta charset='cp1251'>", "utf-8"),
+        ("text/html; charset=cp1251", b"\xef\xbb\xbf<html>", "utf-8"),
+        ("text/html", b"\xff\xfe<\x00", "utf-16"),
+    ])
+def test_encoding_of(content_type, head, encoding):
+    assert encoding_of({'content-type': content_type}, head) == encoding
+
+
+@pytest.mark.parametrize('encoding', ['utf-8', 'cp1251', 'koi8-u', 'utf-16'])
+@pytest.mark.parametrize('declared', ['header', 'meta'])
+def test_links_of(encoding, declared):
+
+    page = "<meta charset='{}'><a href='/привіт'>привіт</a><a href='/a'>a</a>".format(encoding)
+    content_type = "text/html"
+    if declared == 'header':
+        page = page.replace("<meta charset='{}'>".format(encoding), "")
+        content_type += "; charset=" + encoding
+
+    response = Response(page.encode(encoding), content_type)
+    assert links_of(response) == ["/привіт", "/a"]
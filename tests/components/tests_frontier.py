@@ -0,0 +1,162 @@
+"""
+tests.components.tests_frontier.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Frontier (links waiting to be checked) tests.
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from threading import Thread
+from time import monotonic, sleep, time
+
+import pytest
+
+from deadlinks import Link
+from deadlinks.frontier import Frontier
+
+# -- Tests ---------------------------------------------------------------------
+
+
+def test_complete_when_empty():
+
+    f = Frontier()
+    assert f.complete
+    assert f.get() is None
+
+    f.join()
+
+
+def test_order():
+
+    f = Frontier()
+    for path in ["a", "b", "c"]:
+        f.put(Link("http://example.com/" + path))
+
+    assert f.qsize() == 3
+    assert [f.get().url() for _ in range(3)] == [
+        "http://example.com/a",
+        "http://example.com/b",
+        "http://example.com/c",
+    ]
+    assert f.empty()
+
+
+@pytest.mark.timeout(5)
+def test_waits_for_in_flight():
+    """ Worker waits while link in flight can bring more links. """
+
+    f = Frontier()
+    f.put(Link("http://example.com/"))
+    assert f.get() is not None
+
+    got = []
+    waiter = Thread(target=lambda: got.append(f.get()))
+    waiter.start()
+
+    sleep(0.1)
+    assert not got
+
+    f.put(Link("http://example.com/found"))
+    f.task_done()
+    waiter.join()
+
+    assert got[0].url() == "http://example.com/found"
+    assert not f.complete
+
+    f.task_done()
+    assert f.complete
+
+
+@pytest.mark.timeout(5)
+def test_completion_wakes_everyone():
+
+    f = Frontier()
+    f.put(Link("http://example.com/"))
+    f.get()
+
+    results = []
+    waiters = [Thread(target=lambda: results.append(f.get())) for _ in range(5)]
+    for waiter in waiters:
+        waiter.start()
+
+    started = time()
+    f.task_done()
+    for waiter in waiters:
+        waiter.join()
+    f.join()
+
+    assert results == [None] * 5
+    assert time() - started < 1
+
+
+@pytest.mark.timeout(5)
+def test_close():
+
+    f = Frontier()
+    f.put(Link("http://example.com/"))
+    f.put(Link("http://example.com/next"))
+    f.get()
+
+    waiter = Thread(target=f.join)
+    waiter.start()
+
+    f.close()
+    waiter.join()
+
+    assert f.complete
+    assert f.get() is None
+
+
+@pytest.mark.timeout(5)
+def test_schedule():
+
+    f = Frontier()
+    f.put(Link("http://example.com/"))
+    f.put(Link("http://example.com/next"))
+
+    # failed link checked again later, while others aren't waiting for it.
+    failed = f.get()
+    f.schedule(failed, monotonic() + 0.3)
+    f.task_done(failed)
+    assert not f.complete
+
+    started = monotonic()
+    link = f.get()
+    assert link.url() == "http://example.com/next"
+    f.task_done(link)
+
+    link = f.get()
+    assert link.url() == "http://example.com/"
+    assert monotonic() - started >= 0.25
+    f.task_done(link)
+
+    assert f.complete
+    assert f.get() is None
+
+
+def test_drop():
+
+    f = Frontier()
+    for url in ["http://example.com/a", "http://example.org/a", "http://example.com/b"]:
+        f.put(Link(url))
+
+    failed = f.get()
+    f.schedule(failed, monotonic() + 60)
+    f.task_done(failed)
+
+    assert [x.url() for x in f.drop("example.com")] == [
+        "http://example.com/b",
+        "http://example.com/a",
+    ]
+    assert f.drop("example.com") == []
+    assert f.qsize() == 1
+
+    link = f.get()
+    assert link.url() == "http://example.org/a"
+    f.task_done(link)
+
+    assert f.complete
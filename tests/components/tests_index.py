@@ -10,6 +10,7 @@ Test(s) for Index (collection of the links) object.
 
 # -- Imports -------------------------------------------------------------------
 
+from threading import Thread
 from typing import List
 
 from deadlinks import Index, Link, Status
@@ -45,3 +46,92 @@ def test_index():
         assert link in index # __contains__
 
     index.update(Link("http://google.fr"), Status.UNDEFINED, "no idea")
+
+
+def test_claim():
+    index = Index()
+
+    first, claimed = index.claim(Link("https://google.com"), "https://example.com/a")
+    assert claimed
+
+    second, claimed = index.claim(Link("https://google.com"), "https://example.com/b")
+    assert not claimed
+    assert second is first
+
+    assert first.get_referrers() == ["https://example.com/a", "https://example.com/b"]
+    assert index.duplicates() == 1
+
+
+def test_stats():
+    index = Index()
+    link = Link("https://google.com")
+    index.put(link)
+
+    index.update(link, Status.REDIRECTION, "")
+    index.update(link, Status.FOUND, "")
+    index.update(Link("https://google.de"), Status.FOUND, "")
+
+    # number of links with status, not number of updates.
+    assert index.get_stats() == {
+        Status.FOUND: 1,
+        Status.NOT_FOUND: 0,
+        Status.IGNORED: 0,
+        Status.REDIRECTION: 0,
+    }
+
+
+def test_concurrent():
+    """ Counters and claims are exact with many concurrent workers. """
+
+    index = Index()
+    urls = [f"https://example.com/{x}" for x in range(1000)]
+    claimed = []
+
+    def worker():
+        for url in urls:
+            link, is_claimed = index.claim(Link(url), "https://example.com/")
+            if is_claimed:
+                claimed.append(url)
+                index.update(link, Status.FOUND, "")
+
+    threads = [Thread(target=worker) for _ in range(64)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == sorted(urls)
+    assert len(index) == len(urls)
+    assert index.get_stats()[Status.FOUND] == len(urls)
+    assert index.duplicates() == len(urls) * 63
+    assert len(index.succeed()) == len(urls)
+    assert index.undefined() == []
+
+
+def test_views():
+    """ Filtered views are sorted, and follow status changes. """
+
+    index = Index()
+    urls = ["https://google.es/b", "http://google.de", "https://google.es/a", "https://google.com"]
+    for url in urls:
+        index.put(Link(url))
+
+    assert [x.url() for x in index.undefined()] == sorted(urls, key=lambda x: Link(x).sort_key())
+    assert index.undefined() == sorted(Link(x) for x in urls)
+
+    index.update(Link("https://google.es/a"), Status.FOUND, "")
+    index.update(Link("https://google.com"), Status.FOUND, "")
+
+    succeed = index.succeed()
+    assert [x.url() for x in succeed] == ["https://google.com", "https://google.es/a"]
+
+    # cached view can't be spoiled by the caller.
+    succeed.clear()
+    assert len(index.succeed()) == 2
+
+    index.update(Link("https://google.com"), Status.NOT_FOUND, "404")
+    assert [x.url() for x in index.succeed()] == ["https://google.es/a"]
+    assert [x.url() for x in index.failed()] == ["https://google.com"]
+    assert index.failed()[0].message == "404"
+    assert [x.url() for x in index.undefined()] == ["http://google.de", "https://google.es/b"]
+    assert [x.url() for x in index.all()] == ["https://google.com", "https://google.es/a"]
@@ -0,0 +1,129 @@
+"""
+tests.components.tests_limiter.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Adaptive rate limiting (429, 503 with Retry-After) tests.
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from email.utils import formatdate
+from time import monotonic, time
+
+import pytest
+
+from deadlinks import AsyncCrawler, Crawler, Settings
+from deadlinks.limiter import Limiter, retry_after
+
+from ..utils import Page
+
+# -- Tests ---------------------------------------------------------------------
+
+
+def limited(server, status=429, retry_after="1", failures=1):
+    """ Site with 8 pages, first `failures` requests of every page (and
+        site) rate limited. """
+
+    headers = {'Retry-After': retry_after} if retry_after is not None else {}
+
+    def page(content):
+        return Page(content).slow(0.01).mime('text/html').exists().unlock_after(
+            failures, status, headers)
+
+    return server.router({
+        '^/$': page("".join(f"<a href='/{x}'></a>" for x in range(8))),
+        '^/\d+$': page(""),
+    }, keep_alive=True) + "/"
+
+
+def requests(server):
+    """ (moment, path, status) of the requests, but robots.txt. """
+    return [x for x in server.requests if x[1] != "/robots.txt"]
+
+
+def test_retry_after():
+
+    assert retry_after("3") == 3.0
+    assert retry_after(" 120 ") == 120.0
+    assert 9 < retry_after(formatdate(time() + 10, usegmt=True)) <= 10
+    assert retry_after(formatdate(time() - 10, usegmt=True)) == 0.0
+    assert retry_after("") is None
+    assert retry_after("soon") is None
+
+
+def test_aimd():
+
+    l = Limiter(workers=10, deferrals=2)
+    assert l.limit("example.com", 8) == 8
+
+    # multiplicative decrease, host paused.
+    assert l.throttled("http://example.com/a", "example.com", 8, 5.0) > monotonic() + 4
+    assert l.limit("example.com", 8) == 4
+    assert l.paused("example.com") > monotonic() + 4
+
+    # responses to requests sent before host was paused.
+    l.throttled("http://example.com/b", "example.com", 8, 5.0)
+    assert l.limit("example.com", 8) == 4
+    assert 4.9 < l.stats()['backoff'] < 5.1
+
+    # hosts without limit, start from number of workers.
+    l.throttled("http://example.org/", "example.org", None, 0.0)
+    assert l.limit("example.org", None) == 5
+    l.throttled("http://example.org/a", "example.org", None, 0.0)
+    assert l.limit("example.org", None) == 2
+
+    # additive increase, back to the configured limit.
+    limits = []
+    for _ in range(30):
+        l.succeeded("example.com", 8)
+        limits.append(l.limit("example.com", 8))
+    assert limits[:5] == [4, 4, 4, 4, 5]
+    assert limits[-1] == 8
+    assert l.stats()['deferred'] == 4
+
+    l.throttled("http://example.com/a", "example.com", 8, 0.0)
+    assert l.throttled("http://example.com/a", "example.com", 8, 0.0) is None
+
+
+@pytest.mark.timeout(30)
+@pytest.mark.parametrize('engine', [Crawler, AsyncCrawler])
+@pytest.mark.parametrize('status', [429, 503])
+def test_deferred(server, engine, status):
+
+    c = engine(Settings(limited(server, status), threads=10))
+    c.start()
+
+    assert len(c.succeed) == 9
+    assert not c.failed
+    assert c.statistics()['Deferred'].startswith("9 urls, ")
+
+    # host wasn't requested while it was paused (but requests in flight).
+    moments = [moment for moment, _, _ in requests(server)]
+    for paused, _, _ in (x for x in requests(server) if x[2] == status):
+        assert not [x for x in moments if paused + 0.1 < x < paused + 0.9]
+
+
+@pytest.mark.timeout(30)
+@pytest.mark.parametrize('engine', [Crawler, AsyncCrawler])
+def test_deferred_too_many_times(server, engine):
+
+    c = engine(Settings(limited(server, retry_after="0", failures=100), threads=10))
+    c.start()
+
+    assert len(c.failed) == 1
+    assert c.failed[0].message == "429"
+    assert len(requests(server)) == 6
+
+
+@pytest.mark.timeout(30)
+def test_unavailable_without_retry_after(server):
+    """ 503 without Retry-After isn't rate limiting (it's retried instead). """
+
+    c = Crawler(Settings(limited(server, 503, retry_after=None), threads=10))
+    c.start()
+
+    assert len(c.failed) == 1
+    assert 'Deferred' not in c.statistics()
@@ -16,6 +16,7 @@ import pytest
 
 from deadlinks import URL, Link
 from deadlinks.exceptions import DeadlinksIgnoredURL, DeadlinksRedirectionURL
+from deadlinks.matcher import Matcher
 from deadlinks.status import Status
 
 from ..utils import Page
@@ -169,8 +170,8 @@ def ignore_pathes():
 def test_ignored(ignore_domains, ignore_pathes, url):
     """ Ignored domains and pathes matching. """
 
-    assert Link(url).match_domains(ignore_domains)
-    assert Link(url).match_pathes(ignore_pathes)
+    assert Matcher(ignore_domains).match(Link(url).domain)
+    assert Matcher(ignore_pathes).match(Link(url).path)
 
 
 @pytest.mark.parametrize("url", [
@@ -204,12 +205,29 @@ def test_referrer():
     assert referrer in link.get_referrers()
 
 
+def test_compact():
+    """ Links have no `__dict__`, and share hosts and referrers strings. """
+
+    first, second = Link("https://made.ua/a"), Link("https://made.ua/b?c=d#e")
+    assert not hasattr(first, '__dict__')
+
+    assert (first.scheme, first.domain, first.path) == ("https", "made.ua", "/a")
+    assert (second.path, second.url()) == ("/b", "https://made.ua/b?c=d#e")
+    assert first.domain is second.domain
+    assert first.get_referrers() == [] and first.links == []
+
+    # referrer (built from parts) kept once.
+    first.add_referrer("https://example.com/" + "page")
+    second.add_referrer("https://example.com/" + "page")
+    assert first.get_referrers()[0] is second.get_referrers()[0]
+
+
 def test_match_domain():
     """ Domain matching. """
 
     link = Link("https://made.ua")
-    assert link.match_domains(["made.ua"])
-    assert not link.match_domains(["example.com"])
+    assert Matcher(["made.ua"]).match(link.domain)
+    assert not Matcher(["example.com"]).match(link.domain)
 
 
 @pytest.mark.timeout(2)
@@ -308,6 +326,21 @@ def test_not_available_page():
     assert "Failed to establish a new connection" in link.message
 
 
+def test_links_unique(server):
+    """ links extracted once, in order of appearance. """
+
+    address = server.router({
+        '^/$': Page("<a href='/b'>b</a><a href='/a'>a</a><a href='/b#top'>b</a>").exists(),
+    })
+
+    link = Link(address)
+    assert link.exists()
+    assert link.links == ["/b", "/a"]
+
+    link.release()
+    assert link.links == []
+
+
 def test_link_nl(server):
     """ browsers ignore new line in links so should do that too. """
 
@@ -0,0 +1,140 @@
+"""
+tests.components.tests_politeness.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Per host limits (concurrent requests and Crawl-delay) and fairness tests.
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+from threading import Thread
+from time import monotonic, sleep
+
+import pytest
+
+from deadlinks import AsyncCrawler, Crawler, DeadlinksSettingsPerHost, Link, Settings
+from deadlinks.frontier import Frontier
+
+from ..utils import Page, Server
+
+# -- Tests ---------------------------------------------------------------------
+
+
+def requested(server):
+    """ Moments pages (but robots.txt) of the host were requested at. """
+    return sorted(moment for moment, path, _ in server.requests if path != "/robots.txt")
+
+
+@pytest.fixture
+def hosts():
+    """ Site (first host) linking to 20 pages on each of the other 3 hosts. """
+
+    servers = [Server() for _ in range(5)]
+    site, *external, slow = servers
+
+    for s in external:
+        s.router({'^/\d+$': Page("").slow(0.05).mime('text/html').exists()}, keep_alive=True)
+
+    slow.router({
+        '^/\d+$': Page("").slow(0.05).mime('text/html').exists(),
+        '^/robots.txt$': Page("User-agent: *\nCrawl-delay: 1\n").mime('text/plain').exists(),
+    }, keep_alive=True)
+
+    page = "".join(f"<a href='{h}/{x}'></a>" for h in external for x in range(20))
+    page += "".join(f"<a href='{slow}/{x}'></a>" for x in range(4))
+    site.router({'^/$': Page(page).mime('text/html').exists()}, keep_alive=True)
+
+    yield site, external, slow
+
+    for s in servers:
+        s.destroy()
+
+
+@pytest.mark.timeout(60)
+@pytest.mark.parametrize('engine', [Crawler, AsyncCrawler])
+def test_per_host_limits(hosts, engine):
+
+    site, external, slow = hosts
+
+    c = engine(Settings(f"{site}/", threads=10, check_external_urls=True, max_per_host=2))
+    c.start()
+
+    assert len(c.succeed) == 1 + 20 * 3 + 4
+    assert all(h.max_active <= 2 for h in external + [slow])
+
+    # Crawl-delay is known once robots.txt is requested (with first url).
+    moments = requested(slow)
+    assert moments[-1] - moments[-2] >= 0.9
+
+
+@pytest.mark.timeout(60)
+def test_fairness(hosts):
+    """ Hosts take turns, instead of waiting for the links queued before. """
+
+    site, external, _ = hosts
+
+    c = Crawler(Settings(f"{site}/", threads=6, check_external_urls=True, max_per_host=2))
+    c.start()
+
+    # last host (its links queued last) requested before first one is done.
+    assert requested(external[-1])[0] < requested(external[0])[-1]
+    assert all(h.max_active == 2 for h in external)
+
+
+def test_frontier_round_robin():
+
+    f = Frontier()
+    for host in ["a", "b", "c"]:
+        for x in range(3):
+            f.put(Link(f"http://{host}.com/{x}"))
+
+    assert [f.get().domain for _ in range(6)] == ["a.com", "b.com", "c.com"] * 2
+    assert f.qsize() == 3
+
+
+@pytest.mark.timeout(5)
+def test_frontier_limit():
+
+    f = Frontier(limit=lambda host: 1)
+    f.put(Link("http://a.com/1"))
+    f.put(Link("http://a.com/2"))
+    f.put(Link("http://b.com/1"))
+
+    a = f.get()
+    assert f.get().domain == "b.com"
+
+    got = []
+    waiter = Thread(target=lambda: got.append(f.get()))
+    waiter.start()
+
+    sleep(0.1)
+    assert not got
+
+    f.task_done(a)
+    waiter.join()
+
+    assert got[0].url() == "http://a.com/2"
+
+
+@pytest.mark.timeout(5)
+def test_frontier_delay():
+
+    f = Frontier(delay=lambda host: 0.3)
+    f.put(Link("http://a.com/1"))
+    f.put(Link("http://a.com/2"))
+
+    started = monotonic()
+    f.task_done(f.get())
+    f.task_done(f.get())
+
+    assert monotonic() - started >= 0.3
+    assert f.complete
+
+
+@pytest.mark.parametrize('value', [0, "2", True])
+def test_settings(value):
+    with pytest.raises(DeadlinksSettingsPerHost):
+        Settings("http://example.com", max_per_host=value)
@@ -0,0 +1,93 @@
+"""
+tests.components.tests_referrers.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Referrers (pages links found at) tracking and reporting tests.
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+import pytest
+from click.testing import CliRunner
+
+from deadlinks import Crawler, DeadlinksSettingsReferrers, Link, Settings
+from deadlinks.__main__ import main
+
+from ..utils import Page
+
+# -- Tests ---------------------------------------------------------------------
+
+
+@pytest.fixture
+def site(server):
+    menu = "<a href='/'></a><a href='/missing'></a>"
+    pages = "".join(f"<a href='/{x}'></a>" for x in range(10))
+    return server.router({
+        '^/$': Page(menu + pages).exists(),
+        '^/\d$': Page(menu).exists(),
+    })
+
+
+def test_referrers():
+    link = Link("https://example.com/logo")
+    for page in range(1000):
+        link.add_referrer(f"https://example.com/{page}")
+        link.add_referrer(f"https://example.com/{page}")
+
+    assert link.referred == 1000
+    assert link.get_referrers()[:2] == ["https://example.com/0", "https://example.com/1"]
+
+
+def test_limit():
+    link = Link("https://example.com/logo")
+    for page in range(10):
+        link.add_referrer(f"https://example.com/{page}", 3)
+
+    assert link.referred == 10
+    assert link.get_referrers() == [f"https://example.com/{x}" for x in range(3)]
+
+
+def test_crawling(site):
+
+    c = Crawler(Settings(site, max_referrers=3))
+    c.start()
+
+    # missing page found at base url, "/" and 10 pages.
+    missing, = c.failed
+    referrers, referred = c.referrers(missing)
+    assert len(referrers) == 3
+    assert referred == 12
+
+    c = Crawler(Settings(site))
+    c.start()
+
+    referrers, referred = c.referrers(c.failed[0])
+    assert len(referrers) == referred == 12
+    assert c.referrers(Link(site + "not-indexed")) == ([], 0)
+
+
+@pytest.mark.parametrize('value', [0, -1, "1", True])
+def test_settings(value):
+    with pytest.raises(DeadlinksSettingsReferrers):
+        Settings("http://example.com", max_referrers=value)
+
+
+def test_cli(site):
+
+    args = [site, '-s', 'failed', '--no-colors', '--no-progress', '--show-referrers']
+
+    result = CliRunner().invoke(main, args + ['--max-referrers', '2'])
+    assert result.exit_code == 0
+
+    lines = result.output.splitlines()
+    failed = lines.index(f"[ failed ] {site}/missing")
+    assert lines[failed + 1] == f"    <- {site}"
+    assert lines[failed + 3] == "    <- ... and 10 more"
+
+    result = CliRunner().invoke(main, args)
+    assert result.exit_code == 0
+    assert "more" not in result.output
+    assert result.output.count("    <- ") == 12
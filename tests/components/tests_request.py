@@ -0,0 +1,66 @@
+"""
+tests.components.tests_request.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Test(s) for shared transport (keep-alive connections).
+
+:copyright: (c) 2019 by Oleg Butuzov.
+:license:   Apache2, see LICENSE for more details.
+"""
+
+# -- Imports -------------------------------------------------------------------
+
+import pytest
+
+from deadlinks import Crawler, Link, Settings
+from deadlinks.request import Transport
+
+from ..utils import Page
+
+# -- Tests ---------------------------------------------------------------------
+
+
+@pytest.fixture
+def keep_alive_server(server):
+    page = Page("<a href='/'>index</a>").mime('text/html').exists()
+    return server.router({'.*': page}, keep_alive=True) + "/"
+
+
+def test_transport_reuse(keep_alive_server):
+
+    transport = Transport()
+    for is_external in [False, True, False, True, False]:
+        assert transport.request(keep_alive_server, is_external).status_code == 200
+
+    assert transport.stats() == {'opened': 1, 'reused': 4}
+
+
+def test_transport_shared_by_links(keep_alive_server):
+
+    transport = Transport()
+    for path in ["", "a", "b"]:
+        assert Link(keep_alive_server + path).exists(transport=transport)
+
+    assert transport.stats() == {'opened': 1, 'reused': 2}
+
+
+def test_transport_no_keep_alive(server):
+    """ HTTP/1.0 server closes connection after each response. """
+
+    address = server.router({'.*': Page("ok").exists()})
+
+    transport = Transport()
+    for _ in range(3):
+        transport.request(address)
+
+    assert transport.stats() == {'opened': 3, 'reused': 0}
+
+
+def test_crawler_statistics(keep_alive_server):
+
+    c = Crawler(Settings(keep_alive_server, threads=2))
+    c.start()
+
+    assert len(c.succeed) == 1
+    # robots.txt and index page requested over same connection.
+    assert c.statistics()['Connections'] == "1 opened, 1 reused"
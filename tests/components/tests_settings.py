@@ -19,6 +19,7 @@ from deadlinks.exceptions import (DeadlinksSettingsBase, DeadlinksSettingsChange
                                   DeadlinksSettingsDomains, DeadlinksSettingsPath,
                                   DeadlinksSettingsPathes, DeadlinksSettingsRetry,
                                   DeadlinksSettingsRoot, DeadlinksSettingsThreads)
+from deadlinks.settings import THREADS_AUTO_LIMIT
 
 # -- Tests ---------------------------------------------------------------------
 
@@ -91,6 +92,7 @@ def test_domains_ok():
         ["google1.com", "", "google2.com"], # empty
         ["google1.com", "ssss"*250 + ".com", "google2.com"], # long long
         ["google1.com", 20, "google2.com"], # type
+        ["google1.com", "re:google(.com"], # regular expression
     ])
 def test_domain_bad(domains):
     """ Values that causing throwing exception while setting ignored domains """
@@ -120,6 +122,7 @@ def test_pathes_change(settings):
     [
         ["do/not/follow", ""], # empty string
         ["do/not/follow", 10], # int number
+        ["do/not/follow", "re:[a-z"], # regular expression
     ])
 def test_pathes_bad(pathes):
     """ General test for `ignored pathes` property with wrong type passed """
@@ -137,6 +140,28 @@ def test_pathes_ok(pathes):
     assert s.pathes == pathes
 
 
+@pytest.mark.parametrize(
+    'rules, value, matched',
+    [
+        ([], "example.com", False),
+        (["example.com"], "www.example.com:8080", True),
+        (["google.com", "example.com"], "example.org", False),
+        (["re:^(www\\.)?example\\.(com|org)$"], "www.example.org", True),
+        (["re:^example"], "www.example.org", False),
+        (["glob:*.example.com"], "docs.example.com", True),
+        (["glob:*.example.com"], "docs.example.com.ua", False),
+        (["a.b", "glob:*.example.com", "re:^c"], "a.b.c", True),
+        (["re:^(a)x", "re:^(\\w+)\\.\\1$"], "docs.docs", True),
+        (["example.org", "re:(?i)^EXAMPLE\\.COM"], "example.com", True),
+    ])
+def test_ignore_rules(rules, value, matched):
+    """ Substring, regular expression and glob rules of ignored domains and pathes """
+    s = Settings("http://localhost", ignore_domains=rules, ignore_pathes=rules)
+
+    assert s.ignored_domains.match(value) == matched
+    assert s.ignored_pathes.match(value) == matched
+
+
 # --- Stay within path ---------------------------------------------------------
 def test_stay_within_path(settings):
     assert settings.stay_within_path
@@ -154,18 +179,26 @@ def test_stay_within_path_exception(stay):
 
 
 # --- Thread -------------------------------------------------------------------
-@pytest.mark.parametrize('threads', [11, 5.0, 0, "ten", "10"])
+@pytest.mark.parametrize('threads', [1001, 5.0, 0, "ten", "10", "Auto"])
 def test_threads_exception(threads):
     """ Breaking threads property with wrong values """
     with pytest.raises(DeadlinksSettingsThreads):
         Settings("http://google.com", threads=threads)
 
 
-@pytest.mark.parametrize('threads', range(1, 11))
+@pytest.mark.parametrize('threads', [1, 2, 10, 11, 64, 1000])
 def test_threads(threads):
     """ Setting threads value within valid range"""
     s = Settings("http://google.com", threads=threads)
     assert s.threads == threads
+    assert s.autoscale is False
+
+
+def test_threads_auto():
+    """ Automatic number of threads """
+    s = Settings("http://google.com", threads="auto")
+    assert s.autoscale is True
+    assert s.threads == THREADS_AUTO_LIMIT
 
 
 def test_threads_defaults(settings):
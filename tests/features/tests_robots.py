@@ -11,11 +11,16 @@ Tests robots.txt integration.
 # -- Imports -------------------------------------------------------------------
 
 from copy import deepcopy as copy
+from threading import Thread
+from time import sleep
+from types import SimpleNamespace
 from typing import Dict
 
 import pytest
 
-from deadlinks import Crawler, DeadlinksIgnoredURL, Settings
+from deadlinks import URL, Crawler, DeadlinksIgnoredURL, Settings
+from deadlinks.cache import Cache
+from deadlinks.robots_txt import Robots, entries
 
 from ..utils import Page
 
@@ -113,3 +118,97 @@ def test_failed_google():
     c.start()
 
     assert len(c.succeed) == 1
+
+
+ROBOTS_TXT = """
+User-agent: *
+Allow: /search/about
+Disallow: /search/about/private
+Allow: /search
+Disallow: /search
+Disallow: /page?
+Disallow:
+"""
+
+
+class Transport:
+    """ Slow transport, that counts robots.txt requests. """
+
+    def __init__(self, content=ROBOTS_TXT, status_code=200):
+        self.requests = 0
+        self.response = SimpleNamespace(status_code=status_code, content=content.encode())
+
+    def request(self, url, **kwargs):
+        self.requests += 1
+        sleep(0.1)
+        return self.response
+
+
+@pytest.mark.parametrize(
+    'path, allowed',
+    [
+        ("", True),
+        ("/", True),
+        ("/search", False), # same path, later rule wins
+        ("/search/", False),
+        ("/search/about", True),
+        ("/search/about/private/1", False),
+        ("/page", False),
+        ("/other", True),
+    ])
+def test_rules(path, allowed):
+
+    robots = Robots(Transport())
+    assert robots["example.com"].allowed(URL("https://example.com" + path)) == allowed
+
+
+def test_no_entries(monkeypatch):
+    """ Everything is allowed if parser keeps its entries somewhere else. """
+
+    assert entries(SimpleNamespace()) == []
+
+    monkeypatch.setattr('deadlinks.robots_txt.entries', lambda state: [])
+
+    robots = Robots(Transport())
+    assert robots["example.com"].allowed(URL("https://example.com/search"))
+
+
+def test_requested_once():
+
+    transport = Transport()
+    robots = Robots(transport)
+
+    results = []
+    workers = [
+        Thread(target=lambda: results.append(
+            robots["example.com"].allowed(URL("https://example.com/search/about"))))
+        for _ in range(20)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert results == [True] * 20
+    assert transport.requests == 1
+    assert len(robots) == 1
+
+
+def test_cached(tmpdir):
+
+    cache = Cache(str(tmpdir.join("cache.db")))
+
+    transport = Transport(status_code=403)
+    assert not Robots(transport, cache)["example.com"].allowed(URL("https://example.com/a"))
+
+    # robots.txt of the next run is cached.
+    assert not Robots(transport, cache)["example.com"].allowed(URL("https://example.com/a"))
+    assert transport.requests == 1
+
+    # but robots.txt of Document Root is not.
+    Robots(transport, cache, "example.com")["example.com"].allowed(URL("https://example.com/a"))
+    assert transport.requests == 2
+
+    cache.ttl = 0
+    Robots(transport, cache)["example.com"].allowed(URL("https://example.com/a"))
+    assert transport.requests == 3
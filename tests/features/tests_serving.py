@@ -10,9 +10,14 @@ Serving local files.
 
 # -- Imports -------------------------------------------------------------------
 
+import os
+
 import pytest
 
-from deadlinks import DeadlinksSettingsRoot
+from deadlinks import AsyncCrawler, Crawler, DeadlinksSettingsRoot, Settings
+from deadlinks.request import Transport
+from deadlinks.serving.conditional import not_modified, validators
+from deadlinks.serving.direct import INTERNAL, DirectAdapter
 from deadlinks.serving.router import Router
 from deadlinks.serving.simple_server import SimpleServer
 
@@ -41,6 +46,11 @@ def test_router(tmpdir):
 
     robots_txt = root.join("robots.txt")
     robots_txt.write("User-agent: *\nDisallow: /")
+
+    # files created after router started, are found after refresh.
+    assert r('robots.txt')[0] == 404
+    r.refresh()
+
     robots_txt_request = r('robots.txt')
     assert robots_txt_request[0] == 200
     assert robots_txt_request[1] == str(robots_txt)
@@ -62,6 +72,37 @@ def test_router(tmpdir):
     assert none_request[1] is None
 
 
+def test_router_lookups(tmpdir):
+    root = tmpdir.mkdir("html")
+    root.join("index.htm").write("index")
+    root.join("page.html").write("page")
+    root.join("page.htm").write("page")
+    root.join("file").write("file")
+    root.join("doc.htm").write("doc")
+    root.join("favicon.ico").write("ico")
+    root.mkdir("both").join("index.html").write("both")
+    root.join("both.html").write("both")
+    root.mkdir("empty")
+    root.mkdir("deep").mkdir("er").join("index.html").write("deep")
+
+    r = Router(str(root))
+
+    assert r('/') == (200, str(root.join("index.htm")))
+    assert r('/page.html') == (200, str(root.join("page.html")))
+    assert r('/page.htm') == (200, str(root.join("page.htm")))
+    assert r('/doc.') == (404, None)
+    assert r('/both/') == (200, str(root.join("both", "index.html")))
+    assert r('/empty/') == (404, None)
+    assert r('/deep//er/') == (200, str(root.join("deep", "er", "index.html")))
+    assert r('/favicon.ico') == (200, str(root.join("favicon.ico").realpath()))
+    assert r('/page.html?query=1') == (404, None)
+    assert r('/../html/page.html') == (404, None)
+
+    # no extension - is directory (redirect).
+    assert r('/file') == (301, '/file/')
+    assert r('/file/') == (200, str(root.join("file")))
+
+
 def test_router_dir_non_exists(tmpdir):
     tmpdir.remove()
     with pytest.raises(DeadlinksSettingsRoot):
@@ -73,3 +114,202 @@ def test_router_dir_is_not_dir(tmpdir):
     index.write("hola")
     with pytest.raises(DeadlinksSettingsRoot):
         Router(str(index))
+
+
+@pytest.fixture
+def docs_root(tmpdir):
+    root = tmpdir.mkdir("html")
+    root.join("_redirects").write("/old.html /page.html 301")
+    root.join("index.html").write(
+        "<a href='/page.html'>1</a><a href='/old.html'>2</a><a href='/section'>3</a>"
+        "<a href='/nope.html'>4</a><a href='/page'>5</a>")
+    root.join("page.html").write("<a href='/'>index</a>")
+    root.mkdir("section").join("index.html").write("<a href='../page.html'>page</a>")
+    return str(root)
+
+
+def test_direct_adapter(docs_root):
+
+    transport = Transport()
+    transport.mount(INTERNAL, DirectAdapter(Router(docs_root)))
+
+    index = transport.request("http://internal/")
+    assert index.status_code == 200
+    assert "<a href='/page.html'>" in index.text
+    assert index.headers['Content-Length'] == str(len(index.content))
+
+    redirect = transport.request("http://internal/old.html")
+    assert redirect.status_code == 301
+    assert redirect.headers['Location'] == "/page.html"
+
+    assert transport.request("http://internal/section").headers['Location'] == "/section/"
+    assert transport.request("http://internal/nope.html").status_code == 404
+    assert transport.request("http://internal/page.html", is_external=True).content == b""
+
+    followed = transport.request("http://internal/old.html", allow_redirects=True)
+    assert followed.status_code == 200
+    assert followed.url == "http://internal/page.html"
+
+
+@pytest.mark.parametrize('engine', [Crawler, AsyncCrawler])
+def test_direct_same_as_server(docs_root, engine):
+
+    direct = engine(Settings("http://internal", root=docs_root))
+    direct.start()
+
+    served = engine(Settings("http://internal", root=docs_root, http_server=True))
+    served.start()
+
+    assert direct.settings.base.url() == "http://internal"
+    assert served.settings.base.url() != "http://internal"
+
+    for attr in ['succeed', 'failed', 'ignored', 'redirected']:
+        urls = sorted(x.url() for x in getattr(direct, attr))
+        assert urls == sorted(x.url() for x in getattr(served, attr))
+
+    assert len(direct.succeed) == 5
+    assert len(direct.failed) == 1
+    assert len(direct.redirected) == 3
+
+
+def test_server_keep_alive(docs_root):
+
+    s = SimpleServer(web_root=docs_root)
+    transport = Transport()
+
+    for path in ["/", "/page.html", "/section/", "/nope.html", "/old.html", "/section"]:
+        response = transport.request(s.url() + path)
+        assert response.headers['Content-Length'] == str(len(response.content))
+
+    assert transport.stats() == {'opened': 1, 'reused': 5}
+
+    # HEAD - same headers, but no content.
+    get = transport.request(s.url() + "/page.html")
+    head = transport.request(s.url() + "/page.html", is_external=True)
+
+    assert head.status_code == 200
+    assert head.content == b""
+    assert head.headers['Content-Length'] == get.headers['Content-Length']
+    assert transport.stats() == {'opened': 1, 'reused': 7}
+
+
+def test_not_modified(tmpdir):
+    page = tmpdir.join("page.html")
+    page.write("page")
+    stat = os.stat(str(page))
+
+    etag, modified = validators(stat)['ETag'], validators(stat)['Last-Modified']
+
+    assert not not_modified(None, stat)
+    assert not not_modified({}, stat)
+    assert not_modified({'If-None-Match': etag}, stat)
+    assert not_modified({'If-None-Match': '"other", ' + etag}, stat)
+    assert not_modified({'If-None-Match': '*'}, stat)
+    assert not not_modified({'If-None-Match': '"other"', 'If-Modified-Since': modified}, stat)
+    assert not_modified({'If-Modified-Since': modified}, stat)
+    assert not not_modified({'If-Modified-Since': "Thu, 01 Jan 1970 00:00:00 GMT"}, stat)
+    assert not not_modified({'If-Modified-Since': "yesterday"}, stat)
+
+
+@pytest.mark.parametrize('served', [True, False])
+def test_conditional_requests(docs_root, served):
+
+    transport = Transport()
+    address = INTERNAL.rstrip("/")
+    if served:
+        address = SimpleServer(web_root=docs_root).url()
+    else:
+        transport.mount(INTERNAL, DirectAdapter(Router(docs_root)))
+
+    page = transport.request(address + "/page.html")
+    etag, modified = page.headers['ETag'], page.headers['Last-Modified']
+
+    for headers in [{'If-None-Match': etag}, {'If-Modified-Since': modified}]:
+        response = transport.request(address + "/page.html", headers=headers)
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers['ETag'] == etag
+
+    with open(docs_root + "/page.html", "a") as file:
+        file.write("<a href='/new.html'>new</a>")
+
+    response = transport.request(address + "/page.html", headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+    # connection still usable after 304 responses.
+    if served:
+        assert transport.stats()['opened'] == 1
+
+
+@pytest.mark.parametrize('http_server', [False, True])
+@pytest.mark.parametrize('engine', [Crawler, AsyncCrawler])
+def test_revalidation(docs_root, tmpdir, engine, http_server):
+
+    options = {
+        'root': docs_root,
+        'cache': str(tmpdir.join("cache.db")),
+        'http_server': http_server,
+    }
+
+    def crawl():
+        c = engine(Settings("http://internal", **options))
+        c.start()
+        return c
+
+    c = crawl()
+    assert 'Revalidated' in c.statistics()
+    pages = len(c.succeed)
+
+    # same links, but only not modified responses.
+    c = crawl()
+    assert len(c.succeed) == pages
+    assert len(c.failed) == 1
+    assert len(c.redirected) == 3
+    assert c.statistics()['Revalidated'] == f"{pages} pages, {pages} not modified"
+
+    with open(docs_root + "/section/index.html", "a") as file:
+        file.write("<a href='/new.html'>new</a>")
+
+    c = crawl()
+    assert len(c.failed) == 2
+    assert c.statistics()['Revalidated'] == f"{pages} pages, {pages - 1} not modified"
+
+
+@pytest.mark.parametrize('engine', [Crawler, AsyncCrawler])
+def test_incremental(docs_root, tmpdir, engine, monkeypatch):
+
+    cache = str(tmpdir.join("cache.db"))
+    engine(Settings("http://internal", root=docs_root, cache=cache)).start()
+
+    # changed, new and removed files.
+    with open(docs_root + "/section/index.html", "a") as file:
+        file.write("<a href='/new.html'>new</a><a href='/gone.html'>gone</a>")
+    with open(docs_root + "/new.html", "w") as file:
+        file.write("<a href='/section/'>section</a><a href='/nope-2.html'>nope</a>")
+    os.remove(docs_root + "/page.html")
+
+    requested = []
+    respond = DirectAdapter.respond
+
+    def recorder(self, method, path, headers=None):
+        requested.append(path)
+        return respond(self, method, path, headers)
+    monkeypatch.setattr(DirectAdapter, 'respond', recorder)
+
+    incremental = engine(Settings("http://internal", root=docs_root, cache=cache))
+    incremental.start()
+
+    # unchanged pages aren't requested.
+    assert "/" not in requested
+    assert "/section/" in requested
+    assert "/new.html" in requested
+
+    full = engine(Settings("http://internal", root=docs_root))
+    full.start()
+
+    def results(crawler, attr):
+        return sorted((x.url(), sorted(x.get_referrers())) for x in getattr(crawler, attr))
+
+    for attr in ['succeed', 'failed', 'ignored', 'redirected']:
+        assert results(incremental, attr) == results(full, attr)
@@ -17,29 +17,43 @@ from http.server import BaseHTTPRequestHandler
 
 class Handler(BaseHTTPRequestHandler):
 
-    def __init__(self, logic, *args, **kwargs) -> None:
+    def __init__(self, logic, keep_alive, *args, **kwargs) -> None:
         self.logic = logic
+        # HTTP/1.0 server closes connection after each response.
+        if keep_alive:
+            self.protocol_version = "HTTP/1.1"
         super().__init__(*args, **kwargs)
 
     def log_message(self, *args):
         """ Ignoring logging. """
 
     def do_HEAD(self):
-        """ HEAD, but GET. """
-        return self.do_GET()
+        """ HEAD, but GET (without body). """
+        self.respond(with_body=False)
 
     def do_GET(self):
         """handling request"""
+        self.respond(with_body=True)
 
-        response_code, mime_type, content = self.logic.handler(self.path)
+    def respond(self, with_body):
+
+        response_code, mime_type, content, headers = self.logic.handler(self.path)
 
         if response_code == 301:
             self.send_response(301)
             self.send_header('Location', content % self.path)
+            self.send_header('Content-Length', '0')
             self.end_headers()
             return
 
+        body = bytes(content, "utf8")
+
         self.send_response(response_code)
         self.send_header('Content-type', mime_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
         self.end_headers()
-        self.wfile.write(bytes(content, "utf8"))
+
+        if with_body:
+            self.wfile.write(body)
@@ -10,7 +10,7 @@ Simple page emulator.
 
 # -- Imports -------------------------------------------------------------------
 
-from typing import Optional
+from typing import Callable, Dict, Optional, Union
 
 # -- Implementation ------------------------------------------------------------
 
@@ -19,10 +19,12 @@ class Page:
 
     "<html><head></head><body>ok</body></html>"
 
-    def __init__(self, content: Optional[str]):
+    def __init__(self, content: Optional[Union[str, Callable[[str], str]]]):
         self._unlocks = 0
+        self._locked = 503
+        self._headers = {} # type: Dict[str, str]
         self._content = content
-        self._slow = False
+        self._slow = 0.0
         self._redirects = False
         self._exists = False
         self._mime_type = ""
@@ -34,6 +36,8 @@ class Page:
             'redirects': self._redirects,
             'slow': self._slow,
             'unlocks': self._unlocks,
+            'locked': self._locked,
+            'headers': self._headers,
             'mime_type': self._mime_type,
             'content': self._content,
         }
@@ -53,8 +57,8 @@ class Page:
         self._mime_type = mime
         return self
 
-    def slow(self):
-        self._slow = True
+    def slow(self, seconds: float = 1.0):
+        self._slow = seconds
         return self
 
     def exists(self):
@@ -65,6 +69,10 @@ class Page:
         self._exists = False
         return self
 
-    def unlock_after(self, n: int):
+    def unlock_after(self, n: int, status: int = 503, headers: Optional[Dict[str, str]] = None):
+        """ First `n` requests of the path answered with `status` (and
+            `headers`). """
         self._unlocks = n
+        self._locked = status
+        self._headers = headers or {}
         return self
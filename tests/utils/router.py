@@ -11,8 +11,10 @@ Simple page emulator.
 # -- Imports -------------------------------------------------------------------
 
 from collections import defaultdict
+from http import HTTPStatus
 from re import compile as _compile
-from time import sleep
+from threading import Lock
+from time import monotonic, sleep
 
 PAGE_TEMPLATE = "<!DOCTYPE HTML><html><head>{0}</head><body>{1}</body></html>"
 
@@ -24,13 +26,37 @@ class Router:
     def __init__(self, router):
         self._pathes = defaultdict(lambda: 0)
         self._router = {}
+        self._lock = Lock()
+
+        # (moment, path, status) of the requests, and concurrent requests.
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
 
         for path, data in router.items():
             self._router[_compile(path)] = data
 
     def handler(self, url):
 
-        self._pathes[url] += 1
+        moment = monotonic()
+        with self._lock:
+            self._pathes[url] += 1
+            requested = self._pathes[url]
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+        try:
+            response = self.respond(url, requested)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+        with self._lock:
+            self.requests.append((moment, url, response[0]))
+
+        return response
+
+    def respond(self, url, requested):
 
         for reg, _page in self._router.items():
             if not reg.search(url):
@@ -38,18 +64,24 @@ class Router:
 
             param = _page()
 
-            if self._pathes[url] <= param['unlocks']:
-                return 503, 'text/html', '<h1>Service Unavailable</h1>'
+            if requested <= param['unlocks']:
+                status = param['locked']
+                content = '<h1>{}</h1>'.format(HTTPStatus(status).phrase)
+                return status, 'text/html', content, param['headers']
 
             if param['slow']:
-                sleep(1)
+                sleep(param['slow'])
 
             if param['redirects']:
-                return 301, None, param['redirects']
+                return 301, None, param['redirects'], {}
+
+            content = param['content']
+            if callable(content):
+                content = content(url)
 
             if param['exists']:
-                return 200, param['mime_type'], param['content']
+                return 200, param['mime_type'], content, {}
 
-            return 404, param['mime_type'], param['content']
+            return 404, param['mime_type'], content, {}
 
-        return 404, 'text/html', '<h1>Page Not Found</h1>'
+        return 404, 'text/html', '<h1>Page Not Found</h1>', {}
@@ -12,7 +12,7 @@ Simple page emulator.
 
 import socket
 from functools import partial
-from http.server import HTTPServer
+from http.server import ThreadingHTTPServer
 from threading import Thread
 from typing import Dict, Optional
 
@@ -30,6 +30,12 @@ def defaults() -> RouterConfig:
     return {'.*': Page("ok").exists()}
 
 
+class HTTPServer(ThreadingHTTPServer):
+    # default listen backlog (5) drops connections of concurrent requests.
+    request_queue_size = 1024
+    daemon_threads = True
+
+
 class Server:
 
     def __init__(self):
@@ -54,10 +60,11 @@ class Server:
     def host(self):
         return socket.gethostbyname(socket.gethostname())
 
-    def router(self, config: RouterConfig = None):
+    def router(self, config: RouterConfig = None, keep_alive: bool = False):
 
         self.rules = config or defaults()
-        handler = partial(Handler, Router(self.rules))
+        self.logic = Router(self.rules)
+        handler = partial(Handler, self.logic, keep_alive)
         self.s = HTTPServer((self.address, self.port), handler)
         self.s.allow_reuse_address = True
 
@@ -67,5 +74,15 @@ class Server:
 
         return str(self)
 
+    @property
+    def requests(self):
+        """ (moment, path, status) of the served requests. """
+        return self.logic.requests
+
+    @property
+    def max_active(self):
+        """ Maximum number of requests served at the same time. """
+        return self.logic.max_active
+
     def destroy(self):
         self.s.shutdown()